@@ -2,30 +2,63 @@
 
 from __future__ import annotations
 
-import asyncio
 import inspect
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import pyairtouch
+from homeassistant.components.climate import HVACAction
 from homeassistant.const import CONF_HOST, Platform
 from homeassistant.exceptions import ConfigEntryNotReady
 
+from .commands import AcCommandQueue
 from .const import (
     CONF_MINOR_VERSION,
+    CONF_SPILL_BYPASS,
     CONF_VERSION,
     DOMAIN,
+    OPTIONS_COOLING_POWER,
+    OPTIONS_DAMPER_DEADBAND,
+    OPTIONS_DAMPER_DEADBAND_DEFAULT,
+    OPTIONS_DAMPER_MIN_INTERVAL,
+    OPTIONS_DAMPER_MIN_INTERVAL_DEFAULT,
+    OPTIONS_DRYING_POWER,
+    OPTIONS_FAN_POWER,
+    OPTIONS_HEATING_POWER,
+    OPTIONS_OPTIMISTIC_TIMEOUT,
+    OPTIONS_OPTIMISTIC_TIMEOUT_DEFAULT,
+    OPTIONS_POWER_DEFAULT,
+    OPTIONS_TEMPERATURE_DEADBAND,
+    OPTIONS_TEMPERATURE_DEADBAND_DEFAULT,
+    OPTIONS_TEMPERATURE_MIN_INTERVAL,
+    OPTIONS_TEMPERATURE_MIN_INTERVAL_DEFAULT,
+    SpillBypass,
 )
+from .devices import AirTouchDevice
+from .discovery import DiscoveryService, get_discovery_service
+from .dispatcher import UpdateDispatcher
+from .instrumentation import Instrumentation
+from .journal import CommandJournal, async_remove_journal
+from .models import (
+    AirTouchData,
+    OptimisticUpdates,
+    RateLimitedSensor,
+    SensorRateLimit,
+)
+from .runtime import RuntimeTracker, async_remove_runtime
+from .schedules import ScheduleEngine, async_remove_schedules
+from .supervisor import ConnectionSupervisor, remove_connection_statistics
+from .thermal import ThermalModel, async_remove_thermal_model
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
 
 
 _LOGGER = logging.getLogger(__name__)
 
-_LOCK_KEY = "lock"
-
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
     Platform.CLIMATE,
@@ -35,6 +68,9 @@ PLATFORMS: list[Platform] = [
     Platform.UPDATE,
 ]
 
+# Platforms that always have at least one entity for the AirTouch console.
+_CONSOLE_PLATFORMS = frozenset([Platform.SENSOR, Platform.UPDATE])
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up the Polyaire AirTouch connection after discovery."""
@@ -45,52 +81,240 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry.data,
     )
 
-    # Initialise the saved domain data if it is not already initialised.
-    # A lock is included to support mutual exclusion between config entries.
-    hass.data.setdefault(DOMAIN, {_LOCK_KEY: asyncio.Lock()})
+    discovery = get_discovery_service(hass)
+    instrumentation = Instrumentation()
+
+    with instrumentation.setup_phase("connect"):
+        airtouch = await _async_connect(discovery, entry)
+
+    dispatcher = UpdateDispatcher(hass, airtouch, instrumentation)
+    dispatcher.start()
+
+    try:
+        await discovery.async_connected(airtouch)
+
+        supervisor = ConnectionSupervisor(hass, entry.entry_id, airtouch)
+
+        with instrumentation.setup_phase("devices"):
+            airtouch_device = AirTouchDevice(hass, entry.entry_id, airtouch)
+
+        platforms = _platforms_with_entities(entry, airtouch)
+
+        zone_statistics = None
+        if "recorder" in hass.config.components:
+            # The recorder is an optional dependency, so it is only imported if
+            # it has been loaded.
+            from .statistics import ZoneStatistics
 
-    # Ensure discovery is mutually exlusive across config entries since it needs
-    # to bind to an explicit local port.
-    async with hass.data[DOMAIN][_LOCK_KEY]:
-        discovery_results = await pyairtouch.discover(
-            remote_host=entry.data.get(CONF_HOST)
+            zone_statistics = ZoneStatistics(
+                hass, airtouch, airtouch_device, supervisor
+            )
+
+        journal = CommandJournal(hass, entry.entry_id, supervisor)
+        await journal.async_load()
+        command_queues = {
+            airtouch_ac.ac_id: AcCommandQueue(
+                hass, airtouch_ac, instrumentation, journal
+            )
+            for airtouch_ac in airtouch.air_conditioners
+        }
+        thermal_model = ThermalModel(hass, entry.entry_id, airtouch, dispatcher)
+        await thermal_model.async_load()
+        schedules = ScheduleEngine(
+            hass, entry.entry_id, airtouch, command_queues, thermal_model
+        )
+        await schedules.async_load()
+        runtime = RuntimeTracker(
+            hass, entry.entry_id, airtouch, dispatcher, _power_estimates(entry.options)
         )
+        await runtime.async_load()
 
-    # Filter the API instances to the AirTouch controller that matches this
-    # config entry.
-    airtouch = next(
-        (at for at in discovery_results if entry.unique_id == at.airtouch_id), None
-    )
-    if not airtouch:
-        # Couldn't find the AirTouch device.
-        # As a general rule this shouldn't happen because we are using discovery.
-        # However, it might happen if the AirTouch console is offline or the
-        # user configured with unicast discovery and the AirTouch console got a
-        # new IP address.
-        raise ConfigEntryNotReady("AirTouch not detected on network")
-
-    if not await airtouch.init():
+        # Save the API object and devices for use throughout the integration
+        hass.data[DOMAIN][entry.entry_id] = AirTouchData(
+            airtouch=airtouch,
+            airtouch_device=airtouch_device,
+            dispatcher=dispatcher,
+            command_queues=command_queues,
+            optimistic_updates=OptimisticUpdates(
+                rollback_timeout=entry.options.get(
+                    OPTIONS_OPTIMISTIC_TIMEOUT, OPTIONS_OPTIMISTIC_TIMEOUT_DEFAULT
+                )
+            ),
+            instrumentation=instrumentation,
+            sensor_rate_limits=_sensor_rate_limits(entry.options),
+            platforms=platforms,
+            supervisor=supervisor,
+            schedules=schedules,
+            journal=journal,
+            thermal_model=thermal_model,
+            runtime=runtime,
+            zone_statistics=zone_statistics,
+        )
+        entry.async_on_unload(entry.add_update_listener(_async_update_options))
+
+        with instrumentation.setup_phase("platforms"):
+            await hass.config_entries.async_forward_entry_setups(entry, platforms)
+    except Exception:
+        # Nothing else has been started yet, so only the connection and the
+        # dispatcher's subscriptions to it need to be cleaned up.
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        dispatcher.stop()
         await airtouch.shutdown()
-        raise ConfigEntryNotReady("Error initialising AirTouch communication")
+        raise
 
-    # Save the API object for use throughout the integration
-    hass.data[DOMAIN][entry.entry_id] = airtouch
+    supervisor.start()
+    thermal_model.start()
+    runtime.start()
+    schedules.start()
+    if zone_statistics:
+        zone_statistics.start()
+    # Send any commands journaled while the AirTouch was unreachable.
+    journal.start(airtouch, command_queues)
+    return True
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    return True
+async def _async_connect(
+    discovery: DiscoveryService, entry: ConfigEntry
+) -> pyairtouch.AirTouch:
+    airtouch = None
+    if entry.unique_id:
+        # A config entry that has just been created can take over the config
+        # flow's connection. Otherwise try the last known address first to
+        # avoid waiting for discovery.
+        airtouch = discovery.async_take_handover(
+            entry.unique_id
+        ) or await discovery.async_connect_cached(entry.unique_id)
+
+    if not airtouch:
+        airtouch = await discovery.async_discover(
+            entry.unique_id, remote_host=entry.data.get(CONF_HOST)
+        )
+        if not airtouch:
+            # Couldn't find the AirTouch device.
+            # As a general rule this shouldn't happen because we are using
+            # discovery. However, it might happen if the AirTouch console is
+            # offline or the user configured with unicast discovery and the
+            # AirTouch console got a new IP address.
+            raise ConfigEntryNotReady("AirTouch not detected on network")
+
+        if not await airtouch.init():
+            await airtouch.shutdown()
+            raise ConfigEntryNotReady("Error initialising AirTouch communication")
+
+    return airtouch
+
+
+def _platforms_with_entities(
+    entry: ConfigEntry, airtouch: pyairtouch.AirTouch
+) -> list[Platform]:
+    """Determine the platforms that will create at least one entity.
+
+    Setting up a platform requires its module and the Home Assistant entity
+    component to be loaded, so platforms without any entities are skipped.
+    The conditions must be kept in sync with each platform's async_setup_entry.
+    """
+    platforms = set(_CONSOLE_PLATFORMS)
+    air_conditioners = airtouch.air_conditioners
+    zones = [zone for ac in air_conditioners for zone in ac.zones]
+
+    if air_conditioners:
+        platforms.update([Platform.CLIMATE, Platform.TIME])
+    if zones:
+        platforms.add(Platform.COVER)
+
+    spill_bypass = SpillBypass(entry.data.get(CONF_SPILL_BYPASS, SpillBypass.SPILL))
+    if (
+        air_conditioners
+        and (
+            spill_bypass == SpillBypass.SPILL
+            or airtouch.model != pyairtouch.AirTouchModel.AIRTOUCH_4
+        )
+    ) or any(zone.has_temp_sensor for zone in zones):
+        platforms.add(Platform.BINARY_SENSOR)
+
+    return [platform for platform in PLATFORMS if platform in platforms]
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        airtouch: pyairtouch.AirTouch = hass.data[DOMAIN].pop(entry.entry_id)
-        if airtouch:
-            await airtouch.shutdown()
+    data: AirTouchData | None = hass.data[DOMAIN].get(entry.entry_id)
+    platforms = data.platforms if data else PLATFORMS
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, platforms):
+        hass.data[DOMAIN].pop(entry.entry_id)
+        if data:
+            data.schedules.stop()
+            data.thermal_model.stop()
+            data.runtime.stop()
+            if data.zone_statistics:
+                data.zone_statistics.stop()
+            data.journal.stop()
+            data.supervisor.stop()
+            data.dispatcher.stop()
+            for command_queue in data.command_queues.values():
+                command_queue.async_shutdown()
+            await data.journal.async_save()
+            await data.thermal_model.async_save()
+            await data.runtime.async_save()
+            await data.airtouch.shutdown()
 
     return unload_ok
 
 
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    data: AirTouchData | None = hass.data[DOMAIN].get(entry.entry_id)
+    if data:
+        data.optimistic_updates.rollback_timeout = entry.options.get(
+            OPTIONS_OPTIMISTIC_TIMEOUT, OPTIONS_OPTIMISTIC_TIMEOUT_DEFAULT
+        )
+        data.sensor_rate_limits.update(_sensor_rate_limits(entry.options))
+        data.runtime.power = _power_estimates(entry.options)
+
+
+def _sensor_rate_limits(
+    options: Mapping[str, Any],
+) -> dict[RateLimitedSensor, SensorRateLimit]:
+    return {
+        RateLimitedSensor.TEMPERATURE: SensorRateLimit(
+            min_interval=options.get(
+                OPTIONS_TEMPERATURE_MIN_INTERVAL,
+                OPTIONS_TEMPERATURE_MIN_INTERVAL_DEFAULT,
+            ),
+            deadband=options.get(
+                OPTIONS_TEMPERATURE_DEADBAND, OPTIONS_TEMPERATURE_DEADBAND_DEFAULT
+            ),
+        ),
+        RateLimitedSensor.DAMPER: SensorRateLimit(
+            min_interval=options.get(
+                OPTIONS_DAMPER_MIN_INTERVAL, OPTIONS_DAMPER_MIN_INTERVAL_DEFAULT
+            ),
+            deadband=options.get(
+                OPTIONS_DAMPER_DEADBAND, OPTIONS_DAMPER_DEADBAND_DEFAULT
+            ),
+        ),
+    }
+
+
+def _power_estimates(options: Mapping[str, Any]) -> dict[HVACAction, float]:
+    return {
+        HVACAction.HEATING: options.get(OPTIONS_HEATING_POWER, OPTIONS_POWER_DEFAULT),
+        HVACAction.COOLING: options.get(OPTIONS_COOLING_POWER, OPTIONS_POWER_DEFAULT),
+        HVACAction.DRYING: options.get(OPTIONS_DRYING_POWER, OPTIONS_POWER_DEFAULT),
+        HVACAction.FAN: options.get(OPTIONS_FAN_POWER, OPTIONS_POWER_DEFAULT),
+    }
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Clean up after a config entry is removed."""
+    remove_connection_statistics(hass, entry.entry_id)
+    await async_remove_schedules(hass, entry.entry_id)
+    await async_remove_journal(hass, entry.entry_id)
+    await async_remove_thermal_model(hass, entry.entry_id)
+    await async_remove_runtime(hass, entry.entry_id)
+    if entry.unique_id:
+        discovery = get_discovery_service(hass)
+        await discovery.async_remove(entry.unique_id)
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate previous versions of configuration."""
     entry_version = entry.version
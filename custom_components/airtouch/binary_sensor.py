@@ -7,6 +7,7 @@ Binary sensors are used to represent:
 """
 
 import logging
+from typing import TYPE_CHECKING
 
 import pyairtouch
 from homeassistant.components import binary_sensor
@@ -17,6 +18,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import devices, entities
 from .const import CONF_SPILL_BYPASS, CONF_SPILL_ZONES, DOMAIN, SpillBypass
 
+if TYPE_CHECKING:
+    from .models import AirTouchData
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -26,7 +30,8 @@ async def async_setup_entry(
     async_add_devices: AddEntitiesCallback,
 ) -> None:
     """Set up the AirTouch binary sensors."""
-    airtouch: pyairtouch.AirTouch = hass.data[DOMAIN][config_entry.entry_id]
+    data: AirTouchData = hass.data[DOMAIN][config_entry.entry_id]
+    airtouch = data.airtouch
 
     # When reading serialised configuration, the config data will be the
     # underlying value not the enum value so it needs to be converted to an enum
@@ -38,7 +43,7 @@ async def async_setup_entry(
 
     discovered_entities: list[binary_sensor.BinarySensorEntity] = []
 
-    airtouch_device = devices.AirTouchDevice(hass, config_entry.entry_id, airtouch)
+    airtouch_device = data.airtouch_device
     for airtouch_ac in airtouch.air_conditioners:
         ac_device = airtouch_device.ac_device(airtouch_ac)
 
@@ -98,6 +103,9 @@ class AcSpillBypassEntity(entities.AirTouchAcEntity, binary_sensor.BinarySensorE
         )
         self._attr_name = "Bypass" if spill_bypass == SpillBypass.BYPASS else "Spill"
 
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self._airtouch_ac.spill_state,)
+
     @property
     def is_on(self) -> bool | None:
         return self._airtouch_ac.spill_state != pyairtouch.AcSpillState.NONE
@@ -118,6 +126,9 @@ class ZoneSpillEntity(entities.AirTouchZoneEntity, binary_sensor.BinarySensorEnt
             id_suffix="_spill",
         )
 
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self._airtouch_zone.spill_active,)
+
     @property
     def is_on(self) -> bool | None:
         return self._airtouch_zone.spill_active
@@ -138,6 +149,9 @@ class ZoneBatteryEntity(entities.AirTouchZoneEntity, binary_sensor.BinarySensorE
             id_suffix="_battery",
         )
 
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self._airtouch_zone.sensor_battery_status,)
+
     @property
     def is_on(self) -> bool | None:
         return (
@@ -1,20 +1,30 @@
 """Polyaire AirTouch Climate Devices."""
 
+import asyncio
+import functools
+import itertools
 import logging
-from collections.abc import Mapping
-from typing import Any, Optional
+from collections.abc import Awaitable, Mapping
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
 
 import pyairtouch
 import voluptuous
 from homeassistant.components import climate
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import entity_platform
+from homeassistant.const import WEEKDAYS, UnitOfTemperature
+from homeassistant.core import HomeAssistant, callback, valid_entity_id
+from homeassistant.helpers import (
+    config_validation,
+    device_registry,
+    entity_platform,
+    entity_registry,
+)
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import devices, entities
+from . import devices, entities, schedules
+from .commands import AcSettings, ZoneSettings
 from .const import (
+    DAMPER_STEP,
     DOMAIN,
     OPTIONS_ALLOW_ZONE_HVAC_MODE_CHANGES,
     OPTIONS_ALLOW_ZONE_HVAC_MODE_CHANGES_DEFAULT,
@@ -22,6 +32,10 @@ from .const import (
     OPTIONS_MIN_TARGET_TEMPERATURE_STEP_DEFAULT,
 )
 
+if TYPE_CHECKING:
+    from .commands import AcCommandQueue
+    from .models import AirTouchData
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -31,7 +45,8 @@ async def async_setup_entry(
     async_add_devices: AddEntitiesCallback,
 ) -> None:
     """Set up the AirTouch climate devices."""
-    airtouch: pyairtouch.AirTouch = hass.data[DOMAIN][config_entry.entry_id]
+    data: AirTouchData = hass.data[DOMAIN][config_entry.entry_id]
+    airtouch = data.airtouch
     min_target_temperature_step = config_entry.options.get(
         OPTIONS_MIN_TARGET_TEMPERATURE_STEP,
         OPTIONS_MIN_TARGET_TEMPERATURE_STEP_DEFAULT,
@@ -43,12 +58,14 @@ async def async_setup_entry(
 
     discovered_entities: list[climate.ClimateEntity] = []
 
-    airtouch_device = devices.AirTouchDevice(hass, config_entry.entry_id, airtouch)
+    airtouch_device = data.airtouch_device
     for airtouch_ac in airtouch.air_conditioners:
         ac_device = airtouch_device.ac_device(airtouch_ac)
+        command_queue = data.command_queues[airtouch_ac.ac_id]
         ac_entity = AcClimateEntity(
             ac_device=ac_device,
             airtouch_ac=airtouch_ac,
+            command_queue=command_queue,
             min_target_temperature_step=min_target_temperature_step,
         )
         discovered_entities.append(ac_entity)
@@ -61,6 +78,7 @@ async def async_setup_entry(
                 zone_device_info=zone_device,
                 airtouch_ac=airtouch_ac,
                 airtouch_zone=airtouch_zone,
+                command_queue=command_queue,
                 min_target_temperature_step=min_target_temperature_step,
                 allow_zone_hvac_mode_changes=allow_zone_hvac_mode_changes,
             )
@@ -80,6 +98,30 @@ async def async_setup_entry(
         },
         func="async_set_hvac_mode_only",
     )
+    platform.async_register_entity_service(
+        name="set_zones",
+        schema={
+            voluptuous.Required(_ATTR_ZONES): voluptuous.All(
+                {config_validation.string: _ZONE_SETTINGS_SCHEMA},
+                voluptuous.Length(min=1),
+            )
+        },
+        func="async_set_zones",
+    )
+    platform.async_register_entity_service(
+        name="set_schedule",
+        schema={
+            voluptuous.Required(_ATTR_TRANSITIONS): voluptuous.All(
+                [_TRANSITION_SCHEMA], voluptuous.Length(min=1)
+            )
+        },
+        func="async_set_schedule",
+    )
+    platform.async_register_entity_service(
+        name="clear_schedule",
+        schema={},
+        func="async_clear_schedule",
+    )
 
     # Update the climate entities when the configuration changes
     async def update_listener(_: HomeAssistant, config_entry: ConfigEntry) -> None:
@@ -161,8 +203,276 @@ AC_TO_CLIMATE_FAN_MODE = {
 }
 _CLIMATE_TO_AC_FAN_MODE = {value: key for key, value in AC_TO_CLIMATE_FAN_MODE.items()}
 
+_ZONE_TO_CLIMATE_FAN_MODE = {
+    pyairtouch.ZonePowerState.OFF: climate.FAN_OFF,
+    pyairtouch.ZonePowerState.ON: climate.FAN_ON,
+    pyairtouch.ZonePowerState.TURBO: "turbo",
+}
+_CLIMATE_TO_ZONE_FAN_MODE = {
+    value: key for key, value in _ZONE_TO_CLIMATE_FAN_MODE.items()
+}
+
+
+class _AcClimateState(NamedTuple):
+    """The climate state of an AC."""
+
+    hvac_mode: climate.HVACMode | None
+    hvac_action: climate.HVACAction | None
+    preset_mode: str
+
+
+class _ZoneClimateState(NamedTuple):
+    """The climate state of a zone."""
+
+    hvac_mode: climate.HVACMode | None
+    hvac_action: climate.HVACAction | None
+    fan_mode: str | None
+    restricted_hvac_modes: list[climate.HVACMode]
+    """The HVAC modes when zones aren't allowed to change the AC mode."""
+
+
+_AcStateKey = tuple[
+    pyairtouch.AcPowerState | None, pyairtouch.AcMode | None, pyairtouch.AcMode | None
+]
+"""The AC power state, selected mode and active mode."""
+
+_ZoneStateKey = tuple[
+    pyairtouch.ZonePowerState | None,
+    pyairtouch.AcPowerState | None,
+    pyairtouch.AcMode | None,
+    pyairtouch.AcMode | None,
+]
+"""The zone power state followed by the AC state key."""
+
+
+def _ac_climate_state(
+    power_state: pyairtouch.AcPowerState | None,
+    selected_mode: pyairtouch.AcMode | None,
+    active_mode: pyairtouch.AcMode | None,
+) -> _AcClimateState:
+    hvac_mode: climate.HVACMode | None = None
+    hvac_action: climate.HVACAction | None = None
+    match power_state:
+        case pyairtouch.AcPowerState.OFF | pyairtouch.AcPowerState.OFF_AWAY:
+            hvac_mode = climate.HVACMode.OFF
+            hvac_action = climate.HVACAction.OFF
+        case pyairtouch.AcPowerState.OFF_FORCED:
+            if selected_mode:
+                hvac_mode = _AC_TO_CLIMATE_HVAC_MODE[selected_mode]
+            hvac_action = climate.HVACAction.IDLE
+        case _:
+            if selected_mode:
+                hvac_mode = _AC_TO_CLIMATE_HVAC_MODE[selected_mode]
+            if active_mode:
+                hvac_action = _AC_TO_CLIMATE_HVAC_ACTION[active_mode]
+
+    preset_mode = climate.PRESET_NONE
+    if power_state:
+        preset_mode = _AC_POWER_STATE_TO_PRESET[power_state]
+
+    return _AcClimateState(hvac_mode, hvac_action, preset_mode)
+
+
+def _zone_climate_state(
+    zone_power_state: pyairtouch.ZonePowerState | None, ac_state: _AcClimateState
+) -> _ZoneClimateState:
+    # If the zone is on then the mode and action follow the parent AC.
+    hvac_mode = ac_state.hvac_mode
+    hvac_action = ac_state.hvac_action
+    if zone_power_state == pyairtouch.ZonePowerState.OFF:
+        hvac_mode = climate.HVACMode.OFF
+        hvac_action = climate.HVACAction.OFF
+
+    fan_mode = None
+    if zone_power_state:
+        fan_mode = _ZONE_TO_CLIMATE_FAN_MODE[zone_power_state]
+
+    return _ZoneClimateState(hvac_mode, hvac_action, fan_mode, [])
+
+
+def _restricted_hvac_modes(
+    selected_mode: pyairtouch.AcMode | None,
+) -> list[climate.HVACMode]:
+    # The Zone can either be off, or on in the current mode of the AC
+    if selected_mode is None:
+        return [climate.HVACMode.OFF]
+    return [climate.HVACMode.OFF, _AC_TO_CLIMATE_HVAC_MODE[selected_mode]]
+
+
+# Home Assistant reads several climate properties every time an entity's state
+# is written. Entities translate the AirTouch values with a single lookup when
+# the state is written, rather than translating them in each property. The
+# tables cover every combination: 252 for an AC and 1008 for a zone.
+_AC_CLIMATE_STATES: dict[_AcStateKey, _AcClimateState] = {
+    key: _ac_climate_state(*key)
+    for key in itertools.product(
+        [*pyairtouch.AcPowerState, None],
+        [*pyairtouch.AcMode, None],
+        [*pyairtouch.AcMode, None],
+    )
+}
+_RESTRICTED_HVAC_MODES = {
+    selected_mode: _restricted_hvac_modes(selected_mode)
+    for selected_mode in [*pyairtouch.AcMode, None]
+}
+_ZONE_CLIMATE_STATES: dict[_ZoneStateKey, _ZoneClimateState] = {
+    (zone_power_state, *ac_key): _zone_climate_state(
+        zone_power_state, ac_state
+    )._replace(restricted_hvac_modes=_RESTRICTED_HVAC_MODES[ac_key[1]])
+    for zone_power_state in [*pyairtouch.ZonePowerState, None]
+    for ac_key, ac_state in _AC_CLIMATE_STATES.items()
+}
+
+
+def ac_hvac_action(airtouch_ac: pyairtouch.AirConditioner) -> climate.HVACAction | None:
+    """The HVAC action reported by an AC.
+
+    Public because it is also used in runtime.py.
+    """
+    return _AC_CLIMATE_STATES[
+        airtouch_ac.power_state, airtouch_ac.selected_mode, airtouch_ac.active_mode
+    ].hvac_action
+
+
+_AC_SUPPORTED_FEATURES = (
+    climate.ClimateEntityFeature.FAN_MODE
+    | climate.ClimateEntityFeature.TARGET_TEMPERATURE
+    | climate.ClimateEntityFeature.PRESET_MODE
+)
+_ZONE_SUPPORTED_FEATURES = (
+    climate.ClimateEntityFeature.FAN_MODE
+    | climate.ClimateEntityFeature.TARGET_TEMPERATURE
+)
+# HomeAssistant 2024.2 onwards
+_TURN_ON_OFF_SUPPORTED = hasattr(climate.ClimateEntityFeature, "TURN_OFF")
+if _TURN_ON_OFF_SUPPORTED:
+    _AC_SUPPORTED_FEATURES |= (
+        climate.ClimateEntityFeature.TURN_OFF | climate.ClimateEntityFeature.TURN_ON
+    )
+    _ZONE_SUPPORTED_FEATURES |= (
+        climate.ClimateEntityFeature.TURN_OFF | climate.ClimateEntityFeature.TURN_ON
+    )
 
-class AcClimateEntity(entities.AirTouchAcEntity, climate.ClimateEntity):
+
+# The mode lists depend only on the capabilities of the AC or zone, so a single
+# list is shared by all entities with the same capabilities. The lists must not
+# be modified.
+@functools.cache
+def _hvac_modes(
+    supported_modes: tuple[pyairtouch.AcMode, ...],
+) -> list[climate.HVACMode]:
+    # The Climate Entity groups the OFF Power State into the HVACMode
+    return [climate.HVACMode.OFF] + [
+        _AC_TO_CLIMATE_HVAC_MODE[mode] for mode in supported_modes
+    ]
+
+
+@functools.cache
+def _ac_fan_modes(supported_fan_speeds: tuple[pyairtouch.AcFanSpeed, ...]) -> list[str]:
+    return [AC_TO_CLIMATE_FAN_MODE[fan_speed] for fan_speed in supported_fan_speeds]
+
+
+@functools.cache
+def _ac_preset_modes(
+    supported_power_controls: tuple[pyairtouch.AcPowerControl, ...],
+) -> list[str]:
+    return [climate.PRESET_NONE] + [
+        preset
+        for preset, ac_power in _CLIMATE_PRESET_TO_AC_POWER_CONTROL.items()
+        if ac_power in supported_power_controls
+    ]
+
+
+@functools.cache
+def _zone_fan_modes(
+    supported_power_states: tuple[pyairtouch.ZonePowerState, ...],
+) -> list[str]:
+    return [_ZONE_TO_CLIMATE_FAN_MODE[state] for state in supported_power_states]
+
+
+# Fields for the set_zones service.
+_ATTR_ZONES = "zones"
+_ATTR_ZONE_POWER = "power"
+_ATTR_ZONE_TEMPERATURE = "temperature"
+_ATTR_ZONE_DAMPER = "damper"
+
+_ZONE_SETTINGS_SCHEMA = voluptuous.All(
+    {
+        voluptuous.Optional(_ATTR_ZONE_POWER): voluptuous.In(
+            list(_CLIMATE_TO_ZONE_FAN_MODE)
+        ),
+        # The target temperature and damper percentage are mutually exclusive
+        # since they select the zone's control method.
+        voluptuous.Exclusive(_ATTR_ZONE_TEMPERATURE, "setting"): voluptuous.Coerce(
+            float
+        ),
+        voluptuous.Exclusive(_ATTR_ZONE_DAMPER, "setting"): voluptuous.All(
+            voluptuous.Coerce(int), voluptuous.Range(min=0, max=100)
+        ),
+    },
+    config_validation.has_at_least_one_key(
+        _ATTR_ZONE_POWER, _ATTR_ZONE_TEMPERATURE, _ATTR_ZONE_DAMPER
+    ),
+)
+
+# Fields for the set_schedule service. An AC transition can set the HVAC mode,
+# fan mode, target temperature and zones of the AC, and can be pre-conditioned.
+# A zone transition can set the power state and target temperature of the zone.
+_ATTR_TRANSITIONS = "transitions"
+_ATTR_DAYS = "days"
+_ATTR_TIME = "time"
+_ATTR_PRECONDITION = "precondition"
+
+_AC_TRANSITION_SETTINGS = (
+    climate.ATTR_HVAC_MODE,
+    climate.ATTR_FAN_MODE,
+    climate.ATTR_TEMPERATURE,
+    _ATTR_ZONES,
+)
+_ZONE_TRANSITION_SETTINGS = (_ATTR_ZONE_POWER, climate.ATTR_TEMPERATURE)
+
+_TRANSITION_SCHEMA = voluptuous.All(
+    {
+        voluptuous.Required(_ATTR_DAYS): voluptuous.All(
+            config_validation.ensure_list,
+            [voluptuous.In(WEEKDAYS)],
+            voluptuous.Length(min=1),
+        ),
+        voluptuous.Required(_ATTR_TIME): config_validation.time,
+        voluptuous.Optional(climate.ATTR_HVAC_MODE): voluptuous.Coerce(
+            climate.HVACMode
+        ),
+        voluptuous.Optional(climate.ATTR_FAN_MODE): config_validation.string,
+        voluptuous.Optional(climate.ATTR_TEMPERATURE): voluptuous.Coerce(float),
+        voluptuous.Optional(_ATTR_ZONES): {
+            config_validation.string: _ZONE_SETTINGS_SCHEMA
+        },
+        voluptuous.Optional(_ATTR_ZONE_POWER): voluptuous.In(
+            list(_CLIMATE_TO_ZONE_FAN_MODE)
+        ),
+        voluptuous.Optional(_ATTR_PRECONDITION): config_validation.boolean,
+    },
+    config_validation.has_at_least_one_key(
+        *_AC_TRANSITION_SETTINGS, *_ZONE_TRANSITION_SETTINGS
+    ),
+)
+
+
+def _transition_weekdays(days: list[str]) -> frozenset[int]:
+    return frozenset(WEEKDAYS.index(day) for day in days)
+
+
+def _check_transition_settings(
+    transition: Mapping[str, Any], allowed: tuple[str, ...], name: str
+) -> None:
+    for key in transition:
+        if key not in (_ATTR_DAYS, _ATTR_TIME, *allowed):
+            raise ValueError(f"{key} can't be scheduled for {name}")
+
+
+class AcClimateEntity(
+    entities.AirTouchAcEntity, entities.OptimisticEntity, climate.ClimateEntity
+):
     """A climate entity for an AirTouch Air Conditioner."""
 
     _attr_name = None  # Name comes from the device info
@@ -174,49 +484,59 @@ class AcClimateEntity(entities.AirTouchAcEntity, climate.ClimateEntity):
     _attr_device_class = "ac"
 
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
+    _attr_supported_features = _AC_SUPPORTED_FEATURES
+    _enable_turn_on_off_backwards_compatibility = not _TURN_ON_OFF_SUPPORTED
 
     def __init__(
         self,
         ac_device: devices.AcDevice,
         airtouch_ac: pyairtouch.AirConditioner,
+        command_queue: "AcCommandQueue",
         min_target_temperature_step: float,
     ) -> None:
         super().__init__(
             ac_device=ac_device,
             airtouch_ac=airtouch_ac,
         )
-
-        self._attr_supported_features = (
-            climate.ClimateEntityFeature.FAN_MODE
-            | climate.ClimateEntityFeature.TARGET_TEMPERATURE
-            | climate.ClimateEntityFeature.PRESET_MODE
-        )
-        if hasattr(climate.ClimateEntityFeature, "TURN_OFF"):
-            # HomeAssistant 2024.2 onwards
-            self._attr_supported_features |= (
-                climate.ClimateEntityFeature.TURN_OFF
-                | climate.ClimateEntityFeature.TURN_ON
-            )
-            self._enable_turn_on_off_backwards_compatibility = False
+        self._ac_device = ac_device
+        self._command_queue = command_queue
 
         self._attr_target_temperature_step = max(
             airtouch_ac.target_temperature_resolution, min_target_temperature_step
         )
 
-        # The Climate Entity groups the OFF Power State into the HVACMode
-        self._attr_hvac_modes = [climate.HVACMode.OFF] + [
-            _AC_TO_CLIMATE_HVAC_MODE[mode] for mode in airtouch_ac.supported_modes
-        ]
-        self._attr_fan_modes = [
-            AC_TO_CLIMATE_FAN_MODE[fan_speed]
-            for fan_speed in airtouch_ac.supported_fan_speeds
-        ]
+        self._attr_hvac_modes = _hvac_modes(tuple(airtouch_ac.supported_modes))
+        self._attr_fan_modes = _ac_fan_modes(tuple(airtouch_ac.supported_fan_speeds))
+        self._attr_preset_modes = _ac_preset_modes(
+            tuple(airtouch_ac.supported_power_controls)
+        )
 
-        self._attr_preset_modes = [climate.PRESET_NONE] + [
-            preset
-            for preset, ac_power in _CLIMATE_PRESET_TO_AC_POWER_CONTROL.items()
-            if ac_power in airtouch_ac.supported_power_controls
-        ]
+        self._climate_state = self._translate_climate_state()
+
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (
+            self._airtouch_ac.power_state,
+            self._airtouch_ac.selected_mode,
+            self._airtouch_ac.active_mode,
+            self._airtouch_ac.selected_fan_speed,
+            self._airtouch_ac.current_temperature,
+            self._airtouch_ac.target_temperature,
+            self._airtouch_ac.min_target_temperature,
+            self._airtouch_ac.max_target_temperature,
+        )
+
+    # AC values that may be shown optimistically after a command.
+    @property
+    def _power_state(self) -> pyairtouch.AcPowerState | None:
+        return self._current_value(self._airtouch_ac, "power_state")
+
+    @property
+    def _selected_mode(self) -> pyairtouch.AcMode | None:
+        return self._current_value(self._airtouch_ac, "selected_mode")
+
+    @property
+    def _selected_fan_speed(self) -> pyairtouch.AcFanSpeed | None:
+        return self._current_value(self._airtouch_ac, "selected_fan_speed")
 
     @property
     def current_temperature(self) -> Optional[float]:
@@ -224,7 +544,7 @@ class AcClimateEntity(entities.AirTouchAcEntity, climate.ClimateEntity):
 
     @property
     def target_temperature(self) -> Optional[float]:
-        return self._airtouch_ac.target_temperature
+        return self._current_value(self._airtouch_ac, "target_temperature")
 
     @property
     def max_temp(self) -> float:
@@ -236,46 +556,38 @@ class AcClimateEntity(entities.AirTouchAcEntity, climate.ClimateEntity):
 
     @property
     def fan_mode(self) -> str | None:
-        if self._airtouch_ac.selected_fan_speed:
-            return AC_TO_CLIMATE_FAN_MODE[self._airtouch_ac.selected_fan_speed]
+        if self._selected_fan_speed:
+            return AC_TO_CLIMATE_FAN_MODE[self._selected_fan_speed]
         return None
 
+    def _translate_climate_state(self) -> _AcClimateState:
+        return _AC_CLIMATE_STATES[
+            self._power_state, self._selected_mode, self._airtouch_ac.active_mode
+        ]
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._climate_state = self._translate_climate_state()
+        super().async_write_ha_state()
+
     @property
     def hvac_mode(self) -> climate.HVACMode | None:
-        match self._airtouch_ac.power_state:
-            case pyairtouch.AcPowerState.OFF | pyairtouch.AcPowerState.OFF_AWAY:
-                return climate.HVACMode.OFF
-            case _:
-                if self._airtouch_ac.selected_mode:
-                    return _AC_TO_CLIMATE_HVAC_MODE[self._airtouch_ac.selected_mode]
-        return None
+        return self._climate_state.hvac_mode
 
     @property
     def hvac_action(self) -> climate.HVACAction | None:
-        match self._airtouch_ac.power_state:
-            case pyairtouch.AcPowerState.OFF | pyairtouch.AcPowerState.OFF_AWAY:
-                return climate.HVACAction.OFF
-            case pyairtouch.AcPowerState.OFF_FORCED:
-                return climate.HVACAction.IDLE
-            case _:
-                if self._airtouch_ac.active_mode:
-                    return _AC_TO_CLIMATE_HVAC_ACTION[self._airtouch_ac.active_mode]
-        return None
+        return self._climate_state.hvac_action
 
     @property
     def preset_mode(self) -> str:
-        if self._airtouch_ac.power_state:
-            return _AC_POWER_STATE_TO_PRESET[self._airtouch_ac.power_state]
-        return climate.PRESET_NONE
+        return self._climate_state.preset_mode
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return AC specific state attributes."""
         last_active_hvac_mode: climate.HVACMode | None = None
-        if self._airtouch_ac.selected_mode:
-            last_active_hvac_mode = _AC_TO_CLIMATE_HVAC_MODE[
-                self._airtouch_ac.selected_mode
-            ]
+        if self._selected_mode:
+            last_active_hvac_mode = _AC_TO_CLIMATE_HVAC_MODE[self._selected_mode]
         return {
             # The "current" HVAC mode
             "last_active_hvac_mode": last_active_hvac_mode
@@ -287,22 +599,48 @@ class AcClimateEntity(entities.AirTouchAcEntity, climate.ClimateEntity):
         )
 
     async def async_set_fan_mode(self, fan_mode: str) -> None:
-        await self._airtouch_ac.set_fan_speed(_CLIMATE_TO_AC_FAN_MODE[fan_mode])
+        fan_speed = _CLIMATE_TO_AC_FAN_MODE[fan_mode]
+        await self._async_send_optimistic(
+            self._command_queue.async_set_ac_fan_speed(fan_speed),
+            self._airtouch_ac,
+            {"selected_fan_speed": fan_speed},
+        )
 
     async def async_set_hvac_mode(self, hvac_mode: climate.HVACMode) -> None:
         if hvac_mode == climate.HVACMode.OFF:
-            await self._airtouch_ac.set_power(pyairtouch.AcPowerControl.TURN_OFF)
+            await self.async_turn_off()
         else:
-            await self._airtouch_ac.set_mode(
-                _CLIMATE_TO_AC_HVAC_MODE[hvac_mode], power_on=True
+            ac_mode = _CLIMATE_TO_AC_HVAC_MODE[hvac_mode]
+            await self._async_send_optimistic(
+                self._command_queue.async_set_ac_mode(ac_mode, power_on=True),
+                self._airtouch_ac,
+                {"selected_mode": ac_mode, **self._expected_power_state(power_on=True)},
             )
 
     async def async_turn_on(self) -> None:
         # Turn the AC on in the last used mode.
-        await self._airtouch_ac.set_power(pyairtouch.AcPowerControl.TURN_ON)
+        await self._async_send_optimistic(
+            self._command_queue.async_set_ac_power(pyairtouch.AcPowerControl.TURN_ON),
+            self._airtouch_ac,
+            self._expected_power_state(power_on=True),
+        )
 
     async def async_turn_off(self) -> None:
-        await self._airtouch_ac.set_power(pyairtouch.AcPowerControl.TURN_OFF)
+        await self._async_send_optimistic(
+            self._command_queue.async_set_ac_power(pyairtouch.AcPowerControl.TURN_OFF),
+            self._airtouch_ac,
+            self._expected_power_state(power_on=False),
+        )
+
+    def _expected_power_state(self, *, power_on: bool) -> dict[str, object]:
+        # The resulting power state is only predictable when the AC isn't in
+        # one of the away, sleep or forced off states.
+        match (self._airtouch_ac.power_state, power_on):
+            case (pyairtouch.AcPowerState.OFF, True):
+                return {"power_state": pyairtouch.AcPowerState.ON}
+            case (pyairtouch.AcPowerState.ON, False):
+                return {"power_state": pyairtouch.AcPowerState.OFF}
+        return {}
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         power_control = _CLIMATE_PRESET_TO_AC_POWER_CONTROL.get(preset_mode)
@@ -316,13 +654,17 @@ class AcClimateEntity(entities.AirTouchAcEntity, climate.ClimateEntity):
                 power_control = pyairtouch.AcPowerControl.TURN_ON
 
         if power_control:
-            await self._airtouch_ac.set_power(power_control)
+            await self._command_queue.async_set_ac_power(power_control)
         else:
             _LOGGER.warning("Unsupported preset mode: %s", preset_mode)
 
     async def async_set_temperature(self, **kwargs: Any) -> None:  # noqa: ANN401
         temperature: float = kwargs[climate.ATTR_TEMPERATURE]
-        await self._airtouch_ac.set_target_temperature(temperature)
+        await self._async_send_optimistic(
+            self._command_queue.async_set_ac_target_temperature(temperature),
+            self._airtouch_ac,
+            {"target_temperature": temperature},
+        )
 
         # The "climate.set_temperature" service also allows a HVAC Mode to be specified.
         if climate.ATTR_HVAC_MODE in kwargs:
@@ -337,20 +679,193 @@ class AcClimateEntity(entities.AirTouchAcEntity, climate.ClimateEntity):
         """
         if hvac_mode not in _CLIMATE_TO_AC_HVAC_MODE:
             raise ValueError("Unsupported HVAC Mode")
-        await self._airtouch_ac.set_mode(_CLIMATE_TO_AC_HVAC_MODE[hvac_mode])
+        await self._command_queue.async_set_ac_mode(_CLIMATE_TO_AC_HVAC_MODE[hvac_mode])
 
+    async def async_set_zones(self, zones: Mapping[str, Mapping[str, Any]]) -> None:
+        """Apply settings to multiple zones of the AC in one batch.
 
-_ZONE_TO_CLIMATE_FAN_MODE = {
-    pyairtouch.ZonePowerState.OFF: climate.FAN_OFF,
-    pyairtouch.ZonePowerState.ON: climate.FAN_ON,
-    pyairtouch.ZonePowerState.TURBO: "turbo",
-}
-_CLIMATE_TO_ZONE_FAN_MODE = {
-    value: key for key, value in _ZONE_TO_CLIMATE_FAN_MODE.items()
-}
+        A custom service call that sets the power state, target temperature
+        or damper percentage of several zones at once. Zones can be identified
+        by their AirTouch name or by the ID of any of the zone's entities.
+
+        All zone settings are validated before any commands are sent, so an
+        invalid setting for one zone leaves every zone unchanged.
+        """
+        await self._command_queue.async_apply(None, self._resolve_zone_settings(zones))
+
+    def _resolve_zone_settings(
+        self, zones: Mapping[str, Mapping[str, Any]]
+    ) -> dict[pyairtouch.Zone, ZoneSettings]:
+        """Validate settings for zones of this AC keyed by name or entity ID.
+
+        Raises:
+            ValueError: If a zone is unknown or a setting is not supported.
+        """
+        zone_settings: dict[pyairtouch.Zone, ZoneSettings] = {}
+        for zone_key, settings in zones.items():
+            airtouch_zone = self._resolve_zone(zone_key)
+            if airtouch_zone in zone_settings:
+                raise ValueError(f"Zone specified more than once: {zone_key}")
+
+            power_state = None
+            if _ATTR_ZONE_POWER in settings:
+                power_state = _CLIMATE_TO_ZONE_FAN_MODE[settings[_ATTR_ZONE_POWER]]
+                if power_state not in airtouch_zone.supported_power_states:
+                    raise ValueError(
+                        f"Unsupported power state for {airtouch_zone.name}: "
+                        f"{settings[_ATTR_ZONE_POWER]}"
+                    )
+
+            temperature: float | None = settings.get(_ATTR_ZONE_TEMPERATURE)
+            if temperature is not None:
+                self._validate_zone_temperature(airtouch_zone, temperature)
+
+            open_percentage: int | None = settings.get(_ATTR_ZONE_DAMPER)
+            if open_percentage is not None:
+                open_percentage = DAMPER_STEP * round(open_percentage / DAMPER_STEP)
+
+            zone_settings[airtouch_zone] = ZoneSettings(
+                power_state=power_state,
+                target_temperature=temperature,
+                damper_percentage=open_percentage,
+            )
+        return zone_settings
+
+    async def async_set_schedule(self, transitions: list[Mapping[str, Any]]) -> None:
+        """Replace the weekly schedule of the AC.
+
+        A custom service call. Each transition can set the HVAC mode, fan mode
+        and target temperature of the AC, and settings for any of its zones.
+        Transitions that turn the AC on can be pre-conditioned.
+        """
+        program: list[schedules.Transition] = []
+        for transition in transitions:
+            _check_transition_settings(
+                transition,
+                (*_AC_TRANSITION_SETTINGS, _ATTR_PRECONDITION),
+                self._airtouch_ac.name,
+            )
+            ac_settings = self._resolve_ac_settings(transition)
+            precondition = transition.get(_ATTR_PRECONDITION, False)
+            if precondition and not (ac_settings and ac_settings.mode):
+                raise ValueError(
+                    f"Pre-conditioning for {self._airtouch_ac.name} requires an "
+                    "HVAC mode other than off"
+                )
+            zone_settings = self._resolve_zone_settings(transition.get(_ATTR_ZONES, {}))
+            program.append(
+                schedules.Transition(
+                    weekdays=_transition_weekdays(transition[_ATTR_DAYS]),
+                    time=transition[_ATTR_TIME],
+                    ac_settings=ac_settings,
+                    zone_settings={
+                        airtouch_zone.zone_id: settings
+                        for airtouch_zone, settings in zone_settings.items()
+                    },
+                    precondition=precondition,
+                )
+            )
+        entities.get_schedule_engine(
+            self.hass, self._config_entry_id
+        ).async_set_program(("ac", self._airtouch_ac.ac_id), program)
+
+    async def async_clear_schedule(self) -> None:
+        """Remove the weekly schedule of the AC."""
+        entities.get_schedule_engine(
+            self.hass, self._config_entry_id
+        ).async_set_program(("ac", self._airtouch_ac.ac_id), [])
+
+    def _resolve_ac_settings(self, transition: Mapping[str, Any]) -> AcSettings | None:
+        power_control = None
+        mode = None
+        hvac_mode = transition.get(climate.ATTR_HVAC_MODE)
+        if hvac_mode == climate.HVACMode.OFF:
+            power_control = pyairtouch.AcPowerControl.TURN_OFF
+        elif hvac_mode is not None:
+            power_control = pyairtouch.AcPowerControl.TURN_ON
+            mode = _CLIMATE_TO_AC_HVAC_MODE.get(hvac_mode)
+            if mode not in self._airtouch_ac.supported_modes:
+                raise ValueError(
+                    f"Unsupported HVAC mode for {self._airtouch_ac.name}: {hvac_mode}"
+                )
+
+        fan_speed = None
+        fan_mode = transition.get(climate.ATTR_FAN_MODE)
+        if fan_mode is not None:
+            fan_speed = _CLIMATE_TO_AC_FAN_MODE.get(fan_mode)
+            if fan_speed not in self._airtouch_ac.supported_fan_speeds:
+                raise ValueError(
+                    f"Unsupported fan mode for {self._airtouch_ac.name}: {fan_mode}"
+                )
+
+        temperature = transition.get(climate.ATTR_TEMPERATURE)
+        if temperature is not None and not (
+            self._airtouch_ac.min_target_temperature
+            <= temperature
+            <= self._airtouch_ac.max_target_temperature
+        ):
+            raise ValueError(
+                f"Target temperature for {self._airtouch_ac.name} is out of range: "
+                f"{temperature}"
+            )
+
+        if (
+            power_control is None
+            and mode is None
+            and fan_speed is None
+            and temperature is None
+        ):
+            return None
+        return AcSettings(
+            power_control=power_control,
+            mode=mode,
+            fan_speed=fan_speed,
+            target_temperature=temperature,
+        )
+
+    def _validate_zone_temperature(
+        self, airtouch_zone: pyairtouch.Zone, temperature: float
+    ) -> None:
+        if not airtouch_zone.has_temp_sensor:
+            raise ValueError(
+                f"{airtouch_zone.name} doesn't support temperature control"
+            )
+        if not (
+            self._airtouch_ac.min_target_temperature
+            <= temperature
+            <= self._airtouch_ac.max_target_temperature
+        ):
+            raise ValueError(
+                f"Target temperature for {airtouch_zone.name} is out of range: "
+                f"{temperature}"
+            )
+
+    def _resolve_zone(self, zone_key: str) -> pyairtouch.Zone:
+        """Find a zone of this AC by name or entity ID."""
+        if valid_entity_id(zone_key):
+            entity_entry = entity_registry.async_get(self.hass).async_get(zone_key)
+            device_entry = None
+            if entity_entry and entity_entry.device_id:
+                device_entry = device_registry.async_get(self.hass).async_get(
+                    entity_entry.device_id
+                )
+            if device_entry:
+                for airtouch_zone in self._airtouch_ac.zones:
+                    zone_device = self._ac_device.zone_device(airtouch_zone)
+                    if (DOMAIN, zone_device.unique_id) in device_entry.identifiers:
+                        return airtouch_zone
+        else:
+            normalized_key = zone_key.strip().casefold()
+            for airtouch_zone in self._airtouch_ac.zones:
+                if airtouch_zone.name.strip().casefold() == normalized_key:
+                    return airtouch_zone
+
+        raise ValueError(f"Unknown zone for {self._airtouch_ac.name}: {zone_key}")
 
 
-class ZoneClimateEntity(entities.AirTouchZoneEntity, climate.ClimateEntity):
+class ZoneClimateEntity(
+    entities.AirTouchZoneEntity, entities.OptimisticEntity, climate.ClimateEntity
+):
     """A climate entity for an AirTouch Zone."""
 
     _attr_name = None  # Name comes from the device info
@@ -358,12 +873,15 @@ class ZoneClimateEntity(entities.AirTouchZoneEntity, climate.ClimateEntity):
     _attr_device_class = "zone"
 
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
+    _attr_supported_features = _ZONE_SUPPORTED_FEATURES
+    _enable_turn_on_off_backwards_compatibility = not _TURN_ON_OFF_SUPPORTED
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         zone_device_info: devices.ZoneDevice,
         airtouch_ac: pyairtouch.AirConditioner,
         airtouch_zone: pyairtouch.Zone,
+        command_queue: "AcCommandQueue",
         min_target_temperature_step: float,
         *,
         allow_zone_hvac_mode_changes: bool,
@@ -373,55 +891,68 @@ class ZoneClimateEntity(entities.AirTouchZoneEntity, climate.ClimateEntity):
             airtouch_zone=airtouch_zone,
         )
         self._airtouch_ac = airtouch_ac
+        self._command_queue = command_queue
         self._allow_zone_hvac_mode_changes = allow_zone_hvac_mode_changes
 
-        self._attr_supported_features = (
-            climate.ClimateEntityFeature.FAN_MODE
-            | climate.ClimateEntityFeature.TARGET_TEMPERATURE
-        )
-        if hasattr(climate.ClimateEntityFeature, "TURN_OFF"):
-            # HomeAssistant 2024.2 onwards
-            self._attr_supported_features |= (
-                climate.ClimateEntityFeature.TURN_OFF
-                | climate.ClimateEntityFeature.TURN_ON
-            )
-            self._enable_turn_on_off_backwards_compatibility = False
-
         self._attr_target_temperature_step = max(
             airtouch_zone.target_temperature_resolution, min_target_temperature_step
         )
 
         # Only used when allow_zone_hvac_mode_changes is True
-        self._attr_hvac_modes = [climate.HVACMode.OFF] + [
-            _AC_TO_CLIMATE_HVAC_MODE[mode] for mode in airtouch_ac.supported_modes
-        ]
+        self._attr_hvac_modes = _hvac_modes(tuple(airtouch_ac.supported_modes))
+        self._attr_fan_modes = _zone_fan_modes(
+            tuple(airtouch_zone.supported_power_states)
+        )
 
-        self._attr_fan_modes = [
-            _ZONE_TO_CLIMATE_FAN_MODE[fan_speed]
-            for fan_speed in airtouch_zone.supported_power_states
-        ]
+        self._climate_state = self._translate_climate_state()
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        self._airtouch_ac.subscribe_ac_state(self._async_on_ac_update)
+        # The zone state is also dependent on the AC mode and power state.
+        dispatcher = entities.get_dispatcher(self.hass, self._config_entry_id)
+        self.async_on_remove(
+            dispatcher.async_add_ac_listener(
+                self._airtouch_ac.ac_id, self._async_write_if_changed
+            )
+        )
 
-    async def async_will_remove_from_hass(self) -> None:
-        await super().async_will_remove_from_hass()
-        self._airtouch_ac.unsubscribe_ac_state(self._async_on_ac_update)
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (
+            self._airtouch_zone.power_state,
+            self._airtouch_zone.control_method,
+            self._airtouch_zone.current_temperature,
+            self._airtouch_zone.target_temperature,
+            self._airtouch_ac.power_state,
+            self._airtouch_ac.selected_mode,
+            self._airtouch_ac.active_mode,
+            self._airtouch_ac.min_target_temperature,
+            self._airtouch_ac.max_target_temperature,
+        )
+
+    def _translate_climate_state(self) -> _ZoneClimateState:
+        airtouch_ac = self._airtouch_ac
+        return _ZONE_CLIMATE_STATES[
+            self._zone_power_state,
+            airtouch_ac.power_state,
+            airtouch_ac.selected_mode,
+            airtouch_ac.active_mode,
+        ]
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._climate_state = self._translate_climate_state()
+        super().async_write_ha_state()
 
     @property
     def hvac_modes(self) -> list[climate.HVACMode]:
         if self._allow_zone_hvac_mode_changes:
             return self._attr_hvac_modes
-        # otherwises the Zone can either be off, or on in the current mode of the AC
-        if self._airtouch_ac.selected_mode is None:
-            return [
-                climate.HVACMode.OFF,
-            ]
-        return [
-            climate.HVACMode.OFF,
-            _AC_TO_CLIMATE_HVAC_MODE[self._airtouch_ac.selected_mode],
-        ]
+        return self._climate_state.restricted_hvac_modes
+
+    # Zone power state that may be shown optimistically after a command.
+    @property
+    def _zone_power_state(self) -> pyairtouch.ZonePowerState | None:
+        return self._current_value(self._airtouch_zone, "power_state")
 
     @property
     def current_temperature(self) -> Optional[float]:
@@ -429,7 +960,7 @@ class ZoneClimateEntity(entities.AirTouchZoneEntity, climate.ClimateEntity):
 
     @property
     def target_temperature(self) -> Optional[float]:
-        return self._airtouch_zone.target_temperature
+        return self._current_value(self._airtouch_zone, "target_temperature")
 
     @property
     def max_temp(self) -> float:
@@ -441,39 +972,15 @@ class ZoneClimateEntity(entities.AirTouchZoneEntity, climate.ClimateEntity):
 
     @property
     def fan_mode(self) -> str | None:
-        if self._airtouch_zone.power_state:
-            return _ZONE_TO_CLIMATE_FAN_MODE[self._airtouch_zone.power_state]
-        return None
+        return self._climate_state.fan_mode
 
     @property
     def hvac_mode(self) -> climate.HVACMode | None:
-        if self._airtouch_zone.power_state == pyairtouch.ZonePowerState.OFF:
-            return climate.HVACMode.OFF
-
-        # If the Zone is on then the mode is as per the parent AC mode
-        match self._airtouch_ac.power_state:
-            case pyairtouch.AcPowerState.OFF | pyairtouch.AcPowerState.OFF_AWAY:
-                return climate.HVACMode.OFF
-            case _:
-                if self._airtouch_ac.selected_mode:
-                    return _AC_TO_CLIMATE_HVAC_MODE[self._airtouch_ac.selected_mode]
-        return None
+        return self._climate_state.hvac_mode
 
     @property
     def hvac_action(self) -> climate.HVACAction | None:
-        if self._airtouch_zone.power_state == pyairtouch.ZonePowerState.OFF:
-            return climate.HVACAction.OFF
-
-        # If the zone is on the zone hvac action follows the AC mode.
-        match self._airtouch_ac.power_state:
-            case pyairtouch.AcPowerState.OFF | pyairtouch.AcPowerState.OFF_AWAY:
-                return climate.HVACAction.OFF
-            case pyairtouch.AcPowerState.OFF_FORCED:
-                return climate.HVACAction.IDLE
-            case _:
-                if self._airtouch_ac.active_mode:
-                    return _AC_TO_CLIMATE_HVAC_ACTION[self._airtouch_ac.active_mode]
-        return None
+        return self._climate_state.hvac_action
 
     @property
     def extra_state_attributes(self) -> Optional[Mapping[str, Any]]:
@@ -494,14 +1001,20 @@ class ZoneClimateEntity(entities.AirTouchZoneEntity, climate.ClimateEntity):
 
     async def async_set_temperature(self, **kwargs: Any) -> None:  # noqa: ANN401
         temperature: float = kwargs[climate.ATTR_TEMPERATURE]
-        await self._airtouch_zone.set_target_temperature(temperature)
+        await self._async_send_optimistic(
+            self._command_queue.async_set_zone_target_temperature(
+                self._airtouch_zone, temperature
+            ),
+            self._airtouch_zone,
+            {"target_temperature": temperature},
+        )
 
         # The "climate.set_temperature" service also allows a HVAC Mode to be specified.
         if climate.ATTR_HVAC_MODE in kwargs:
             await self.async_set_hvac_mode(kwargs[climate.ATTR_HVAC_MODE])
 
     async def async_set_fan_mode(self, fan_mode: str) -> None:
-        await self._airtouch_zone.set_power(_CLIMATE_TO_ZONE_FAN_MODE[fan_mode])
+        await self._async_set_zone_power(_CLIMATE_TO_ZONE_FAN_MODE[fan_mode])
 
     async def async_set_hvac_mode(self, hvac_mode: climate.HVACMode) -> None:
         # Any HVACMode other than OFF is a request to turn the zone on.
@@ -509,15 +1022,21 @@ class ZoneClimateEntity(entities.AirTouchZoneEntity, climate.ClimateEntity):
         if hvac_mode == climate.HVACMode.OFF:
             power_state = pyairtouch.ZonePowerState.OFF
 
+        commands: list[Awaitable[None]] = []
+
         # If configured to do so, change the AC HVAC mode based on the zone change
         if (
             self._allow_zone_hvac_mode_changes
             and power_state == pyairtouch.ZonePowerState.ON
         ):
-            await self._airtouch_ac.set_mode(_CLIMATE_TO_AC_HVAC_MODE[hvac_mode])
+            commands.append(
+                self._command_queue.async_set_ac_mode(
+                    _CLIMATE_TO_AC_HVAC_MODE[hvac_mode]
+                )
+            )
 
         if self._airtouch_zone.power_state != power_state:
-            await self._airtouch_zone.set_power(power_state)
+            commands.append(self._async_set_zone_power(power_state))
         elif (
             power_state == pyairtouch.ZonePowerState.ON
             and self._airtouch_ac.power_state == pyairtouch.AcPowerState.OFF
@@ -526,8 +1045,12 @@ class ZoneClimateEntity(entities.AirTouchZoneEntity, climate.ClimateEntity):
             # off then on again. This will trigger the AC to turn on if the
             # AirTouch setting to "Turn the AC on when a zone is turned on" is
             # enabled and mirror the behaviour of the official app.
-            await self._airtouch_zone.set_power(pyairtouch.ZonePowerState.OFF)
-            await self._airtouch_zone.set_power(pyairtouch.ZonePowerState.ON)
+            commands.append(
+                self._command_queue.async_cycle_zone_power(self._airtouch_zone)
+            )
+
+        # Queue the AC mode and zone power together so they're sent in one batch.
+        await asyncio.gather(*commands)
 
     async def async_turn_on(self) -> None:
         # Turn the zone on by activating it according to the current mode of the
@@ -540,10 +1063,63 @@ class ZoneClimateEntity(entities.AirTouchZoneEntity, climate.ClimateEntity):
         )
 
     async def async_turn_off(self) -> None:
-        await self._airtouch_zone.set_power(pyairtouch.ZonePowerState.OFF)
+        await self._async_set_zone_power(pyairtouch.ZonePowerState.OFF)
 
-    async def _async_on_ac_update(self, _: int) -> None:
-        # We only really need to trigger an update if the AC Mode or Power State
-        # have been updated. However this update isn't triggered that often and
-        # Home Assistant filters no-change updates internally.
-        self.async_schedule_update_ha_state()
+    async def async_set_schedule(self, transitions: list[Mapping[str, Any]]) -> None:
+        """Replace the weekly schedule of the zone.
+
+        A custom service call. Each transition can set the power state and target
+        temperature of the zone.
+        """
+        program: list[schedules.Transition] = []
+        for transition in transitions:
+            _check_transition_settings(
+                transition, _ZONE_TRANSITION_SETTINGS, self._airtouch_zone.name
+            )
+            power_state = None
+            if _ATTR_ZONE_POWER in transition:
+                power_state = _CLIMATE_TO_ZONE_FAN_MODE[transition[_ATTR_ZONE_POWER]]
+                if power_state not in self._airtouch_zone.supported_power_states:
+                    raise ValueError(
+                        f"Unsupported power state for {self._airtouch_zone.name}: "
+                        f"{transition[_ATTR_ZONE_POWER]}"
+                    )
+            temperature = transition.get(climate.ATTR_TEMPERATURE)
+            if temperature is not None and not (
+                self._airtouch_ac.min_target_temperature
+                <= temperature
+                <= self._airtouch_ac.max_target_temperature
+            ):
+                raise ValueError(
+                    f"Target temperature for {self._airtouch_zone.name} is out of "
+                    f"range: {temperature}"
+                )
+            program.append(
+                schedules.Transition(
+                    weekdays=_transition_weekdays(transition[_ATTR_DAYS]),
+                    time=transition[_ATTR_TIME],
+                    zone_settings={
+                        self._airtouch_zone.zone_id: ZoneSettings(
+                            power_state=power_state, target_temperature=temperature
+                        )
+                    },
+                )
+            )
+        entities.get_schedule_engine(
+            self.hass, self._config_entry_id
+        ).async_set_program(("zone", self._airtouch_zone.zone_id), program)
+
+    async def async_clear_schedule(self) -> None:
+        """Remove the weekly schedule of the zone."""
+        entities.get_schedule_engine(
+            self.hass, self._config_entry_id
+        ).async_set_program(("zone", self._airtouch_zone.zone_id), [])
+
+    async def _async_set_zone_power(
+        self, power_state: pyairtouch.ZonePowerState
+    ) -> None:
+        await self._async_send_optimistic(
+            self._command_queue.async_set_zone_power(self._airtouch_zone, power_state),
+            self._airtouch_zone,
+            {"power_state": power_state},
+        )
@@ -0,0 +1,427 @@
+"""Coalescing of outbound AirTouch commands.
+
+Service calls that touch many zones at once, such as scenes, can result in many
+commands being sent to the AirTouch console in quick succession. Commands are
+collected for a short window and redundant commands are dropped so that only the
+latest requested value for each setting is sent.
+
+While the AirTouch console is unreachable, commands are recorded in the command
+journal instead and sent once the connection has been re-established.
+"""
+
+import asyncio
+import enum
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Literal, NotRequired, TypedDict, TypeVar
+
+import pyairtouch
+from homeassistant.core import HomeAssistant, callback
+
+if TYPE_CHECKING:
+    from .instrumentation import Instrumentation
+    from .journal import CommandJournal
+
+# Time to wait for further commands before sending.
+_COMMAND_WINDOW = 0.05
+
+_CommandKey = tuple[Literal["ac", "zone"], int, str]
+_Sender = Callable[[], Awaitable[None]]
+
+_EnumT = TypeVar("_EnumT", bound=enum.Enum)
+
+
+@dataclass(frozen=True)
+class AcSettings:
+    """Settings to apply to an AC as part of a batch."""
+
+    power_control: pyairtouch.AcPowerControl | None = None
+    mode: pyairtouch.AcMode | None = None
+    """A new mode for the AC. Sent together with a power control to turn on."""
+    fan_speed: pyairtouch.AcFanSpeed | None = None
+    target_temperature: float | None = None
+
+    def updated(self, newer: "AcSettings") -> "AcSettings":
+        """Combine with newer settings, which take precedence."""
+        return replace(
+            self,
+            **{name: value for name, value in vars(newer).items() if value is not None},
+        )
+
+
+@dataclass(frozen=True)
+class ZoneSettings:
+    """Settings to apply to a zone as part of a batch.
+
+    The target temperature and damper percentage are mutually exclusive.
+    """
+
+    power_state: pyairtouch.ZonePowerState | None = None
+    target_temperature: float | None = None
+    damper_percentage: int | None = None
+
+    def updated(self, newer: "ZoneSettings") -> "ZoneSettings":
+        """Combine with newer settings, which take precedence."""
+        power_state = newer.power_state or self.power_state
+        if newer.target_temperature is None and newer.damper_percentage is None:
+            return replace(self, power_state=power_state)
+        return replace(newer, power_state=power_state)
+
+
+class StoredAcSettings(TypedDict):
+    """AC settings in persistent storage."""
+
+    power_control: NotRequired[str]
+    mode: NotRequired[str]
+    fan_speed: NotRequired[str]
+    target_temperature: NotRequired[float]
+
+
+class StoredZoneSettings(TypedDict):
+    """Zone settings in persistent storage."""
+
+    power_state: NotRequired[str]
+    target_temperature: NotRequired[float]
+    damper_percentage: NotRequired[int]
+
+
+@dataclass
+class _PendingCommand:
+    send: _Sender
+    change: AcSettings | ZoneSettings
+    waiters: list["asyncio.Future[None]"] = field(default_factory=list)
+
+
+class AcCommandQueue:
+    """Coalesces commands for an AC and its zones.
+
+    Commands for the same setting replace any pending command for that setting.
+    Pending commands are sent in the order of their most recent request, and
+    callers wait until the command that superseded theirs has been sent.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        airtouch_ac: pyairtouch.AirConditioner,
+        instrumentation: "Instrumentation",
+        journal: "CommandJournal",
+    ) -> None:
+        self._hass = hass
+        self._airtouch_ac = airtouch_ac
+        self._instrumentation = instrumentation
+        self._journal = journal
+
+        self._pending: dict[_CommandKey, _PendingCommand] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        # Ensures commands from consecutive windows are sent in order.
+        self._send_lock = asyncio.Lock()
+
+    async def async_set_ac_power(
+        self, power_control: pyairtouch.AcPowerControl
+    ) -> None:
+        """Set a new power state for the AC."""
+        await self._async_enqueue(
+            self._ac_key("power"),
+            lambda: self._airtouch_ac.set_power(power_control),
+            AcSettings(power_control=power_control),
+        )
+
+    async def async_set_ac_mode(
+        self, mode: pyairtouch.AcMode, *, power_on: bool = False
+    ) -> None:
+        """Set a new mode for the AC, optionally powering it on."""
+        await self._async_enqueue(
+            self._ac_key("mode"),
+            lambda: self._airtouch_ac.set_mode(mode, power_on=power_on),
+            AcSettings(
+                power_control=pyairtouch.AcPowerControl.TURN_ON if power_on else None,
+                mode=mode,
+            ),
+        )
+
+    async def async_set_ac_fan_speed(self, fan_speed: pyairtouch.AcFanSpeed) -> None:
+        """Set a new fan speed for the AC."""
+        await self._async_enqueue(
+            self._ac_key("fan_speed"),
+            lambda: self._airtouch_ac.set_fan_speed(fan_speed),
+            AcSettings(fan_speed=fan_speed),
+        )
+
+    async def async_set_ac_target_temperature(self, temperature: float) -> None:
+        """Set a new target temperature for the AC."""
+        await self._async_enqueue(
+            self._ac_key("target_temperature"),
+            lambda: self._airtouch_ac.set_target_temperature(temperature),
+            AcSettings(target_temperature=temperature),
+        )
+
+    async def async_set_zone_power(
+        self, airtouch_zone: pyairtouch.Zone, power_state: pyairtouch.ZonePowerState
+    ) -> None:
+        """Set a new power state for a zone."""
+        await self._async_enqueue(
+            self._zone_key(airtouch_zone, "power"),
+            lambda: airtouch_zone.set_power(power_state),
+            ZoneSettings(power_state=power_state),
+        )
+
+    async def async_cycle_zone_power(self, airtouch_zone: pyairtouch.Zone) -> None:
+        """Turn a zone off then on again.
+
+        Used to trigger the AirTouch to turn the AC on when a zone is turned
+        on, so the two power states are always sent rather than being
+        coalesced. Only the final power state is journaled.
+        """
+
+        async def cycle_power() -> None:
+            await airtouch_zone.set_power(pyairtouch.ZonePowerState.OFF)
+            await airtouch_zone.set_power(pyairtouch.ZonePowerState.ON)
+
+        await self._async_enqueue(
+            self._zone_key(airtouch_zone, "power"),
+            cycle_power,
+            ZoneSettings(power_state=pyairtouch.ZonePowerState.ON),
+        )
+
+    async def async_set_zone_target_temperature(
+        self, airtouch_zone: pyairtouch.Zone, temperature: float
+    ) -> None:
+        """Set a new target temperature for a zone."""
+        # The target temperature and damper percentage are mutually exclusive
+        # zone settings, so they share a key.
+        await self._async_enqueue(
+            self._zone_key(airtouch_zone, "setting"),
+            lambda: airtouch_zone.set_target_temperature(temperature),
+            ZoneSettings(target_temperature=temperature),
+        )
+
+    async def async_set_zone_damper_percentage(
+        self, airtouch_zone: pyairtouch.Zone, open_percentage: int
+    ) -> None:
+        """Set a zone to a specific damper percentage."""
+        await self._async_enqueue(
+            self._zone_key(airtouch_zone, "setting"),
+            lambda: airtouch_zone.set_damper_percentage(open_percentage),
+            ZoneSettings(damper_percentage=open_percentage),
+        )
+
+    async def async_apply(
+        self,
+        ac_settings: AcSettings | None,
+        zone_settings: Mapping[pyairtouch.Zone, ZoneSettings],
+    ) -> None:
+        """Apply settings to the AC and any of its zones in a single batch."""
+        setting_commands: list[Awaitable[None]] = []
+        power_commands: list[Awaitable[None]] = []
+        for airtouch_zone, settings in zone_settings.items():
+            self._add_zone_commands(
+                airtouch_zone, settings, setting_commands, power_commands
+            )
+        if ac_settings:
+            self._add_ac_commands(ac_settings, setting_commands, power_commands)
+
+        # All commands are queued together so that they are sent in a single
+        # batch. Settings are queued ahead of power changes so that the new
+        # settings are in place when a zone or the AC turns on.
+        await asyncio.gather(*setting_commands, *power_commands)
+
+    def _add_zone_commands(
+        self,
+        airtouch_zone: pyairtouch.Zone,
+        settings: ZoneSettings,
+        setting_commands: list[Awaitable[None]],
+        power_commands: list[Awaitable[None]],
+    ) -> None:
+        power_state = settings.power_state
+        if settings.target_temperature is not None:
+            setting_commands.append(
+                self.async_set_zone_target_temperature(
+                    airtouch_zone, settings.target_temperature
+                )
+            )
+        if settings.damper_percentage is not None:
+            setting_commands.append(
+                self.async_set_zone_damper_percentage(
+                    airtouch_zone, settings.damper_percentage
+                )
+            )
+            # As for the damper cover entity, opening the damper of a zone
+            # that is turned off also turns the zone on.
+            if (
+                power_state is None
+                and settings.damper_percentage > 0
+                and airtouch_zone.power_state == pyairtouch.ZonePowerState.OFF
+            ):
+                power_state = pyairtouch.ZonePowerState.ON
+        if power_state is not None:
+            power_commands.append(self.async_set_zone_power(airtouch_zone, power_state))
+
+    def _add_ac_commands(
+        self,
+        settings: AcSettings,
+        setting_commands: list[Awaitable[None]],
+        power_commands: list[Awaitable[None]],
+    ) -> None:
+        if settings.fan_speed is not None:
+            setting_commands.append(self.async_set_ac_fan_speed(settings.fan_speed))
+        if settings.target_temperature is not None:
+            setting_commands.append(
+                self.async_set_ac_target_temperature(settings.target_temperature)
+            )
+        power_control = settings.power_control
+        if settings.mode is not None:
+            power_on = power_control == pyairtouch.AcPowerControl.TURN_ON
+            power_commands.append(
+                self.async_set_ac_mode(settings.mode, power_on=power_on)
+            )
+            if power_on:
+                power_control = None
+        if power_control is not None:
+            power_commands.append(self.async_set_ac_power(power_control))
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Discard any pending commands."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for command in self._pending.values():
+            for waiter in command.waiters:
+                waiter.cancel()
+        self._pending.clear()
+
+    def _ac_key(self, setting: str) -> _CommandKey:
+        return ("ac", self._airtouch_ac.ac_id, setting)
+
+    def _zone_key(self, airtouch_zone: pyairtouch.Zone, setting: str) -> _CommandKey:
+        return ("zone", airtouch_zone.zone_id, setting)
+
+    async def _async_enqueue(
+        self, key: _CommandKey, send: _Sender, change: AcSettings | ZoneSettings
+    ) -> None:
+        if self._journal.offline:
+            self._record_in_journal(key, change)
+            return
+
+        # A superseded command is moved to the end of the queue so that
+        # commands are sent in the order they were last requested.
+        superseded = self._pending.pop(key, None)
+        command = _PendingCommand(
+            send=send, change=change, waiters=superseded.waiters if superseded else []
+        )
+        waiter = self._hass.loop.create_future()
+        command.waiters.append(waiter)
+        self._pending[key] = command
+
+        if not self._flush_handle:
+            self._flush_handle = self._hass.loop.call_later(
+                _COMMAND_WINDOW, self._start_flush
+            )
+
+        await waiter
+
+    def _record_in_journal(
+        self, key: _CommandKey, change: AcSettings | ZoneSettings
+    ) -> None:
+        ac_id = self._airtouch_ac.ac_id
+        if isinstance(change, AcSettings):
+            self._journal.record_ac(ac_id, change)
+        else:
+            self._journal.record_zone(ac_id, key[1], change)
+
+    @callback
+    def _start_flush(self) -> None:
+        self._flush_handle = None
+        pending = list(self._pending.items())
+        self._pending.clear()
+        if self._journal.offline:
+            # The connection was lost while the commands were being collected.
+            for key, command in pending:
+                self._record_in_journal(key, command.change)
+                for waiter in command.waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+            return
+        self._hass.async_create_task(self._async_send(pending))
+
+    async def _async_send(
+        self, pending: list[tuple[_CommandKey, _PendingCommand]]
+    ) -> None:
+        instrumentation = self._instrumentation
+        async with self._send_lock:
+            for key, command in pending:
+                start = time.monotonic()
+                try:
+                    await command.send()
+                except Exception as ex:  # noqa: BLE001 # Passed to the callers
+                    instrumentation.command_errors += 1
+                    for waiter in command.waiters:
+                        if not waiter.done():
+                            waiter.set_exception(ex)
+                else:
+                    instrumentation.command_latency.record(time.monotonic() - start)
+                    instrumentation.command_sent((key[0], key[1]), start)
+                    for waiter in command.waiters:
+                        if not waiter.done():
+                            waiter.set_result(None)
+
+
+def dump_ac_settings(settings: AcSettings) -> StoredAcSettings:
+    """Convert AC settings to their persistent storage format."""
+    stored = StoredAcSettings()
+    if settings.power_control:
+        stored["power_control"] = settings.power_control.name
+    if settings.mode:
+        stored["mode"] = settings.mode.name
+    if settings.fan_speed:
+        stored["fan_speed"] = settings.fan_speed.name
+    if settings.target_temperature is not None:
+        stored["target_temperature"] = settings.target_temperature
+    return stored
+
+
+def dump_zone_settings(settings: ZoneSettings) -> StoredZoneSettings:
+    """Convert zone settings to their persistent storage format."""
+    stored = StoredZoneSettings()
+    if settings.power_state:
+        stored["power_state"] = settings.power_state.name
+    if settings.target_temperature is not None:
+        stored["target_temperature"] = settings.target_temperature
+    if settings.damper_percentage is not None:
+        stored["damper_percentage"] = settings.damper_percentage
+    return stored
+
+
+def load_ac_settings(stored: StoredAcSettings) -> AcSettings:
+    """Convert AC settings from their persistent storage format.
+
+    Raises:
+        KeyError: If a stored setting isn't a valid enum name.
+    """
+    return AcSettings(
+        power_control=_load_enum(
+            pyairtouch.AcPowerControl, stored.get("power_control")
+        ),
+        mode=_load_enum(pyairtouch.AcMode, stored.get("mode")),
+        fan_speed=_load_enum(pyairtouch.AcFanSpeed, stored.get("fan_speed")),
+        target_temperature=stored.get("target_temperature"),
+    )
+
+
+def load_zone_settings(stored: StoredZoneSettings) -> ZoneSettings:
+    """Convert zone settings from their persistent storage format.
+
+    Raises:
+        KeyError: If a stored setting isn't a valid enum name.
+    """
+    return ZoneSettings(
+        power_state=_load_enum(pyairtouch.ZonePowerState, stored.get("power_state")),
+        target_temperature=stored.get("target_temperature"),
+        damper_percentage=stored.get("damper_percentage"),
+    )
+
+
+def _load_enum(enum_type: type[_EnumT], name: str | None) -> _EnumT | None:
+    return enum_type[name] if name is not None else None
@@ -1,5 +1,6 @@
 """Config flow for Polyaire AirTouch."""
 
+import ipaddress
 from typing import Any
 
 import pyairtouch
@@ -7,9 +8,13 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import (
     CONF_HOST,
+    PERCENTAGE,
     PRECISION_HALVES,
     PRECISION_TENTHS,
     PRECISION_WHOLE,
+    UnitOfPower,
+    UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.core import callback
 from homeassistant.helpers import selector
@@ -22,15 +27,38 @@ from .const import (
     DOMAIN,
     OPTIONS_ALLOW_ZONE_HVAC_MODE_CHANGES,
     OPTIONS_ALLOW_ZONE_HVAC_MODE_CHANGES_DEFAULT,
+    OPTIONS_COOLING_POWER,
+    OPTIONS_DAMPER_DEADBAND,
+    OPTIONS_DAMPER_DEADBAND_DEFAULT,
+    OPTIONS_DAMPER_MIN_INTERVAL,
+    OPTIONS_DAMPER_MIN_INTERVAL_DEFAULT,
+    OPTIONS_DRYING_POWER,
+    OPTIONS_FAN_POWER,
+    OPTIONS_HEATING_POWER,
     OPTIONS_MIN_TARGET_TEMPERATURE_STEP,
     OPTIONS_MIN_TARGET_TEMPERATURE_STEP_DEFAULT,
+    OPTIONS_OPTIMISTIC_TIMEOUT,
+    OPTIONS_OPTIMISTIC_TIMEOUT_DEFAULT,
+    OPTIONS_POWER_DEFAULT,
+    OPTIONS_TEMPERATURE_DEADBAND,
+    OPTIONS_TEMPERATURE_DEADBAND_DEFAULT,
+    OPTIONS_TEMPERATURE_MIN_INTERVAL,
+    OPTIONS_TEMPERATURE_MIN_INTERVAL_DEFAULT,
+    OPTIONS_ZONE_SENSOR_STATISTICS,
+    OPTIONS_ZONE_SENSOR_STATISTICS_DEFAULT,
     SpillBypass,
 )
+from .discovery import get_discovery_service
+
+_CONF_AIRTOUCH = "airtouch"
 
 _CONTEXT_TITLE = "title"
 _CONTEXT_AIRTOUCH_API = "airtouch_api"
 _CONTEXT_REMAINING_AIRTOUCHES = "remaining_airtouches"
 
+# The maximum number of hosts that can be searched at once.
+_MAX_HOSTS = 1024
+
 
 class AirTouchConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Configures the AirTouch integration."""
@@ -70,26 +98,31 @@ class AirTouchConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         Args:
             info: accumulated info from any previous steps.
-            remote_host: optional remote host to target for discovery.
+            remote_host: optional remote host, list of hosts or CIDR ranges to
+                target for discovery.
         """
         # Save the current remote host as context for other steps
         self.context[CONF_HOST] = remote_host  # type: ignore[literal-required]
 
-        discovered_airtouches = await pyairtouch.discover(remote_host)
+        discovery = get_discovery_service(self.hass)
+        hosts = _parse_hosts(remote_host) if remote_host else []
+        if len(hosts) > 1:
+            discovered_airtouches = await discovery.async_search_hosts(hosts)
+        else:
+            discovered_airtouches = await discovery.async_search(
+                hosts[0] if hosts else None
+            )
         airtouches = self._filter_unconfigured(discovered_airtouches)
 
-        if airtouches:
-            # If more than one AirTouch is discovered, arbitrarily choose the
-            # last one in the list. The user will need to run the config flow
-            # again to add the other AirTouch devices.
-            airtouch = airtouches.pop()
-            self.context[_CONTEXT_TITLE] = airtouch.name  # type: ignore[literal-required]
-            self.context[_CONTEXT_AIRTOUCH_API] = airtouch  # type: ignore[literal-required]
+        if len(airtouches) > 1:
+            # Let the user choose which AirTouch to set up. The user will need
+            # to run the config flow again to add the other AirTouch devices.
             self.context[_CONTEXT_REMAINING_AIRTOUCHES] = airtouches  # type: ignore[literal-required]
+            return await self.async_step_select_airtouch()
 
-            await self.async_set_unique_id(airtouch.airtouch_id)
-
-            return await self.async_step_settings()
+        if airtouches:
+            self.context[_CONTEXT_REMAINING_AIRTOUCHES] = []  # type: ignore[literal-required]
+            return await self._async_set_up_airtouch(airtouches[0])
 
         errors: dict[str, str] = {}
         if remote_host:
@@ -110,6 +143,13 @@ class AirTouchConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         info: dict[str, Any] | None = None,
         errors: dict[str, str] | None = None,
     ) -> "config_entries.ConfigFlowResult":
+        if info and not errors:
+            self.context[CONF_HOST] = info[CONF_HOST]  # type: ignore[literal-required]
+            try:
+                _parse_hosts(info[CONF_HOST])
+            except _InvalidHostsError as ex:
+                errors = {CONF_HOST: ex.error}
+
         if not info or errors:
             return self.async_show_form(
                 step_id="user_host",
@@ -126,6 +166,50 @@ class AirTouchConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return await self.async_step_discover_airtouch(info[CONF_HOST])
 
+    async def async_step_select_airtouch(
+        self,
+        info: dict[str, Any] | None = None,
+    ) -> "config_entries.ConfigFlowResult":
+        airtouches: list[pyairtouch.AirTouch] = self.context[
+            _CONTEXT_REMAINING_AIRTOUCHES  # type: ignore[literal-required]
+        ]
+        if not info:
+            return self.async_show_form(
+                step_id="select_airtouch",
+                data_schema=vol.Schema(
+                    schema={
+                        vol.Required(_CONF_AIRTOUCH): selector.SelectSelector(
+                            selector.SelectSelectorConfig(
+                                options=[
+                                    {
+                                        "label": f"{at.name} ({at.host})",
+                                        "value": at.airtouch_id,
+                                    }
+                                    for at in airtouches
+                                ],
+                                mode=selector.SelectSelectorMode.LIST,
+                            )
+                        )
+                    }
+                ),
+            )
+
+        airtouch = next(
+            at for at in airtouches if at.airtouch_id == info[_CONF_AIRTOUCH]
+        )
+        airtouches.remove(airtouch)
+        return await self._async_set_up_airtouch(airtouch)
+
+    async def _async_set_up_airtouch(
+        self, airtouch: pyairtouch.AirTouch
+    ) -> "config_entries.ConfigFlowResult":
+        self.context[_CONTEXT_TITLE] = airtouch.name  # type: ignore[literal-required]
+        self.context[_CONTEXT_AIRTOUCH_API] = airtouch  # type: ignore[literal-required]
+
+        await self.async_set_unique_id(airtouch.airtouch_id)
+
+        return await self.async_step_settings()
+
     async def async_step_settings(
         self,
         info: dict[str, Any] | None = None,
@@ -172,7 +256,9 @@ class AirTouchConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             zone_options: list[selector.SelectOptionDict] = []
             airtouch: pyairtouch.AirTouch = self.context[_CONTEXT_AIRTOUCH_API]  # type: ignore[literal-required]
 
-            await airtouch.init()
+            # The connection is kept open to be handed over to the config entry.
+            if not airtouch.initialised:
+                await airtouch.init()
 
             # Zone IDs are unique across all ACs within an AirTouch system.
             zone_options.extend(
@@ -183,8 +269,6 @@ class AirTouchConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 ]
             )
 
-            await airtouch.shutdown()
-
             return self.async_show_form(
                 step_id="spill_zones",
                 data_schema=vol.Schema(
@@ -215,10 +299,20 @@ class AirTouchConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 step_id="finalise",
             )
 
+        # Hand the connection over to the config entry set-up so that it
+        # doesn't have to discover and initialise the AirTouch again.
+        airtouch: pyairtouch.AirTouch = self.context.pop(_CONTEXT_AIRTOUCH_API)  # type: ignore[literal-required]
+        if airtouch.initialised or await airtouch.init():
+            get_discovery_service(self.hass).async_hand_over(airtouch)
+        else:
+            await airtouch.shutdown()
+
         return self.async_create_entry(
             title=self.context[_CONTEXT_TITLE],  # type: ignore[literal-required]
             data={
-                CONF_HOST: self.context[CONF_HOST],  # type: ignore[literal-required]
+                # Only the host of the selected AirTouch is needed for unicast
+                # discovery in future.
+                CONF_HOST: airtouch.host if self.context[CONF_HOST] else None,  # type: ignore[literal-required]
                 CONF_SPILL_BYPASS: self.context[CONF_SPILL_BYPASS],  # type: ignore[literal-required]
                 CONF_SPILL_ZONES: self.context[CONF_SPILL_ZONES],  # type: ignore[literal-required]
             },
@@ -229,6 +323,13 @@ class AirTouchConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             },
         )
 
+    @callback
+    def async_remove(self) -> None:
+        """Shut down the AirTouch connection if the flow didn't create an entry."""
+        airtouch: pyairtouch.AirTouch | None = self.context.get(_CONTEXT_AIRTOUCH_API)  # type: ignore[assignment]
+        if airtouch and airtouch.initialised:
+            self.hass.async_create_task(airtouch.shutdown())
+
     def _filter_unconfigured(
         self, discovered_airtouches: list[pyairtouch.AirTouch]
     ) -> list[pyairtouch.AirTouch]:
@@ -304,10 +405,126 @@ class AirTouchOptionsFlow(config_entries.OptionsFlow):
                             mode=selector.SelectSelectorMode.LIST,
                         )
                     ),
+                    vol.Required(
+                        OPTIONS_OPTIMISTIC_TIMEOUT,
+                        default=self.config_entry.options.get(
+                            OPTIONS_OPTIMISTIC_TIMEOUT,
+                            OPTIONS_OPTIMISTIC_TIMEOUT_DEFAULT,
+                        ),
+                    ): _number_selector(max_value=30, step=1, unit=UnitOfTime.SECONDS),
+                    vol.Required(
+                        OPTIONS_TEMPERATURE_MIN_INTERVAL,
+                        default=self.config_entry.options.get(
+                            OPTIONS_TEMPERATURE_MIN_INTERVAL,
+                            OPTIONS_TEMPERATURE_MIN_INTERVAL_DEFAULT,
+                        ),
+                    ): _number_selector(
+                        max_value=3600, step=1, unit=UnitOfTime.SECONDS
+                    ),
+                    vol.Required(
+                        OPTIONS_TEMPERATURE_DEADBAND,
+                        default=self.config_entry.options.get(
+                            OPTIONS_TEMPERATURE_DEADBAND,
+                            OPTIONS_TEMPERATURE_DEADBAND_DEFAULT,
+                        ),
+                    ): _number_selector(
+                        max_value=2, step=0.1, unit=UnitOfTemperature.CELSIUS
+                    ),
+                    vol.Required(
+                        OPTIONS_DAMPER_MIN_INTERVAL,
+                        default=self.config_entry.options.get(
+                            OPTIONS_DAMPER_MIN_INTERVAL,
+                            OPTIONS_DAMPER_MIN_INTERVAL_DEFAULT,
+                        ),
+                    ): _number_selector(
+                        max_value=3600, step=1, unit=UnitOfTime.SECONDS
+                    ),
+                    vol.Required(
+                        OPTIONS_DAMPER_DEADBAND,
+                        default=self.config_entry.options.get(
+                            OPTIONS_DAMPER_DEADBAND,
+                            OPTIONS_DAMPER_DEADBAND_DEFAULT,
+                        ),
+                    ): _number_selector(max_value=50, step=5, unit=PERCENTAGE),
+                    vol.Required(
+                        OPTIONS_ZONE_SENSOR_STATISTICS,
+                        default=self.config_entry.options.get(
+                            OPTIONS_ZONE_SENSOR_STATISTICS,
+                            OPTIONS_ZONE_SENSOR_STATISTICS_DEFAULT,
+                        ),
+                    ): bool,
+                    **{
+                        vol.Required(
+                            option,
+                            default=self.config_entry.options.get(
+                                option, OPTIONS_POWER_DEFAULT
+                            ),
+                        ): _number_selector(
+                            max_value=20, step=0.1, unit=UnitOfPower.KILO_WATT
+                        )
+                        for option in (
+                            OPTIONS_HEATING_POWER,
+                            OPTIONS_COOLING_POWER,
+                            OPTIONS_DRYING_POWER,
+                            OPTIONS_FAN_POWER,
+                        )
+                    },
                 }
             ),
         )
 
 
+def _number_selector(
+    max_value: float, step: float, unit: str
+) -> selector.NumberSelector:
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=max_value,
+            step=step,
+            unit_of_measurement=unit,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    )
+
+
 def _format_precision(precision: float) -> str:
     return f"{precision:.1f}"
+
+
+class _InvalidHostsError(Exception):
+    """The hosts entered by the user are invalid."""
+
+    def __init__(self, error: str) -> None:
+        super().__init__(error)
+        self.error = error
+        """The translation key of the error."""
+
+
+def _parse_hosts(text: str) -> list[str]:
+    """Parse a list of hosts and CIDR ranges separated by commas or spaces.
+
+    Raises:
+        _InvalidHostsError: if a CIDR range is invalid or there are too many
+            hosts.
+    """
+    hosts: list[str] = []
+    for item in text.replace(",", " ").split():
+        if "/" in item:
+            try:
+                network = ipaddress.IPv4Network(item, strict=False)
+            except ValueError as ex:
+                raise _InvalidHostsError("invalid_host") from ex
+            if network.num_addresses > _MAX_HOSTS:
+                raise _InvalidHostsError("too_many_hosts")
+            hosts.extend(str(host) for host in network.hosts())
+        else:
+            hosts.append(item)
+
+    # Remove duplicates while preserving the order.
+    hosts = list(dict.fromkeys(hosts))
+    if not hosts:
+        raise _InvalidHostsError("invalid_host")
+    if len(hosts) > _MAX_HOSTS:
+        raise _InvalidHostsError("too_many_hosts")
+    return hosts
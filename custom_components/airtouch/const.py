@@ -18,6 +18,12 @@ CONF_SPILL_BYPASS = "spill_bypass"
 # Only valid if CONF_SPILL_BYPASS == SpillBypass.SPILL
 CONF_SPILL_ZONES = "spill_zones"
 
+# The AirTouch console doesn't seem to perform any checks for a Damper
+# Increase command if the current percentage is >95% which can result in
+# an open percentage >100%!
+# To avoid this, we jump to the nearest 5%.
+DAMPER_STEP = 5
+
 OPTIONS_MIN_TARGET_TEMPERATURE_STEP = "min_target_temperature_step"
 OPTIONS_MIN_TARGET_TEMPERATURE_STEP_DEFAULT = PRECISION_HALVES
 
@@ -25,6 +31,40 @@ OPTIONS_MIN_TARGET_TEMPERATURE_STEP_DEFAULT = PRECISION_HALVES
 OPTIONS_ALLOW_ZONE_HVAC_MODE_CHANGES = "allow_zone_hvac_mode_changes"
 OPTIONS_ALLOW_ZONE_HVAC_MODE_CHANGES_DEFAULT = False
 
+# Seconds to show the expected result of a command before reverting to the
+# state reported by the AirTouch. Zero disables optimistic state.
+OPTIONS_OPTIMISTIC_TIMEOUT = "optimistic_timeout"
+OPTIONS_OPTIMISTIC_TIMEOUT_DEFAULT = 5
+
+# Rate limiting of the temperature and damper percentage sensors.
+# The minimum interval is the minimum number of seconds between state writes.
+# Changes smaller than the deadband are held back and written later, so that
+# small fluctuations don't produce a new state every time they occur.
+# Zero disables each limit.
+OPTIONS_TEMPERATURE_MIN_INTERVAL = "temperature_min_interval"
+OPTIONS_TEMPERATURE_MIN_INTERVAL_DEFAULT = 0
+OPTIONS_TEMPERATURE_DEADBAND = "temperature_deadband"
+OPTIONS_TEMPERATURE_DEADBAND_DEFAULT = 0.0
+OPTIONS_DAMPER_MIN_INTERVAL = "damper_min_interval"
+OPTIONS_DAMPER_MIN_INTERVAL_DEFAULT = 0
+OPTIONS_DAMPER_DEADBAND = "damper_deadband"
+OPTIONS_DAMPER_DEADBAND_DEFAULT = 0
+
+# Whether Home Assistant compiles long-term statistics from the zone temperature
+# and damper sensors. The integration writes its own hourly zone statistics, so
+# these can be turned off to avoid keeping the same history twice.
+OPTIONS_ZONE_SENSOR_STATISTICS = "zone_sensor_statistics"
+OPTIONS_ZONE_SENSOR_STATISTICS_DEFAULT = True
+
+# Estimated electrical power in kW drawn by an AC while it is heating, cooling,
+# drying or running the fan only. Used to estimate energy use from the run
+# times. Zero excludes the mode from the estimate.
+OPTIONS_HEATING_POWER = "heating_power"
+OPTIONS_COOLING_POWER = "cooling_power"
+OPTIONS_DRYING_POWER = "drying_power"
+OPTIONS_FAN_POWER = "fan_power"
+OPTIONS_POWER_DEFAULT = 0.0
+
 
 class SpillBypass(enum.Enum):
     """Whether the system has been installed with a bypass damper or spill zone."""
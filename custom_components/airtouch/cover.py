@@ -5,7 +5,7 @@ system.
 """
 
 import logging
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 import pyairtouch
 from homeassistant.components import cover
@@ -14,15 +14,14 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import devices, entities
-from .const import DOMAIN
+from .commands import ZoneSettings
+from .const import DAMPER_STEP, DOMAIN
 
-_LOGGER = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    from .commands import AcCommandQueue
+    from .models import AirTouchData
 
-# The AirTouch console doesn't seem to perform any checks for a Damper
-# Increase command if the current percentage is >95% which can result in
-# an open percentage >100%!
-# To avoid this, we jump to the nearest 5%.
-_DAMPER_STEP = 5
+_LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(
@@ -31,19 +30,22 @@ async def async_setup_entry(
     async_add_devices: AddEntitiesCallback,
 ) -> None:
     """Set up the AirTouch cover devices."""
-    airtouch: pyairtouch.AirTouch = hass.data[DOMAIN][config_entry.entry_id]
+    data: AirTouchData = hass.data[DOMAIN][config_entry.entry_id]
+    airtouch = data.airtouch
 
     discovered_entities: list[cover.CoverEntity] = []
 
-    airtouch_device = devices.AirTouchDevice(hass, config_entry.entry_id, airtouch)
+    airtouch_device = data.airtouch_device
     for airtouch_ac in airtouch.air_conditioners:
         ac_device = airtouch_device.ac_device(airtouch_ac)
+        command_queue = data.command_queues[airtouch_ac.ac_id]
 
         for airtouch_zone in airtouch_ac.zones:
             zone_device = ac_device.zone_device(airtouch_zone)
             zone_entity = ZoneDamperEntity(
                 zone_device=zone_device,
                 airtouch_zone=airtouch_zone,
+                command_queue=command_queue,
             )
             discovered_entities.append(zone_entity)
 
@@ -51,7 +53,9 @@ async def async_setup_entry(
     async_add_devices(discovered_entities)
 
 
-class ZoneDamperEntity(entities.AirTouchZoneEntity, cover.CoverEntity):
+class ZoneDamperEntity(
+    entities.AirTouchZoneEntity, entities.OptimisticEntity, cover.CoverEntity
+):
     """Cover entity for an AirTouch zone's damper."""
 
     _attr_name = "Damper"
@@ -63,7 +67,10 @@ class ZoneDamperEntity(entities.AirTouchZoneEntity, cover.CoverEntity):
     )
 
     def __init__(
-        self, zone_device: devices.ZoneDevice, airtouch_zone: pyairtouch.Zone
+        self,
+        zone_device: devices.ZoneDevice,
+        airtouch_zone: pyairtouch.Zone,
+        command_queue: "AcCommandQueue",
     ) -> None:
         # The climate entity is considered main entity, so the damper entity
         # uses an id_suffix.
@@ -72,35 +79,71 @@ class ZoneDamperEntity(entities.AirTouchZoneEntity, cover.CoverEntity):
             airtouch_zone=airtouch_zone,
             id_suffix="_damper",
         )
+        self._command_queue = command_queue
+
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (
+            self._airtouch_zone.power_state,
+            self._airtouch_zone.current_damper_percentage,
+        )
 
     @property
     def current_cover_position(self) -> int | None:
-        if self._airtouch_zone.power_state == pyairtouch.ZonePowerState.OFF:
+        if self._zone_power_state == pyairtouch.ZonePowerState.OFF:
             return 0
-        return self._airtouch_zone.current_damper_percentage
+        return self._current_value(self._airtouch_zone, "current_damper_percentage")
 
     @property
     def is_closed(self) -> Optional[bool]:
-        return self._airtouch_zone.power_state == pyairtouch.ZonePowerState.OFF
+        return self._zone_power_state == pyairtouch.ZonePowerState.OFF
+
+    # Zone power state that may be shown optimistically after a command.
+    @property
+    def _zone_power_state(self) -> pyairtouch.ZonePowerState | None:
+        return self._current_value(self._airtouch_zone, "power_state")
 
     async def async_open_cover(self, **_: Any) -> None:  # noqa: ANN401
         # We treat this as a request to turn the zone on
-        await self._airtouch_zone.set_power(pyairtouch.ZonePowerState.ON)
+        await self._async_set_zone_power(pyairtouch.ZonePowerState.ON)
 
     async def async_close_cover(self, **_: Any) -> None:  # noqa: ANN401
         # We treat this as a request to turn the zone off
-        await self._airtouch_zone.set_power(pyairtouch.ZonePowerState.OFF)
+        await self._async_set_zone_power(pyairtouch.ZonePowerState.OFF)
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:  # noqa: ANN401
         open_percentage: int = kwargs[cover.ATTR_POSITION]
-        open_percentage = _DAMPER_STEP * round(open_percentage / _DAMPER_STEP)
-        await self._airtouch_zone.set_damper_percentage(open_percentage)
+        open_percentage = DAMPER_STEP * round(open_percentage / DAMPER_STEP)
+        expected_values: dict[str, object] = {
+            "current_damper_percentage": open_percentage
+        }
 
         # Automatically turn the zone on if the damper position is being opened,
         # otherwise the damper position change won't be reflected in the next
         # state update.
-        if (
+        turn_on = (
             open_percentage > 0
             and self._airtouch_zone.power_state == pyairtouch.ZonePowerState.OFF
-        ):
-            await self._airtouch_zone.set_power(pyairtouch.ZonePowerState.ON)
+        )
+        if turn_on:
+            expected_values["power_state"] = pyairtouch.ZonePowerState.ON
+
+        await self._async_send_optimistic(
+            # The damper and power commands are applied together so that they
+            # are sent in a single batch. Applying the damper percentage turns
+            # the zone on if needed.
+            self._command_queue.async_apply(
+                None,
+                {self._airtouch_zone: ZoneSettings(damper_percentage=open_percentage)},
+            ),
+            self._airtouch_zone,
+            expected_values,
+        )
+
+    async def _async_set_zone_power(
+        self, power_state: pyairtouch.ZonePowerState
+    ) -> None:
+        await self._async_send_optimistic(
+            self._command_queue.async_set_zone_power(self._airtouch_zone, power_state),
+            self._airtouch_zone,
+            {"power_state": power_state},
+        )
@@ -4,7 +4,8 @@ This module is used to ensure consistent device information and IDs are used
 throughout all platforms.
 """
 
-from typing import Optional, cast
+from collections import Counter
+from typing import NamedTuple, Optional, cast
 
 import pyairtouch
 from homeassistant.core import HomeAssistant
@@ -24,6 +25,85 @@ _SUBSTITUTION_WEIGHT = 3
 _MAX_LEVENSTHEIN_DISTANCE = 15
 
 
+class _AreaCandidate(NamedTuple):
+    """A normalised area name or alias that can be matched against."""
+
+    area_name: str
+    normalized_name: str
+    character_counts: Counter[str]
+
+
+class AreaMatcher:
+    """Finds areas in the area registry using a fuzzy search on a name.
+
+    The normalised area names and aliases are indexed on first use so that
+    matching multiple zones only reads and normalises the area registry once.
+    The index should not be retained beyond device set-up since it won't
+    reflect later changes to the area registry.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._candidates: list[_AreaCandidate] | None = None
+        self._exact_matches: dict[str, str] = {}
+
+    def find_area(self, name: str) -> Optional[str]:
+        """Find the area that most closely matches a name.
+
+        Returns:
+            The discovered area name, or none if no area matches.
+        """
+        if self._candidates is None:
+            self._build_index()
+        normalized_name = _normalize_name(name)
+
+        exact_match = self._exact_matches.get(normalized_name)
+        if exact_match:
+            # We can't do any better than this
+            return exact_match
+
+        character_counts = Counter(normalized_name)
+
+        # Find the closest area match using a basic fuzzy search.
+        # The first candidate with the lowest distance wins.
+        best_distance: int = _MAX_LEVENSTHEIN_DISTANCE
+        best_area: Optional[str] = None
+        for candidate in self._candidates or []:
+            # Cheaply skip candidates that can't improve on the current best
+            # before calculating the full distance.
+            if (
+                _distance_lower_bound(character_counts, candidate.character_counts)
+                >= best_distance
+            ):
+                continue
+
+            distance = _levenshtein_distance(
+                normalized_name, candidate.normalized_name, limit=best_distance
+            )
+            if distance < best_distance:
+                best_distance = distance
+                best_area = candidate.area_name
+
+        return best_area
+
+    def _build_index(self) -> None:
+        self._candidates = []
+        registry = area_registry.async_get(self._hass)
+        for area in registry.async_list_areas():
+            normalized_names = [area.normalized_name] + [
+                _normalize_name(alias) for alias in area.aliases
+            ]
+            for normalized_name in normalized_names:
+                self._candidates.append(
+                    _AreaCandidate(
+                        area_name=area.name,
+                        normalized_name=normalized_name,
+                        character_counts=Counter(normalized_name),
+                    )
+                )
+                self._exact_matches.setdefault(normalized_name, area.name)
+
+
 class BaseDevice:
     """Base class used for the various devices within an AirTouch system."""
 
@@ -32,10 +112,12 @@ class BaseDevice:
         hass: HomeAssistant,
         config_entry_id: str,
         unique_id: str,
+        area_matcher: AreaMatcher,
         **kwargs: Unpack[device_registry.DeviceInfo],
     ) -> None:
         self._hass = hass
         self._config_entry_id = config_entry_id
+        self._area_matcher = area_matcher
 
         self._unique_id = unique_id
 
@@ -56,6 +138,11 @@ class BaseDevice:
         """
         return self._unique_id
 
+    @property
+    def config_entry_id(self) -> str:
+        """The ID of the config entry that this device belongs to."""
+        return self._config_entry_id
+
     @property
     def device_info(self) -> device_registry.DeviceInfo:
         """The device registry DeviceInfo for this device."""
@@ -67,65 +154,19 @@ class BaseDevice:
             # We only want to suggest an area that already exists in the Area Registry
             suggested_area = self._device_info.get("suggested_area")
             if suggested_area:
-                self._device_info["suggested_area"] = self._find_area(suggested_area)
+                self._device_info["suggested_area"] = self._area_matcher.find_area(
+                    suggested_area
+                )
 
             registry.async_get_or_create(
                 config_entry_id=self._config_entry_id, **self._device_info
             )
 
-    def _find_area(self, name: str) -> Optional[str]:
-        """Find an area in the area registry using a fuzzy search on a name.
-
-        Returns:
-            The discovered area name, or none if no area matches.
-        """
-        normalized_name = self._normalize_name(name)
-
-        registry = area_registry.async_get(self._hass)
-        areas: list[area_registry.AreaEntry] = list(registry.async_list_areas())
-
-        # Find the closest area match using a basic fuzzy search
-        best_distance: int = _MAX_LEVENSTHEIN_DISTANCE
-        best_area: Optional[area_registry.AreaEntry] = None
-        for area in areas:
-            name_distance = _levenshtein_distance(normalized_name, area.normalized_name)
-            if name_distance < best_distance:
-                best_distance = name_distance
-                best_area = area
-
-            for alias in area.aliases:
-                normalised_alias = self._normalize_name(alias)
-                alias_distance = _levenshtein_distance(
-                    normalized_name, normalised_alias
-                )
-                if alias_distance < best_distance:
-                    best_distance = alias_distance
-                    best_area = area
-
-            if best_distance == 0:
-                # Exact match found, we can't do any better than this
-                break
-
-        if best_area:
-            return best_area.name
-        return None
-
-    def _normalize_name(self, name: str) -> str:
-        # Compatibility: Before 2024.4
-        if hasattr(area_registry, "normalize_area_name"):
-            return cast("str", area_registry.normalize_area_name(name))
-
-        from homeassistant.helpers.normalized_name_base_registry import (
-            normalize_name,
-        )
-
-        return normalize_name(name)
-
 
 class ZoneDevice(BaseDevice):
     """Device information for an AirTouch zone.
 
-    Should be constructed using the zone_device() method on the AcDevice class.
+    Should be accessed using the zone_device() method on the AcDevice class.
     """
 
     def __init__(
@@ -134,10 +175,12 @@ class ZoneDevice(BaseDevice):
         config_entry_id: str,
         ac_unique_id: str,
         airtouch_zone: pyairtouch.Zone,
+        area_matcher: AreaMatcher,
     ) -> None:
         super().__init__(
             hass=hass,
             config_entry_id=config_entry_id,
+            area_matcher=area_matcher,
             # The zone ID is unique across all ACs within an AirTouch system, so
             # there's no need to include the AC ID in the unique identifier, but to
             # keep things simply we just use the parent as the prefix for the unique
@@ -156,7 +199,7 @@ class ZoneDevice(BaseDevice):
 class AcDevice(BaseDevice):
     """Device information for an AirTouch air-conditioner.
 
-    Should be constructed using the ac_device() method on the AirTouchDevice class.
+    Should be accessed using the ac_device() method on the AirTouchDevice class.
     """
 
     def __init__(
@@ -165,29 +208,44 @@ class AcDevice(BaseDevice):
         config_entry_id: str,
         airtouch_unique_id: str,
         airtouch_ac: pyairtouch.AirConditioner,
+        area_matcher: AreaMatcher,
     ) -> None:
         super().__init__(
             hass=hass,
             config_entry_id=config_entry_id,
+            area_matcher=area_matcher,
             # ACs get a sequential identifier within an AirTouch system, so include
             # the airtouch unique ID as a prefix.
             unique_id=f"{airtouch_unique_id}_ac{airtouch_ac.ac_id}",
             name=airtouch_ac.name,
             via_device=(DOMAIN, airtouch_unique_id),
         )
+        self._zone_devices: dict[int, ZoneDevice] = {}
 
     def zone_device(self, airtouch_zone: pyairtouch.Zone) -> ZoneDevice:
-        """Construct device info for a zone associated with this AC."""
-        return ZoneDevice(
-            hass=self._hass,
-            config_entry_id=self._config_entry_id,
-            ac_unique_id=self.unique_id,
-            airtouch_zone=airtouch_zone,
-        )
+        """Device info for a zone associated with this AC.
+
+        The device is constructed and registered on first use. Subsequent calls
+        for the same zone return the same instance.
+        """
+        zone_device = self._zone_devices.get(airtouch_zone.zone_id)
+        if not zone_device:
+            zone_device = ZoneDevice(
+                hass=self._hass,
+                config_entry_id=self._config_entry_id,
+                ac_unique_id=self.unique_id,
+                airtouch_zone=airtouch_zone,
+                area_matcher=self._area_matcher,
+            )
+            self._zone_devices[airtouch_zone.zone_id] = zone_device
+        return zone_device
 
 
 class AirTouchDevice(BaseDevice):
-    """Device information for the AirTouch controller."""
+    """Device information for the AirTouch controller.
+
+    Constructed once per config entry and shared by all platforms.
+    """
 
     def __init__(
         self,
@@ -198,6 +256,9 @@ class AirTouchDevice(BaseDevice):
         super().__init__(
             hass=hass,
             config_entry_id=config_entry_id,
+            # A single matcher is shared by all devices in the AirTouch system
+            # so that the area registry is only indexed once.
+            area_matcher=AreaMatcher(hass),
             # For AirTouch 4 systems the serial number doesn't appear to be
             # unique (some logs have shown an all zeroes MAC address). The
             # AirTouch ID is always unique, so we use that here.
@@ -206,50 +267,131 @@ class AirTouchDevice(BaseDevice):
             manufacturer=MANUFACTURER,
             model=airtouch.model.value,
         )
+        self._ac_devices: dict[int, AcDevice] = {}
+
+        # Build the complete device tree up-front so that every device is
+        # registered exactly once regardless of which platforms use it.
+        for airtouch_ac in airtouch.air_conditioners:
+            ac_device = self.ac_device(airtouch_ac)
+            for airtouch_zone in airtouch_ac.zones:
+                ac_device.zone_device(airtouch_zone)
 
     def ac_device(self, airtouch_ac: pyairtouch.AirConditioner) -> AcDevice:
-        """Construct device info for an AC within the AirTouch system."""
-        return AcDevice(
-            hass=self._hass,
-            config_entry_id=self._config_entry_id,
-            airtouch_unique_id=self.unique_id,
-            airtouch_ac=airtouch_ac,
-        )
+        """Device info for an AC within the AirTouch system.
+
+        The device is constructed and registered on first use. Subsequent calls
+        for the same AC return the same instance.
+        """
+        ac_device = self._ac_devices.get(airtouch_ac.ac_id)
+        if not ac_device:
+            ac_device = AcDevice(
+                hass=self._hass,
+                config_entry_id=self._config_entry_id,
+                airtouch_unique_id=self.unique_id,
+                airtouch_ac=airtouch_ac,
+                area_matcher=self._area_matcher,
+            )
+            self._ac_devices[airtouch_ac.ac_id] = ac_device
+        return ac_device
+
+
+def _normalize_name(name: str) -> str:
+    # Compatibility: Before 2024.4
+    if hasattr(area_registry, "normalize_area_name"):
+        return cast("str", area_registry.normalize_area_name(name))
+
+    from homeassistant.helpers.normalized_name_base_registry import (
+        normalize_name,
+    )
+
+    return normalize_name(name)
 
 
-def _levenshtein_distance(str1: str, str2: str) -> int:
-    """The levenshtein distance between two strings."""
+def _distance_lower_bound(counts1: Counter[str], counts2: Counter[str]) -> int:
+    """A lower bound on the levenshtein distance between two strings.
+
+    Calculated from the character counts of each string. Every character of
+    str1 that is missing from str2 must be deleted or substituted, and every
+    character of str2 that is missing from str1 must be inserted or
+    substituted.
+
+    The first row and column of the levenshtein matrix have unit weights, so
+    leading deletions or leading insertions (but not both) cost one each.
+    """
+    excess1 = (counts1 - counts2).total()
+    excess2 = (counts2 - counts1).total()
+    # Leading deletions, then each str2 character is inserted or substituted.
+    leading_deletions = excess1 + excess2 * min(
+        _INSERTION_WEIGHT, _SUBSTITUTION_WEIGHT - 1
+    )
+    # Leading insertions, then each str1 character is deleted or substituted.
+    leading_insertions = excess2 + excess1 * min(
+        _DELETION_WEIGHT, _SUBSTITUTION_WEIGHT - 1
+    )
+    return min(leading_deletions, leading_insertions)
+
+
+def _levenshtein_distance(str1: str, str2: str, limit: int) -> int:
+    """The levenshtein distance between two strings.
+
+    The calculation stops early once the distance is known to be at least
+    `limit`.
+
+    Returns:
+        The distance, or `limit` if the distance is greater than or equal to
+        `limit`.
+    """
     # Algorithm based on the Wikipedia algorithm:
     # https://en.wikipedia.org/wiki/Levenshtein_distance#Iterative_with_two_matrix_rows
+    #
+    # All distances are capped at the limit and only a diagonal band of the
+    # matrix is calculated. Every edit costs at least one, so cell (i, j) can't
+    # be less than |i - j| and cells outside the band are at the limit.
+    # The bit-parallel algorithm by Myers is not used since it only supports
+    # unit weights.
+    len2 = len(str2)
 
     # Declare the two vectors of the correct size, i.e. one slot for each slice
     # of str2 including the empty slice.
     # These represent the previous and current rows in the levenshtein matrix.
-    v0: list[int] = [0] * (len(str2) + 1)
-    v1: list[int] = list(v0)
-
+    #
     # Initialise v0 (the previous row of distances).
     # This row is the edit distance from an empty str1 to str2, i.e. the number
     # of characters that would need to be appended to the empty string to make
     # str2.
-    for i in range(len(v0)):
-        v0[i] = i
+    v0: list[int] = [min(j, limit) for j in range(len2 + 1)]
+    v1: list[int] = [limit] * (len2 + 1)
 
-    for i in range(len(str1)):
+    for i, char1 in enumerate(str1):
         # Calculate v1 (the current row distances) from the previous row v0
-
-        # The edit distance of the first entry in v0 is to delete (i + 1)
-        # characters from str1 to match an empty str2
-        v1[0] = i + 1
-
-        for j in range(len(str2)):
+        # for the columns within the band.
+        j_start = max(0, i + 1 - limit)
+        j_end = min(len2, i + 1 + limit)
+
+        if j_start == 0:
+            # The edit distance of the first entry in v0 is to delete (i + 1)
+            # characters from str1 to match an empty str2
+            v1[0] = min(i + 1, limit)
+        else:
+            v1[j_start - 1] = limit
+        if j_end < len2:
+            v1[j_end + 1] = limit
+
+        row_min = v1[0] if j_start == 0 else limit
+        for j in range(max(0, j_start - 1), j_end):
             deletion_cost = v0[j + 1] + _DELETION_WEIGHT
             insertion_cost = v1[j] + _INSERTION_WEIGHT
             substitution_cost = (
-                v0[j] if (str1[i] == str2[j]) else (v0[j] + _SUBSTITUTION_WEIGHT)
+                v0[j] if (char1 == str2[j]) else (v0[j] + _SUBSTITUTION_WEIGHT)
             )
 
-            v1[j + 1] = min(deletion_cost, insertion_cost, substitution_cost)
+            cost = min(deletion_cost, insertion_cost, substitution_cost, limit)
+            v1[j + 1] = cost
+            row_min = min(row_min, cost)
+
+        if row_min >= limit:
+            # Distances never decrease from one row to the next
+            return limit
 
         # Move to the next matrix row for the next letter in str1
         v_tmp = v0
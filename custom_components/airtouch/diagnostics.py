@@ -0,0 +1,178 @@
+"""Diagnostics support for the Polyaire AirTouch integration.
+
+The diagnostics include the complete AirTouch model as reported by pyairtouch
+and the integration's instrumentation, so that misbehaving installations can be
+profiled without enabling debug logging.
+"""
+
+import asyncio
+import collections
+import datetime
+import gc
+import logging
+import sys
+import types
+from collections.abc import Iterable
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+import pyairtouch
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .models import AirTouchData
+
+_TO_REDACT = {CONF_HOST, "host", "serial"}
+
+# Objects that are shared with the rest of Home Assistant, or that reference
+# large parts of it. These are not counted as part of the integration's memory.
+_SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.FrameType,
+    types.CoroutineType,
+    types.CodeType,
+    asyncio.AbstractEventLoop,
+    asyncio.Future,
+    logging.Logger,
+    HomeAssistant,
+    ConfigEntry,
+    EntityPlatform,
+    dr.DeviceEntry,
+    er.RegistryEntry,
+    Enum,
+)
+
+# Number of object types to include in the memory breakdown.
+_MEMORY_TOP_TYPES = 10
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data: AirTouchData = hass.data[DOMAIN][entry.entry_id]
+    airtouch = data.airtouch
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, _TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "airtouch": async_redact_data(_airtouch_diagnostics(airtouch), _TO_REDACT),
+        "instrumentation": data.instrumentation.as_dict(),
+        "listeners": data.dispatcher.listener_counts(),
+        "schedules": data.schedules.as_dict(),
+        "journal": data.journal.as_dict(),
+        "thermal_model": data.thermal_model.as_dict(),
+        "runtime": data.runtime.as_dict(),
+        "statistics": data.zone_statistics.as_dict() if data.zone_statistics else None,
+        "memory": _memory_diagnostics(data),
+    }
+
+
+def _airtouch_diagnostics(airtouch: pyairtouch.AirTouch) -> dict[str, Any]:
+    return {
+        "airtouch_id": airtouch.airtouch_id,
+        "serial": airtouch.serial,
+        "name": airtouch.name,
+        "host": airtouch.host,
+        "model": airtouch.model.name,
+        "initialised": airtouch.initialised,
+        "update_available": airtouch.update_available,
+        "console_versions": list(airtouch.console_versions),
+        "air_conditioners": [_ac_diagnostics(ac) for ac in airtouch.air_conditioners],
+    }
+
+
+def _ac_diagnostics(ac: pyairtouch.AirConditioner) -> dict[str, Any]:
+    error_info = ac.error_info
+    return {
+        "ac_id": ac.ac_id,
+        "name": ac.name,
+        "supported_power_controls": _names(ac.supported_power_controls),
+        "supported_modes": _names(ac.supported_modes),
+        "supported_fan_speeds": _names(ac.supported_fan_speeds),
+        "power_state": _name(ac.power_state),
+        "selected_mode": _name(ac.selected_mode),
+        "active_mode": _name(ac.active_mode),
+        "selected_fan_speed": _name(ac.selected_fan_speed),
+        "active_fan_speed": _name(ac.active_fan_speed),
+        "current_temperature": ac.current_temperature,
+        "target_temperature": ac.target_temperature,
+        "target_temperature_resolution": ac.target_temperature_resolution,
+        "min_target_temperature": ac.min_target_temperature,
+        "max_target_temperature": ac.max_target_temperature,
+        "spill_state": ac.spill_state.name,
+        "quick_timers": {
+            timer_type.name: _isoformat(ac.next_quick_timer(timer_type))
+            for timer_type in pyairtouch.AcTimerType
+        },
+        "error_info": {"code": error_info.code, "description": error_info.description}
+        if error_info
+        else None,
+        "zones": [_zone_diagnostics(zone) for zone in ac.zones],
+    }
+
+
+def _zone_diagnostics(zone: pyairtouch.Zone) -> dict[str, Any]:
+    return {
+        "zone_id": zone.zone_id,
+        "name": zone.name,
+        "supported_power_states": _names(zone.supported_power_states),
+        "power_state": _name(zone.power_state),
+        "control_method": zone.control_method.name,
+        "has_temp_sensor": zone.has_temp_sensor,
+        "sensor_battery_status": zone.sensor_battery_status.name,
+        "current_temperature": zone.current_temperature,
+        "target_temperature": zone.target_temperature,
+        "target_temperature_resolution": zone.target_temperature_resolution,
+        "current_damper_percentage": zone.current_damper_percentage,
+        "spill_active": zone.spill_active,
+    }
+
+
+def _name(value: Enum | None) -> str | None:
+    return value.name if value is not None else None
+
+
+def _names(values: Iterable[Enum]) -> list[str]:
+    return [value.name for value in values]
+
+
+def _isoformat(value: datetime.time | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _memory_diagnostics(data: "AirTouchData") -> dict[str, Any]:
+    """Approximate the memory used by a config entry.
+
+    Walks everything referenced from the runtime data, including pyairtouch and
+    the entities via their listeners. Objects shared with the rest of Home
+    Assistant are not followed, so the result is an estimate of the memory that
+    would be freed if the config entry were unloaded.
+    """
+    bytes_by_type: collections.Counter[str] = collections.Counter()
+    seen: set[int] = set()
+    pending: list[object] = [data]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        bytes_by_type[type(obj).__qualname__] += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+
+    return {
+        "total_bytes": bytes_by_type.total(),
+        "objects": len(seen),
+        "bytes_by_type": dict(bytes_by_type.most_common(_MEMORY_TOP_TYPES)),
+    }
@@ -0,0 +1,408 @@
+"""Discovery support for the AirTouch integration.
+
+Discovery results are cached in persistent storage so that subsequent start-ups
+can connect directly to the last known address of an AirTouch console without
+waiting for a discovery broadcast. The console doesn't report its ID over the
+connection, so the ACs and zones that it reports are compared with those cached
+for the AirTouch instead. If they differ, for example because another console
+now has the address, the connection is dropped and discovery is used.
+
+When discovery is required, a single search is shared by all config entries that
+are waiting for results.
+
+The connection initialised by the config flow is handed over to the set-up of
+the new config entry, so that adding an AirTouch needs only one handshake.
+
+Discovery binds to an explicit local port, so searches of multiple hosts can't
+run concurrently. Instead, the hosts are first probed concurrently for an open
+AirTouch TCP port and only the hosts that respond are searched.
+"""
+
+import asyncio
+import logging
+from typing import NotRequired, TypedDict, cast
+
+import pyairtouch
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+_DISCOVERY_KEY = "discovery"
+
+_STORAGE_VERSION = 1
+_STORAGE_KEY = f"{DOMAIN}.discovery"
+
+# Discovery results rarely change, so there's no need to write them
+# immediately.
+_SAVE_DELAY = 10
+
+# Discovery results are re-used for a short window after a search completes so
+# that config entries that start at almost the same time share a single search.
+_RESULT_WINDOW = 2.0
+
+# Seconds that a connection handed over by the config flow is kept for the new
+# config entry's set-up before it is shut down.
+_HANDOVER_TIMEOUT = 60.0
+
+# Limits for probing hosts for an AirTouch console.
+_PROBE_TIMEOUT = 2.0
+_PROBE_CONCURRENCY = 32
+
+# The TCP port numbers used by each AirTouch model.
+_MODEL_PORTS = {
+    pyairtouch.AirTouchModel.AIRTOUCH_4: 9004,
+    pyairtouch.AirTouchModel.AIRTOUCH_5: 9005,
+}
+
+
+class CachedZone(TypedDict):
+    """A zone of a previously connected AirTouch."""
+
+    zone_id: int
+    name: str
+
+
+class CachedAc(TypedDict):
+    """An AC of a previously connected AirTouch."""
+
+    ac_id: int
+    name: str
+    zones: list[CachedZone]
+
+
+class CachedAirTouch(TypedDict):
+    """Connection details for a previously discovered AirTouch."""
+
+    host: str
+    model: str
+    name: str
+    serial: str
+    air_conditioners: NotRequired[list[CachedAc]]
+    """The ACs and zones reported by the AirTouch, used to identify it."""
+
+
+class DiscoveryCache:
+    """Persistent cache of discovered AirTouch consoles.
+
+    Cached details are keyed by AirTouch ID.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store = Store[dict[str, CachedAirTouch]](
+            hass, _STORAGE_VERSION, _STORAGE_KEY
+        )
+        self._airtouches: dict[str, CachedAirTouch] = {}
+
+    async def async_load(self) -> None:
+        """Load the cache from persistent storage."""
+        self._airtouches = await self._store.async_load() or {}
+
+    def connect(self, airtouch_id: str) -> pyairtouch.AirTouch | None:
+        """Construct an AirTouch API instance using the cached details.
+
+        The returned instance has not been initialised.
+
+        Returns:
+            The AirTouch instance, or None if the AirTouch is not in the cache.
+        """
+        cached = self._airtouches.get(airtouch_id)
+        if not cached:
+            return None
+
+        try:
+            model = pyairtouch.AirTouchModel(cached["model"])
+        except ValueError:
+            _LOGGER.debug("Ignoring cached AirTouch with unknown model: %s", cached)
+            return None
+
+        return pyairtouch.connect(
+            model=model,
+            host=cached["host"],
+            port=_MODEL_PORTS[model],
+            airtouch_id=airtouch_id,
+            name=cached["name"],
+            serial=cached["serial"],
+        )
+
+    def matches(self, airtouch: pyairtouch.AirTouch) -> bool:
+        """Check whether an initialised AirTouch is the one that was cached.
+
+        Returns:
+            True if the AirTouch reports the same ACs and zones as when it was
+            cached.
+        """
+        cached = self._airtouches.get(airtouch.airtouch_id)
+        return cached is not None and cached.get(
+            "air_conditioners"
+        ) == _air_conditioners(airtouch)
+
+    @callback
+    def async_update(self, airtouch: pyairtouch.AirTouch) -> None:
+        """Save the connection details of a successfully connected AirTouch."""
+        cached = CachedAirTouch(
+            host=airtouch.host,
+            model=airtouch.model.value,
+            name=airtouch.name,
+            serial=airtouch.serial,
+            air_conditioners=_air_conditioners(airtouch),
+        )
+        if self._airtouches.get(airtouch.airtouch_id) != cached:
+            self._airtouches[airtouch.airtouch_id] = cached
+            self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+
+    @callback
+    def async_remove(self, airtouch_id: str) -> None:
+        """Remove an AirTouch from the cache."""
+        if self._airtouches.pop(airtouch_id, None):
+            self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, CachedAirTouch]:
+        return self._airtouches
+
+
+class DiscoveryService:
+    """Shares AirTouch discovery between config entries.
+
+    Discovery binds to an explicit local port, so only one search can run at a
+    time. Rather than each config entry running its own search in turn, config
+    entries wait on the same search and pick their AirTouch from the shared
+    results.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+
+        self._cache = DiscoveryCache(hass)
+        self._cache_loaded = False
+        self._cache_lock = asyncio.Lock()
+
+        self._search_lock = asyncio.Lock()
+        # Searches are keyed by the remote host, with None for broadcast.
+        self._searches: dict[str | None, asyncio.Task[list[pyairtouch.AirTouch]]] = {}
+
+        # Initialised connections from the config flow keyed by AirTouch ID.
+        self._handovers: dict[str, tuple[pyairtouch.AirTouch, asyncio.TimerHandle]] = {}
+
+    @callback
+    def async_hand_over(self, airtouch: pyairtouch.AirTouch) -> None:
+        """Keep an initialised AirTouch for the set-up of its new config entry.
+
+        The AirTouch is shut down if it isn't taken within _HANDOVER_TIMEOUT.
+        """
+        self._expire_handover(airtouch.airtouch_id)
+        expiry = self._hass.loop.call_later(
+            _HANDOVER_TIMEOUT, self._expire_handover, airtouch.airtouch_id
+        )
+        self._handovers[airtouch.airtouch_id] = (airtouch, expiry)
+
+    @callback
+    def async_take_handover(self, airtouch_id: str) -> pyairtouch.AirTouch | None:
+        """Take the AirTouch handed over by the config flow.
+
+        Returns:
+            The initialised AirTouch, or None if there isn't one.
+        """
+        handover = self._handovers.pop(airtouch_id, None)
+        if not handover:
+            return None
+        airtouch, expiry = handover
+        expiry.cancel()
+        return airtouch
+
+    async def async_connect_cached(
+        self, airtouch_id: str
+    ) -> pyairtouch.AirTouch | None:
+        """Connect to an AirTouch using the cached discovery details.
+
+        Returns:
+            The initialised AirTouch, or None if there are no cached details,
+            the AirTouch could not be initialised at the cached address, or a
+            different AirTouch answered at the cached address.
+        """
+        cache = await self._async_get_cache()
+        airtouch = cache.connect(airtouch_id)
+        if not airtouch:
+            return None
+
+        if not await airtouch.init():
+            # The AirTouch console may have a new IP address.
+            _LOGGER.debug(
+                "Unable to connect to AirTouch at cached address %s", airtouch.host
+            )
+            await airtouch.shutdown()
+            return None
+
+        if not cache.matches(airtouch):
+            _LOGGER.debug(
+                "AirTouch at cached address %s doesn't match %s",
+                airtouch.host,
+                airtouch_id,
+            )
+            await airtouch.shutdown()
+            return None
+
+        return airtouch
+
+    async def async_discover(
+        self, airtouch_id: str | None, remote_host: str | None = None
+    ) -> pyairtouch.AirTouch | None:
+        """Discover an AirTouch on the network.
+
+        Joins an in-progress search if there is one, otherwise starts a new
+        search.
+
+        Args:
+            airtouch_id: The ID of the AirTouch to discover.
+            remote_host: An optional known AirTouch host for unicast discovery.
+
+        Returns:
+            The AirTouch instance, which has not been initialised, or None if
+            the AirTouch was not found.
+        """
+        discovery_results = await self.async_search(remote_host)
+        return next(
+            (at for at in discovery_results if at.airtouch_id == airtouch_id), None
+        )
+
+    async def async_search(
+        self, remote_host: str | None = None
+    ) -> list[pyairtouch.AirTouch]:
+        """Search for all AirTouch consoles on the network or at a host.
+
+        Joins an in-progress search of the same host if there is one.
+
+        Returns:
+            The AirTouch instances, which have not been initialised.
+        """
+        search = self._searches.get(remote_host)
+        if not search:
+            search = self._hass.async_create_task(self._async_search(remote_host))
+            self._searches[remote_host] = search
+
+        # Shield the search so that a cancelled caller doesn't cancel the
+        # search for any others.
+        return await asyncio.shield(search)
+
+    async def async_search_hosts(self, hosts: list[str]) -> list[pyairtouch.AirTouch]:
+        """Search for AirTouch consoles at any of a list of hosts.
+
+        Returns:
+            The AirTouch instances, which have not been initialised.
+        """
+        semaphore = asyncio.Semaphore(_PROBE_CONCURRENCY)
+
+        async def probe(host: str) -> str | None:
+            async with semaphore:
+                return await _async_probe(host)
+
+        # Probes resolve host names, so the responding addresses can be
+        # searched directly.
+        addresses = [
+            address
+            for address in await asyncio.gather(*(probe(host) for host in hosts))
+            if address
+        ]
+        _LOGGER.debug(
+            "%d of %d hosts responded to probes: %s",
+            len(addresses),
+            len(hosts),
+            addresses,
+        )
+
+        airtouches: dict[str, pyairtouch.AirTouch] = {}
+        for address in dict.fromkeys(addresses):
+            for airtouch in await self.async_search(address):
+                airtouches.setdefault(airtouch.airtouch_id, airtouch)
+        return list(airtouches.values())
+
+    async def async_connected(self, airtouch: pyairtouch.AirTouch) -> None:
+        """Record the details of a successfully connected AirTouch."""
+        cache = await self._async_get_cache()
+        cache.async_update(airtouch)
+
+    async def async_remove(self, airtouch_id: str) -> None:
+        """Forget the details of an AirTouch."""
+        cache = await self._async_get_cache()
+        cache.async_remove(airtouch_id)
+
+    @callback
+    def _expire_handover(self, airtouch_id: str) -> None:
+        handover = self._handovers.pop(airtouch_id, None)
+        if handover:
+            airtouch, expiry = handover
+            expiry.cancel()
+            _LOGGER.debug("Shutting down unused AirTouch connection %s", airtouch_id)
+            self._hass.async_create_task(airtouch.shutdown())
+
+    async def _async_get_cache(self) -> DiscoveryCache:
+        async with self._cache_lock:
+            if not self._cache_loaded:
+                await self._cache.async_load()
+                self._cache_loaded = True
+        return self._cache
+
+    async def _async_search(self, remote_host: str | None) -> list[pyairtouch.AirTouch]:
+        try:
+            async with self._search_lock:
+                return await pyairtouch.discover(remote_host=remote_host)
+        finally:
+            self._hass.loop.call_later(
+                _RESULT_WINDOW, self._searches.pop, remote_host, None
+            )
+
+
+def _air_conditioners(airtouch: pyairtouch.AirTouch) -> list[CachedAc]:
+    return [
+        CachedAc(
+            ac_id=airtouch_ac.ac_id,
+            name=airtouch_ac.name,
+            zones=[
+                CachedZone(zone_id=airtouch_zone.zone_id, name=airtouch_zone.name)
+                for airtouch_zone in airtouch_ac.zones
+            ],
+        )
+        for airtouch_ac in airtouch.air_conditioners
+    ]
+
+
+async def _async_probe(host: str) -> str | None:
+    """Check whether a host accepts connections on any AirTouch port.
+
+    Returns:
+        The IP address of the host, or None if it didn't accept a connection.
+    """
+    for address in await asyncio.gather(
+        *(_async_probe_port(host, port) for port in _MODEL_PORTS.values())
+    ):
+        if address:
+            return address
+    return None
+
+
+async def async_probe_airtouch(airtouch: pyairtouch.AirTouch) -> bool:
+    """Check whether an AirTouch console accepts new connections."""
+    return bool(await _async_probe_port(airtouch.host, _MODEL_PORTS[airtouch.model]))
+
+
+async def _async_probe_port(host: str, port: int) -> str | None:
+    try:
+        async with asyncio.timeout(_PROBE_TIMEOUT):
+            _, writer = await asyncio.open_connection(host, port)
+    except (OSError, TimeoutError):
+        return None
+    address: str = writer.get_extra_info("peername")[0]
+    writer.close()
+    return address
+
+
+def get_discovery_service(hass: HomeAssistant) -> DiscoveryService:
+    """Get the discovery service that is shared by all config entries."""
+    # Initialise the saved domain data if it is not already initialised.
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if _DISCOVERY_KEY not in domain_data:
+        domain_data[_DISCOVERY_KEY] = DiscoveryService(hass)
+    return cast("DiscoveryService", domain_data[_DISCOVERY_KEY])
@@ -0,0 +1,234 @@
+"""Coalesced dispatch of AirTouch updates to entities.
+
+pyairtouch notifies subscribers separately for the console, each AC and each
+zone. Rather than every entity holding its own pyairtouch subscriptions, a
+single dispatcher per config entry owns the subscriptions and collects every
+entity affected by a status message so that their state is written in a single
+flush.
+"""
+
+import logging
+import time
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import pyairtouch
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from .instrumentation import Instrumentation
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Delay before pending updates are flushed to entities.
+# pyairtouch yields to the event loop between the notifications for each AC and
+# zone within a single status message, so a short delay is needed to gather all
+# of the updates from one message into the same flush.
+_FLUSH_DELAY = 0.01
+
+UpdateListener = Callable[[], None]
+"""A listener that is called when the AirTouch state it depends on changes."""
+
+ZoneObserver = Callable[[int], None]
+"""An observer that is called with the ID of a zone as soon as it is updated."""
+
+
+class UpdateDispatcher:
+    """Dispatches AirTouch updates to entities for a single config entry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        airtouch: pyairtouch.AirTouch,
+        instrumentation: "Instrumentation",
+    ) -> None:
+        self._hass = hass
+        self._airtouch = airtouch
+        self._instrumentation = instrumentation
+
+        # Zone IDs are unique across all ACs within an AirTouch system.
+        self._ac_zone_ids: dict[int, list[int]] = {
+            ac.ac_id: [zone.zone_id for zone in ac.zones]
+            for ac in airtouch.air_conditioners
+        }
+
+        self._console_listeners: set[UpdateListener] = set()
+        self._ac_listeners: dict[int, set[UpdateListener]] = {}
+        self._zone_listeners: dict[int, set[UpdateListener]] = {}
+        self._zone_observers: dict[int, set[ZoneObserver]] = {}
+
+        # A dict is used as an insertion ordered set so that listeners are
+        # flushed in the order they were first updated.
+        self._pending: dict[UpdateListener, None] = {}
+        self._pending_since = 0.0
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def start(self) -> None:
+        """Subscribe to updates from the AirTouch."""
+        self._airtouch.subscribe(self._async_on_airtouch_update)
+        for airtouch_ac in self._airtouch.air_conditioners:
+            airtouch_ac.subscribe_ac_state(self._async_on_ac_update)
+            for airtouch_zone in airtouch_ac.zones:
+                airtouch_zone.subscribe(self._async_on_zone_update)
+
+    def stop(self) -> None:
+        """Unsubscribe from AirTouch updates and discard any pending updates."""
+        self._airtouch.unsubscribe(self._async_on_airtouch_update)
+        for airtouch_ac in self._airtouch.air_conditioners:
+            airtouch_ac.unsubscribe_ac_state(self._async_on_ac_update)
+            for airtouch_zone in airtouch_ac.zones:
+                airtouch_zone.unsubscribe(self._async_on_zone_update)
+
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending.clear()
+
+    @callback
+    def async_add_console_listener(self, listener: UpdateListener) -> CALLBACK_TYPE:
+        """Listen for updates to the AirTouch console.
+
+        Returns:
+            A callback to remove the listener.
+        """
+        return _add_listener([self._console_listeners], listener)
+
+    @callback
+    def async_add_ac_listener(
+        self,
+        ac_id: int,
+        listener: UpdateListener,
+        *,
+        include_zones: bool = False,
+    ) -> CALLBACK_TYPE:
+        """Listen for updates to an AC.
+
+        Args:
+            ac_id: The AC to listen to.
+            listener: Called after the AC has been updated.
+            include_zones: If True the listener will also be called when any of
+                the zones associated with the AC are updated.
+
+        Returns:
+            A callback to remove the listener.
+        """
+        listener_sets = [self._ac_listeners.setdefault(ac_id, set())]
+        if include_zones:
+            listener_sets.extend(
+                self._zone_listeners.setdefault(zone_id, set())
+                for zone_id in self._ac_zone_ids.get(ac_id, [])
+            )
+        return _add_listener(listener_sets, listener)
+
+    @callback
+    def async_add_zone_listener(
+        self, zone_id: int, listener: UpdateListener
+    ) -> CALLBACK_TYPE:
+        """Listen for updates to a zone.
+
+        Returns:
+            A callback to remove the listener.
+        """
+        return _add_listener(
+            [self._zone_listeners.setdefault(zone_id, set())], listener
+        )
+
+    @callback
+    def async_add_zone_observer(
+        self, ac_id: int, observer: ZoneObserver
+    ) -> CALLBACK_TYPE:
+        """Observe updates to the zones of an AC.
+
+        Unlike listeners, observers are called immediately for every zone
+        update, before any listeners are flushed. This allows values derived
+        from multiple zones to be maintained incrementally and be up to date
+        by the time listeners are called.
+
+        Returns:
+            A callback to remove the observer.
+        """
+        return _add_listener(
+            [
+                self._zone_observers.setdefault(zone_id, set())
+                for zone_id in self._ac_zone_ids.get(ac_id, [])
+            ],
+            observer,
+        )
+
+    def listener_counts(self) -> dict[str, Any]:
+        """The number of listeners and observers for each AirTouch object."""
+        return {
+            "console": len(self._console_listeners),
+            "ac": {
+                ac_id: len(listeners) for ac_id, listeners in self._ac_listeners.items()
+            },
+            "zone": {
+                zone_id: {
+                    "listeners": len(self._zone_listeners.get(zone_id, ())),
+                    "observers": len(self._zone_observers.get(zone_id, ())),
+                }
+                for zone_ids in self._ac_zone_ids.values()
+                for zone_id in zone_ids
+            },
+        }
+
+    async def _async_on_airtouch_update(self, _: str) -> None:
+        self._instrumentation.status_updates["console"] += 1
+        self._mark_pending(self._console_listeners)
+
+    async def _async_on_ac_update(self, ac_id: int) -> None:
+        self._instrumentation.status_updates["ac"] += 1
+        self._instrumentation.status_received(("ac", ac_id), time.monotonic())
+        self._mark_pending(self._ac_listeners.get(ac_id, ()))
+
+    async def _async_on_zone_update(self, zone_id: int) -> None:
+        self._instrumentation.status_updates["zone"] += 1
+        self._instrumentation.status_received(("zone", zone_id), time.monotonic())
+        for observer in self._zone_observers.get(zone_id, ()):
+            try:
+                observer(zone_id)
+            except Exception:
+                _LOGGER.exception("Exception from zone observer %s", observer)
+        self._mark_pending(self._zone_listeners.get(zone_id, ()))
+
+    def _mark_pending(self, listeners: Iterable[UpdateListener]) -> None:
+        self._pending.update(dict.fromkeys(listeners))
+        if not self._flush_handle:
+            # The first update of a status message. A flush is scheduled even
+            # if nothing is listening so that the remaining updates from the
+            # same message are attributed to it.
+            self._pending_since = time.monotonic()
+            self._instrumentation.message_received(self._pending_since)
+            self._flush_handle = self._hass.loop.call_later(_FLUSH_DELAY, self._flush)
+
+    @callback
+    def _flush(self) -> None:
+        self._flush_handle = None
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = {}
+        for listener in pending:
+            try:
+                listener()
+            except Exception:
+                _LOGGER.exception("Exception from update listener %s", listener)
+        self._instrumentation.dispatch_latency.record(
+            time.monotonic() - self._pending_since
+        )
+
+
+def _add_listener(listener_sets: list[set[_T]], listener: _T) -> CALLBACK_TYPE:
+    for listener_set in listener_sets:
+        listener_set.add(listener)
+
+    @callback
+    def remove_listener() -> None:
+        for listener_set in listener_sets:
+            listener_set.discard(listener)
+
+    return remove_listener
@@ -1,19 +1,361 @@
 """Provides mix-ins for common entity logic."""
 
-from typing import cast
+import abc
+import logging
+import math
+from collections.abc import Awaitable, Mapping
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
 
 import pyairtouch
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import Entity
 
 from . import devices
+from .const import DOMAIN
+from .dispatcher import UpdateDispatcher
 
+if TYPE_CHECKING:
+    import asyncio
 
-class AirTouchConsoleEntity(Entity):
+    from .instrumentation import EntityCounters, Instrumentation
+    from .journal import CommandJournal
+    from .models import (
+        AirTouchData,
+        OptimisticUpdates,
+        RateLimitedSensor,
+        SensorRateLimit,
+    )
+    from .schedules import ScheduleEngine
+    from .supervisor import ConnectionSupervisor
+    from .thermal import ThermalModel
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds after which a change within a sensor's deadband is written.
+_DEADBAND_FLUSH_INTERVAL = 300
+
+StateSnapshot = tuple[object, ...]
+"""The AirTouch values that an entity's state is rendered from."""
+
+
+class ChangeDetectingEntity(Entity):
+    """A mix-in class that skips state writes when nothing has changed.
+
+    AirTouch status messages cover an entire AC or zone, so most updates don't
+    change the values that a particular entity exposes. Entities provide a
+    snapshot of the values they read and the state is only written when the
+    snapshot changes.
+
+    The AirTouch mix-ins are slotted because there are several entities for
+    every zone. Only one branch of an entity's bases can add slots, so the
+    optional mix-ins keep their state in the instance dictionary.
+    """
+
+    __slots__ = (
+        "_config_entry_id",
+        "_last_state_snapshot",
+        "_supervisor",
+        "_update_counters",
+    )
+
+    def __init__(self, config_entry_id: str) -> None:
+        super().__init__()
+        self._config_entry_id = config_entry_id
+        self._last_state_snapshot: StateSnapshot | None = None
+        self._update_counters: EntityCounters | None = None
+        self._supervisor: ConnectionSupervisor | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._update_counters = get_instrumentation(
+            self.hass, self._config_entry_id
+        ).entity_counters(self.entity_id)
+        self._supervisor = get_supervisor(self.hass, self._config_entry_id)
+        self.async_on_remove(
+            self._supervisor.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def available(self) -> bool:
+        return self._supervisor is None or self._supervisor.available
+
+    def _state_snapshot(self) -> StateSnapshot | None:
+        """A snapshot of the AirTouch values used to render the entity state.
+
+        Returns:
+            The snapshot, or None if the state should always be written.
+        """
+        return None
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        if self._update_counters:
+            self._update_counters.updates += 1
+        snapshot = self._state_snapshot()
+        if snapshot is not None and snapshot == self._last_state_snapshot:
+            return
+        self._async_write_snapshot(snapshot)
+
+    @callback
+    def _async_write_snapshot(self, snapshot: StateSnapshot | None) -> None:
+        """Write the entity state for a changed snapshot."""
+        self._last_state_snapshot = snapshot
+        if self._update_counters:
+            self._update_counters.state_writes += 1
+        self.async_write_ha_state()
+
+
+class RateLimitedEntity(ChangeDetectingEntity, abc.ABC):
+    """A mix-in class that limits how often a numeric sensor's state is written.
+
+    Sensors such as temperatures fluctuate by small amounts, which causes a
+    recorder row for every change. A change is written immediately if the
+    minimum interval has passed since the last write. Changes within the
+    deadband of the last written value use an interval of at least
+    _DEADBAND_FLUSH_INTERVAL, so small fluctuations are written at most that
+    often. Changes that are held back are written at the trailing edge of the
+    interval with the latest value, so the final value is never lost.
+
+    Must be combined with one of the AirTouch entity mix-ins.
+    """
+
+    _rate_limited_sensor: "RateLimitedSensor"
+    _written_value: float | None = None
+    _last_write_time = -math.inf
+    _trailing_flush: "asyncio.TimerHandle | None" = None
+    _trailing_flush_time = math.inf
+
+    @abc.abstractmethod
+    def _rate_limited_value(self) -> float | None:
+        """The numeric value that the rate limits apply to."""
+
+    async def async_will_remove_from_hass(self) -> None:
+        await super().async_will_remove_from_hass()
+        self._cancel_trailing_flush()
+
+    @callback
+    def _async_write_snapshot(self, snapshot: StateSnapshot | None) -> None:
+        rate_limit = get_sensor_rate_limit(
+            self.hass, self._config_entry_id, self._rate_limited_sensor
+        )
+        value = self._rate_limited_value()
+        interval = rate_limit.min_interval
+        if (
+            value is not None
+            and self._written_value is not None
+            and abs(value - self._written_value) < rate_limit.deadband
+        ):
+            interval = max(interval, _DEADBAND_FLUSH_INTERVAL)
+
+        flush_time = self._last_write_time + interval
+        if flush_time <= self.hass.loop.time():
+            self._cancel_trailing_flush()
+            self._write_rate_limited(snapshot, value)
+        elif flush_time < self._trailing_flush_time:
+            self._cancel_trailing_flush()
+            self._trailing_flush_time = flush_time
+            self._trailing_flush = self.hass.loop.call_at(
+                flush_time, self._async_trailing_flush
+            )
+
+    @callback
+    def _async_trailing_flush(self) -> None:
+        self._trailing_flush = None
+        self._trailing_flush_time = math.inf
+        # The value may have returned to the last written value in the meantime.
+        snapshot = self._state_snapshot()
+        if snapshot is None or snapshot != self._last_state_snapshot:
+            self._write_rate_limited(snapshot, self._rate_limited_value())
+
+    def _write_rate_limited(
+        self, snapshot: StateSnapshot | None, value: float | None
+    ) -> None:
+        self._written_value = value
+        self._last_write_time = self.hass.loop.time()
+        super()._async_write_snapshot(snapshot)
+
+    def _cancel_trailing_flush(self) -> None:
+        if self._trailing_flush:
+            self._trailing_flush.cancel()
+            self._trailing_flush = None
+            self._trailing_flush_time = math.inf
+
+
+class _ExpectedValue(NamedTuple):
+    source: object
+    attribute: str
+    value: object
+    rollback_handle: "asyncio.TimerHandle | None"
+
+
+class OptimisticEntity(ChangeDetectingEntity):
+    """A mix-in class that shows the expected result of commands immediately.
+
+    The AirTouch console can take a second or more to report the result of a
+    command. Entities read AirTouch values through _current_value() so that the
+    expected value is shown until an update from the AirTouch confirms it. An
+    expected value that isn't confirmed within the configured timeout is rolled
+    back to the value reported by the AirTouch.
+
+    While the connection to the AirTouch is lost, commands are journaled and
+    sent after reconnecting. Entities that send commands therefore remain
+    available, and show the expected values of journaled commands until then.
+
+    Must be combined with one of the AirTouch entity mix-ins.
+    """
+
+    _expected_values: dict[tuple[int, str], _ExpectedValue] | None = None
+    _journal: "CommandJournal | None" = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._journal = get_command_journal(self.hass, self._config_entry_id)
+        if self._supervisor:
+            self.async_on_remove(
+                self._supervisor.async_add_listener(self._async_connection_changed)
+            )
+
+    @property
+    def available(self) -> bool:
+        return super().available or (
+            self._journal is not None and self._journal.journaling
+        )
+
+    def _current_value(self, source: object, attribute: str) -> Any:  # noqa: ANN401
+        """The value of an AirTouch attribute, or its expected value."""
+        if self._expected_values:
+            expected = self._expected_values.get((id(source), attribute))
+            if expected:
+                return expected.value
+        return getattr(source, attribute)
+
+    async def _async_send_optimistic(
+        self,
+        command: Awaitable[None],
+        source: object,
+        expected_values: Mapping[str, object],
+    ) -> None:
+        """Send a command and show its expected result until confirmed.
+
+        Args:
+            command: The command to send.
+            source: The AirTouch object that the command updates.
+            expected_values: The expected values of the source's attributes
+                once the command has been applied.
+        """
+        optimistic_updates = get_optimistic_updates(self.hass, self._config_entry_id)
+        if optimistic_updates.rollback_timeout <= 0:
+            await command
+            return
+
+        if self._expected_values is None:
+            self._expected_values = {}
+
+        keys: list[tuple[int, str]] = []
+        for attribute, value in expected_values.items():
+            if getattr(source, attribute) == value:
+                continue
+            key = (id(source), attribute)
+            self._discard_expected_value(key)
+            self._expected_values[key] = _ExpectedValue(
+                source=source, attribute=attribute, value=value, rollback_handle=None
+            )
+            keys.append(key)
+        if keys:
+            self.async_write_ha_state()
+
+        try:
+            await command
+        except Exception:
+            for key in keys:
+                self._discard_expected_value(key)
+            self.async_write_ha_state()
+            raise
+
+        if self._supervisor and not self._supervisor.available:
+            # The command has been journaled. The rollback timeout starts once
+            # the connection is re-established and the journal is sent.
+            return
+
+        # The rollback timeout starts once the command has been sent.
+        self._schedule_rollbacks(keys, optimistic_updates.rollback_timeout)
+
+    def _schedule_rollbacks(
+        self, keys: list[tuple[int, str]], rollback_timeout: float
+    ) -> None:
+        if not self._expected_values:
+            return
+        for key in keys:
+            expected = self._expected_values.get(key)
+            if expected and not expected.rollback_handle:
+                self._expected_values[key] = expected._replace(
+                    rollback_handle=self.hass.loop.call_later(
+                        rollback_timeout, self._rollback_expected_value, key
+                    )
+                )
+
+    @callback
+    def _async_connection_changed(self) -> None:
+        if self._expected_values and self._supervisor and self._supervisor.available:
+            optimistic_updates = get_optimistic_updates(
+                self.hass, self._config_entry_id
+            )
+            self._schedule_rollbacks(
+                list(self._expected_values), optimistic_updates.rollback_timeout
+            )
+
+    async def async_will_remove_from_hass(self) -> None:
+        await super().async_will_remove_from_hass()
+        if self._expected_values:
+            for key in list(self._expected_values):
+                self._discard_expected_value(key)
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        if self._expected_values:
+            self._reconcile_expected_values()
+        super()._async_write_if_changed()
+
+    def _reconcile_expected_values(self) -> None:
+        if not self._expected_values:
+            return
+        optimistic_updates = get_optimistic_updates(self.hass, self._config_entry_id)
+        for key, expected in list(self._expected_values.items()):
+            if getattr(expected.source, expected.attribute) == expected.value:
+                self._discard_expected_value(key)
+                optimistic_updates.confirmed += 1
+
+    @callback
+    def _rollback_expected_value(self, key: tuple[int, str]) -> None:
+        if not self._expected_values or key not in self._expected_values:
+            return
+        expected = self._expected_values.pop(key)
+        optimistic_updates = get_optimistic_updates(self.hass, self._config_entry_id)
+        optimistic_updates.mismatches += 1
+        _LOGGER.debug(
+            "%s: %s not confirmed (expected %s, AirTouch reported %s)",
+            self,
+            expected.attribute,
+            expected.value,
+            getattr(expected.source, expected.attribute),
+        )
+        self.async_write_ha_state()
+
+    def _discard_expected_value(self, key: tuple[int, str]) -> None:
+        if self._expected_values:
+            expected = self._expected_values.pop(key, None)
+            if expected and expected.rollback_handle:
+                expected.rollback_handle.cancel()
+
+
+class AirTouchConsoleEntity(ChangeDetectingEntity):
     """A mix-in class for common AirTouch console entity logic.
 
     Handles common logic including setting up subsriptions to AirTouch console changes.
     """
 
+    __slots__ = ("_airtouch",)
+
     # All entities have to provide a name
     _attr_has_entity_name = True
 
@@ -26,19 +368,18 @@ class AirTouchConsoleEntity(Entity):
         airtouch: pyairtouch.AirTouch,
         id_suffix: str = "",
     ) -> None:
+        super().__init__(airtouch_device.config_entry_id)
         self._airtouch = airtouch
 
         self._attr_unique_id = airtouch_device.unique_id + id_suffix
         self._attr_device_info = airtouch_device.device_info
 
     async def async_added_to_hass(self) -> None:
-        self._airtouch.subscribe(self._async_on_airtouch_update)
-
-    async def async_will_remove_from_hass(self) -> None:
-        self._airtouch.unsubscribe(self._async_on_airtouch_update)
-
-    async def _async_on_airtouch_update(self, _: str) -> None:
-        self.schedule_update_ha_state()
+        await super().async_added_to_hass()
+        dispatcher = get_dispatcher(self.hass, self._config_entry_id)
+        self.async_on_remove(
+            dispatcher.async_add_console_listener(self._async_write_if_changed)
+        )
 
     def __repr__(self) -> str:
         """Return a basic string representation of the entity."""
@@ -48,12 +389,14 @@ class AirTouchConsoleEntity(Entity):
         return f"<{self.__class__.__name__}: {device_name} ({self._attr_unique_id})>"
 
 
-class AirTouchAcEntity(Entity):
+class AirTouchAcEntity(ChangeDetectingEntity):
     """A mix-in class for common AC entity logic.
 
     Handles common logic including setting up subsriptions to AC state changes.
     """
 
+    __slots__ = ("_airtouch_ac", "_include_zone_subscription")
+
     # All entities have to provide a name
     _attr_has_entity_name = True
 
@@ -68,6 +411,7 @@ class AirTouchAcEntity(Entity):
         id_suffix: str = "",
         include_zone_subscription: bool = False,
     ) -> None:
+        super().__init__(ac_device.config_entry_id)
         self._airtouch_ac = airtouch_ac
         self._include_zone_subscription = include_zone_subscription
 
@@ -75,19 +419,15 @@ class AirTouchAcEntity(Entity):
         self._attr_device_info = ac_device.device_info
 
     async def async_added_to_hass(self) -> None:
-        if self._include_zone_subscription:
-            self._airtouch_ac.subscribe(self._async_on_ac_update)
-        else:
-            self._airtouch_ac.subscribe_ac_state(self._async_on_ac_update)
-
-    async def async_will_remove_from_hass(self) -> None:
-        if self._include_zone_subscription:
-            self._airtouch_ac.unsubscribe(self._async_on_ac_update)
-        else:
-            self._airtouch_ac.unsubscribe_ac_state(self._async_on_ac_update)
-
-    async def _async_on_ac_update(self, _: int) -> None:
-        self.schedule_update_ha_state()
+        await super().async_added_to_hass()
+        dispatcher = get_dispatcher(self.hass, self._config_entry_id)
+        self.async_on_remove(
+            dispatcher.async_add_ac_listener(
+                self._airtouch_ac.ac_id,
+                self._async_write_if_changed,
+                include_zones=self._include_zone_subscription,
+            )
+        )
 
     def __repr__(self) -> str:
         """Return a basic string representation of the entity."""
@@ -97,12 +437,14 @@ class AirTouchAcEntity(Entity):
         return f"<{self.__class__.__name__}: {device_name} ({self._attr_unique_id})>"
 
 
-class AirTouchZoneEntity(Entity):
+class AirTouchZoneEntity(ChangeDetectingEntity):
     """A mix-in class for common zone entity logic.
 
     Handles common logic including setting up subsriptions to zone state changes.
     """
 
+    __slots__ = ("_airtouch_zone",)
+
     # All entities have to provide a name
     _attr_has_entity_name = True
 
@@ -115,19 +457,20 @@ class AirTouchZoneEntity(Entity):
         airtouch_zone: pyairtouch.Zone,
         id_suffix: str = "",
     ) -> None:
+        super().__init__(zone_device.config_entry_id)
         self._airtouch_zone = airtouch_zone
 
         self._attr_unique_id = zone_device.unique_id + id_suffix
         self._attr_device_info = zone_device.device_info
 
     async def async_added_to_hass(self) -> None:
-        self._airtouch_zone.subscribe(self._async_on_zone_update)
-
-    async def async_will_remove_from_hass(self) -> None:
-        self._airtouch_zone.unsubscribe(self._async_on_zone_update)
-
-    async def _async_on_zone_update(self, _: int) -> None:
-        self.schedule_update_ha_state()
+        await super().async_added_to_hass()
+        dispatcher = get_dispatcher(self.hass, self._config_entry_id)
+        self.async_on_remove(
+            dispatcher.async_add_zone_listener(
+                self._airtouch_zone.zone_id, self._async_write_if_changed
+            )
+        )
 
     def __repr__(self) -> str:
         """Return a basic string representation of the entity."""
@@ -135,3 +478,55 @@ class AirTouchZoneEntity(Entity):
         if self._attr_device_info:
             device_name = cast("str", self._attr_device_info.get("name", device_name))
         return f"<{self.__class__.__name__}: {device_name} ({self._attr_unique_id})>"
+
+
+def get_dispatcher(hass: HomeAssistant, config_entry_id: str) -> UpdateDispatcher:
+    """Get the update dispatcher for a config entry."""
+    data: AirTouchData = hass.data[DOMAIN][config_entry_id]
+    return data.dispatcher
+
+
+def get_optimistic_updates(
+    hass: HomeAssistant, config_entry_id: str
+) -> "OptimisticUpdates":
+    """Get the optimistic state settings and statistics for a config entry."""
+    data: AirTouchData = hass.data[DOMAIN][config_entry_id]
+    return data.optimistic_updates
+
+
+def get_sensor_rate_limit(
+    hass: HomeAssistant, config_entry_id: str, rate_limited_sensor: "RateLimitedSensor"
+) -> "SensorRateLimit":
+    """Get the rate limiting settings for a kind of sensor in a config entry."""
+    data: AirTouchData = hass.data[DOMAIN][config_entry_id]
+    return data.sensor_rate_limits[rate_limited_sensor]
+
+
+def get_instrumentation(hass: HomeAssistant, config_entry_id: str) -> "Instrumentation":
+    """Get the instrumentation for a config entry."""
+    data: AirTouchData = hass.data[DOMAIN][config_entry_id]
+    return data.instrumentation
+
+
+def get_command_journal(hass: HomeAssistant, config_entry_id: str) -> "CommandJournal":
+    """Get the journal of commands waiting to be sent for a config entry."""
+    data: AirTouchData = hass.data[DOMAIN][config_entry_id]
+    return data.journal
+
+
+def get_supervisor(hass: HomeAssistant, config_entry_id: str) -> "ConnectionSupervisor":
+    """Get the connection supervisor for a config entry."""
+    data: AirTouchData = hass.data[DOMAIN][config_entry_id]
+    return data.supervisor
+
+
+def get_schedule_engine(hass: HomeAssistant, config_entry_id: str) -> "ScheduleEngine":
+    """Get the schedule engine for a config entry."""
+    data: AirTouchData = hass.data[DOMAIN][config_entry_id]
+    return data.schedules
+
+
+def get_thermal_model(hass: HomeAssistant, config_entry_id: str) -> "ThermalModel":
+    """Get the learned zone heating and cooling rates for a config entry."""
+    data: AirTouchData = hass.data[DOMAIN][config_entry_id]
+    return data.thermal_model
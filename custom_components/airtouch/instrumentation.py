@@ -0,0 +1,194 @@
+"""Instrumentation of the integration's hot paths.
+
+Counters and latency histograms are kept for updates received from the AirTouch,
+entity state writes, outbound commands and config entry set-up. Recording a
+value is only a few integer operations, so instrumentation is always enabled.
+
+The latencies are chosen to separate the likely causes of a slow system:
+- Dispatch latency: from an update being received from the AirTouch until the
+  affected entity states have been written. Dominated by Home Assistant.
+- Command latency: how long a command takes to be written to the AirTouch
+  connection. Dominated by the network.
+- Command round-trip time: from a command being sent until the AirTouch reports
+  the status of the AC or zone it targeted. Dominated by the console.
+"""
+
+import bisect
+import collections
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Literal
+
+# Upper bounds of the latency histogram buckets in milliseconds.
+_LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# pyairtouch only reports a status update when something has changed, so a
+# command that doesn't change anything is never confirmed. Unconfirmed commands
+# older than this are not timed.
+_ROUND_TRIP_TIMEOUT = 10.0
+
+# Number of recent status message inter-arrival times to keep.
+_RECENT_INTERVALS = 100
+
+CommandTarget = tuple[Literal["ac", "zone"], int]
+"""The AC or zone that a command was sent to."""
+
+
+class LatencyHistogram:
+    """A histogram of latencies with fixed bucket boundaries."""
+
+    def __init__(self) -> None:
+        # The final bucket holds values greater than the largest bound.
+        self._bucket_counts = [0] * (len(_LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record a single latency."""
+        milliseconds = seconds * 1000
+        self._bucket_counts[bisect.bisect_left(_LATENCY_BUCKETS_MS, milliseconds)] += 1
+        self.count += 1
+        self.total_ms += milliseconds
+        self.max_ms = max(self.max_ms, milliseconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """An approximate percentile in milliseconds.
+
+        The percentile is reported as the upper bound of the bucket it falls
+        in, or the maximum recorded latency if that is lower.
+
+        Returns:
+            The percentile, or None if no latencies have been recorded.
+        """
+        if not self.count:
+            return None
+        threshold = fraction * self.count
+        cumulative = 0
+        for bound, bucket_count in zip(
+            _LATENCY_BUCKETS_MS, self._bucket_counts, strict=False
+        ):
+            cumulative += bucket_count
+            if cumulative >= threshold:
+                return min(float(bound), self.max_ms)
+        return self.max_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        """A summary of the histogram for diagnostics."""
+        bucket_labels = [f"<={bound}ms" for bound in _LATENCY_BUCKETS_MS]
+        bucket_labels.append(f">{_LATENCY_BUCKETS_MS[-1]}ms")
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip(bucket_labels, self._bucket_counts, strict=True)),
+        }
+
+
+@dataclass
+class EntityCounters:
+    """Update counters for a single entity."""
+
+    updates: int = 0
+    """Number of AirTouch updates handled by the entity."""
+
+    state_writes: int = 0
+    """Number of updates that changed the entity's state."""
+
+
+class Instrumentation:
+    """Instrumentation for a single config entry."""
+
+    def __init__(self) -> None:
+        self.status_updates = {"console": 0, "ac": 0, "zone": 0}
+        """Number of updates received from pyairtouch for each kind of object."""
+
+        self.message_intervals: collections.deque[float] = collections.deque(
+            maxlen=_RECENT_INTERVALS
+        )
+        """Recent times between status messages from the AirTouch in seconds."""
+
+        self.dispatch_latency = LatencyHistogram()
+        self.command_latency = LatencyHistogram()
+        self.command_round_trip = LatencyHistogram()
+        self.command_errors = 0
+
+        self.setup_phases: dict[str, float] = {}
+        """Duration of each config entry set-up phase in seconds."""
+
+        self._entity_counters: dict[str, EntityCounters] = {}
+        self._unconfirmed_commands: dict[CommandTarget, float] = {}
+        self._last_message_time: float | None = None
+
+    @property
+    def state_writes(self) -> int:
+        """Total number of entity state writes caused by AirTouch updates."""
+        return sum(c.state_writes for c in self._entity_counters.values())
+
+    def entity_counters(self, entity_id: str) -> EntityCounters:
+        """Get the update counters for an entity."""
+        return self._entity_counters.setdefault(entity_id, EntityCounters())
+
+    @contextmanager
+    def setup_phase(self, name: str) -> Iterator[None]:
+        """Time a phase of the config entry set-up."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.setup_phases[name] = time.monotonic() - start
+
+    def message_received(self, received_time: float) -> None:
+        """Record the arrival of a status message from the AirTouch.
+
+        Args:
+            received_time: The monotonic time of the first update in the message.
+        """
+        if self._last_message_time is not None:
+            self.message_intervals.append(received_time - self._last_message_time)
+        self._last_message_time = received_time
+
+    def command_sent(self, target: CommandTarget, sent_time: float) -> None:
+        """Record that a command has been sent.
+
+        Args:
+            target: The AC or zone that the command was sent to.
+            sent_time: The monotonic time that the command was sent.
+        """
+        # Only the earliest unconfirmed command is timed. The AirTouch reports
+        # status rather than acknowledging individual commands.
+        previous = self._unconfirmed_commands.get(target)
+        if previous is None or sent_time - previous > _ROUND_TRIP_TIMEOUT:
+            self._unconfirmed_commands[target] = sent_time
+
+    def status_received(self, target: CommandTarget, received_time: float) -> None:
+        """Record that the status of an AC or zone has been received."""
+        sent_time = self._unconfirmed_commands.pop(target, None)
+        if sent_time is not None and received_time - sent_time <= _ROUND_TRIP_TIMEOUT:
+            self.command_round_trip.record(received_time - sent_time)
+
+    def as_dict(self) -> dict[str, Any]:
+        """A summary of all instrumentation for diagnostics."""
+        return {
+            "status_updates": dict(self.status_updates),
+            "recent_message_intervals_ms": [
+                round(interval * 1000, 3) for interval in self.message_intervals
+            ],
+            "state_writes": self.state_writes,
+            "dispatch_latency": self.dispatch_latency.as_dict(),
+            "command_latency": self.command_latency.as_dict(),
+            "command_round_trip": self.command_round_trip.as_dict(),
+            "command_errors": self.command_errors,
+            "setup_phases_ms": {
+                name: round(duration * 1000, 3)
+                for name, duration in self.setup_phases.items()
+            },
+            "entities": {
+                entity_id: asdict(counters)
+                for entity_id, counters in sorted(self._entity_counters.items())
+            },
+        }
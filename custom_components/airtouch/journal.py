@@ -0,0 +1,276 @@
+"""Journal of commands requested while the AirTouch console is unreachable.
+
+pyairtouch drops commands that can't be sent within a second, so commands sent
+while the connection is lost would otherwise fail silently and automations
+would have to retry them. Instead, the command queues record them in the
+journal and return immediately.
+
+The journal keeps only the latest desired value of each AC and zone setting, so
+its size is bounded by the number of settings rather than the number of
+commands. It is kept in a Store so that it survives config entry reloads and
+Home Assistant restarts. Once the connection has been re-established, the
+journal for each AC is sent as a single batch of commands.
+"""
+
+import asyncio
+import datetime
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .commands import (
+    AcSettings,
+    StoredAcSettings,
+    StoredZoneSettings,
+    ZoneSettings,
+    dump_ac_settings,
+    dump_zone_settings,
+    load_ac_settings,
+    load_zone_settings,
+)
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    import pyairtouch
+
+    from .commands import AcCommandQueue
+    from .supervisor import ConnectionSupervisor
+
+_LOGGER = logging.getLogger(__name__)
+
+_STORAGE_VERSION = 1
+
+# Commands are usually journaled in bursts, such as by a scene.
+_SAVE_DELAY = 1
+
+# Journaled commands that haven't been updated for this long are discarded
+# rather than sent, as they are unlikely to still be wanted.
+_MAX_AGE = datetime.timedelta(hours=1)
+
+
+@dataclass
+class _AcJournal:
+    updated: datetime.datetime
+    """When a command for the AC or its zones was last journaled."""
+
+    ac_settings: AcSettings | None = None
+    zone_settings: dict[int, ZoneSettings] = field(default_factory=dict)
+    """The latest desired settings for zones keyed by zone ID."""
+
+
+class _StoredAcJournal(TypedDict):
+    ac_id: int
+    updated: str
+    ac_settings: NotRequired[StoredAcSettings]
+    zone_settings: NotRequired[dict[str, StoredZoneSettings]]
+
+
+class _StoredJournal(TypedDict):
+    air_conditioners: list[_StoredAcJournal]
+
+
+class CommandJournal:
+    """Commands for the ACs of a config entry that are waiting to be sent."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry_id: str,
+        supervisor: "ConnectionSupervisor",
+    ) -> None:
+        self._hass = hass
+        self._supervisor = supervisor
+        self._store = Store[_StoredJournal](
+            hass, _STORAGE_VERSION, _storage_key(config_entry_id)
+        )
+        self._journals: dict[int, _AcJournal] = {}
+        self._unsaved = False
+        self._airtouch: pyairtouch.AirTouch | None = None
+        self._command_queues: Mapping[int, AcCommandQueue] = {}
+        self._unsubscribe: CALLBACK_TYPE | None = None
+
+    @property
+    def offline(self) -> bool:
+        """Whether commands should be journaled rather than sent."""
+        return not self._supervisor.available
+
+    @property
+    def journaling(self) -> bool:
+        """Whether commands are being journaled while the AirTouch is unreachable."""
+        return self._unsubscribe is not None and self.offline
+
+    async def async_load(self) -> None:
+        """Load commands journaled before the config entry was last unloaded."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        for stored_journal in stored["air_conditioners"]:
+            try:
+                self._journals[stored_journal["ac_id"]] = _load_journal(stored_journal)
+            except (KeyError, ValueError):
+                _LOGGER.warning(
+                    "Ignoring invalid journal for AC %s", stored_journal.get("ac_id")
+                )
+
+    async def async_save(self) -> None:
+        """Save any unsaved changes immediately."""
+        if self._unsaved:
+            await self._store.async_save(self._data_to_save())
+
+    @callback
+    def record_ac(self, ac_id: int, settings: AcSettings) -> None:
+        """Record a command for an AC."""
+        journal = self._ac_journal(ac_id)
+        journal.ac_settings = (
+            journal.ac_settings.updated(settings) if journal.ac_settings else settings
+        )
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+
+    @callback
+    def record_zone(self, ac_id: int, zone_id: int, settings: ZoneSettings) -> None:
+        """Record a command for a zone of an AC."""
+        journal = self._ac_journal(ac_id)
+        previous = journal.zone_settings.get(zone_id)
+        journal.zone_settings[zone_id] = (
+            previous.updated(settings) if previous else settings
+        )
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+
+    @callback
+    def start(
+        self,
+        airtouch: "pyairtouch.AirTouch",
+        command_queues: "Mapping[int, AcCommandQueue]",
+    ) -> None:
+        """Send journaled commands now and whenever the connection is restored."""
+        self._airtouch = airtouch
+        self._command_queues = command_queues
+        self._unsubscribe = self._supervisor.async_add_listener(
+            self._async_connection_changed
+        )
+        self._async_connection_changed()
+
+    @callback
+    def stop(self) -> None:
+        """Stop sending journaled commands."""
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    async def async_replay(self) -> None:
+        """Send the journaled commands and clear the journal."""
+        airtouch = self._airtouch
+        if not self._journals or not airtouch or self.offline:
+            return
+        journals = self._journals
+        self._journals = {}
+        self._unsaved = True
+        await self.async_save()
+
+        expired = dt_util.utcnow() - _MAX_AGE
+        commands = []
+        for airtouch_ac in airtouch.air_conditioners:
+            journal = journals.get(airtouch_ac.ac_id)
+            command_queue = self._command_queues.get(airtouch_ac.ac_id)
+            if not journal or not command_queue:
+                continue
+            if journal.updated < expired:
+                _LOGGER.warning(
+                    "Discarding commands for %s journaled at %s",
+                    airtouch_ac.name,
+                    journal.updated,
+                )
+                continue
+            zones = {zone.zone_id: zone for zone in airtouch_ac.zones}
+            commands.append(
+                command_queue.async_apply(
+                    journal.ac_settings,
+                    {
+                        zones[zone_id]: settings
+                        for zone_id, settings in journal.zone_settings.items()
+                        if zone_id in zones
+                    },
+                )
+            )
+
+        _LOGGER.info("Sending commands journaled for %d AC(s)", len(commands))
+        results = await asyncio.gather(*commands, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error("Error sending journaled commands: %s", result)
+
+    def as_dict(self) -> dict[str, Any]:
+        """A summary of the journal for diagnostics."""
+        return {
+            f"ac{ac_id}": _dump_journal(ac_id, journal)
+            for ac_id, journal in sorted(self._journals.items())
+        }
+
+    @callback
+    def _async_connection_changed(self) -> None:
+        if self._journals and not self.offline:
+            self._hass.async_create_task(self.async_replay())
+
+    def _ac_journal(self, ac_id: int) -> _AcJournal:
+        now = dt_util.utcnow()
+        journal = self._journals.get(ac_id)
+        if journal:
+            journal.updated = now
+        else:
+            journal = self._journals[ac_id] = _AcJournal(updated=now)
+        self._unsaved = True
+        return journal
+
+    @callback
+    def _data_to_save(self) -> _StoredJournal:
+        self._unsaved = False
+        return _StoredJournal(
+            air_conditioners=[
+                _dump_journal(ac_id, journal)
+                for ac_id, journal in self._journals.items()
+            ]
+        )
+
+
+async def async_remove_journal(hass: HomeAssistant, config_entry_id: str) -> None:
+    """Remove the stored journal of a config entry that has been removed."""
+    await Store[_StoredJournal](
+        hass, _STORAGE_VERSION, _storage_key(config_entry_id)
+    ).async_remove()
+
+
+def _storage_key(config_entry_id: str) -> str:
+    return f"{DOMAIN}.journal.{config_entry_id}"
+
+
+def _dump_journal(ac_id: int, journal: _AcJournal) -> _StoredAcJournal:
+    stored = _StoredAcJournal(ac_id=ac_id, updated=journal.updated.isoformat())
+    if journal.ac_settings:
+        stored["ac_settings"] = dump_ac_settings(journal.ac_settings)
+    if journal.zone_settings:
+        stored["zone_settings"] = {
+            str(zone_id): dump_zone_settings(settings)
+            for zone_id, settings in journal.zone_settings.items()
+        }
+    return stored
+
+
+def _load_journal(stored: _StoredAcJournal) -> _AcJournal:
+    updated = dt_util.parse_datetime(stored["updated"])
+    if updated is None:
+        raise ValueError("Invalid journal time")
+    stored_ac = stored.get("ac_settings")
+    return _AcJournal(
+        updated=updated,
+        ac_settings=load_ac_settings(stored_ac) if stored_ac else None,
+        zone_settings={
+            int(zone_id): load_zone_settings(stored_zone)
+            for zone_id, stored_zone in stored.get("zone_settings", {}).items()
+        },
+    )
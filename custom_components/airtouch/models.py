@@ -0,0 +1,92 @@
+"""Runtime data models for the AirTouch integration."""
+
+import enum
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import pyairtouch
+from homeassistant.const import Platform
+
+from .commands import AcCommandQueue
+from .devices import AirTouchDevice
+from .dispatcher import UpdateDispatcher
+from .instrumentation import Instrumentation
+from .journal import CommandJournal
+from .runtime import RuntimeTracker
+from .schedules import ScheduleEngine
+from .supervisor import ConnectionSupervisor
+from .thermal import ThermalModel
+
+if TYPE_CHECKING:
+    from .statistics import ZoneStatistics
+
+
+@dataclass
+class OptimisticUpdates:
+    """Settings and statistics for optimistic entity state.
+
+    Shared by all entities of a config entry.
+    """
+
+    rollback_timeout: float
+    """Seconds to wait for the AirTouch to confirm an expected value.
+
+    Optimistic state is disabled if this is zero.
+    """
+
+    confirmed: int = 0
+    """Number of expected values confirmed by the AirTouch."""
+
+    mismatches: int = 0
+    """Number of expected values rolled back because they weren't confirmed."""
+
+
+class RateLimitedSensor(enum.Enum):
+    """The kinds of sensor that support rate limited state writes."""
+
+    TEMPERATURE = enum.auto()
+    DAMPER = enum.auto()
+
+
+@dataclass
+class SensorRateLimit:
+    """Rate limiting settings for a kind of sensor.
+
+    Shared by all sensors of that kind within a config entry.
+    """
+
+    min_interval: float
+    """Minimum seconds between state writes. Zero disables the limit."""
+
+    deadband: float
+    """Changes smaller than this are held back. Zero disables the deadband."""
+
+
+@dataclass
+class AirTouchData:
+    """Runtime data for an AirTouch config entry.
+
+    Saved in hass.data for use throughout the integration.
+    """
+
+    airtouch: pyairtouch.AirTouch
+    airtouch_device: AirTouchDevice
+    dispatcher: UpdateDispatcher
+    command_queues: dict[int, AcCommandQueue]
+    """Outbound command queues keyed by AC ID."""
+    optimistic_updates: OptimisticUpdates
+    instrumentation: Instrumentation
+    sensor_rate_limits: dict[RateLimitedSensor, SensorRateLimit]
+    platforms: list[Platform]
+    """The platforms that have entities for this config entry."""
+    supervisor: ConnectionSupervisor
+    schedules: ScheduleEngine
+    """Weekly AC and zone programs."""
+    journal: CommandJournal
+    """Commands waiting for the connection to be re-established."""
+    thermal_model: ThermalModel
+    """Learned zone heating and cooling rates."""
+    runtime: RuntimeTracker
+    """AC run times and energy estimates."""
+    zone_statistics: "ZoneStatistics | None"
+    """Hourly zone statistics, or None if the recorder isn't loaded."""
@@ -0,0 +1,410 @@
+"""Run time and energy estimates for ACs.
+
+The time that each AC spends heating, cooling, drying and running the fan only,
+and the time that it runs at each fan speed, is accumulated from the HVAC action
+and active fan speed reported by the AC. Time is added when the activity of an
+AC changes, and periodically while it continues, so that the totals and the
+energy estimate grow steadily during a long run. The period in progress is also
+added when Home Assistant stops or the config entry is unloaded.
+
+Energy use is estimated at the same time from a configured power for each HVAC
+action. The power configured when a period ends is used for the whole period,
+so changing the power doesn't change earlier estimates.
+
+The totals are kept in a Store so that they continue across restarts, along
+with when and in what activity the period in progress started. If an AC is in
+the same activity when the totals are loaded again after a short interruption,
+the period continues from its stored start, so a restart doesn't lose the time
+in between.
+"""
+
+import datetime
+import logging
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, NamedTuple, NotRequired, TypedDict
+
+import pyairtouch
+from homeassistant.components import climate
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .climate import ac_hvac_action
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .dispatcher import UpdateDispatcher
+
+_LOGGER = logging.getLogger(__name__)
+
+_STORAGE_VERSION = 1
+
+# Totals are saved shortly after each activity change or checkpoint.
+_SAVE_DELAY = 60
+
+# Interval at which the period in progress is added to the totals.
+_CHECKPOINT_INTERVAL = datetime.timedelta(minutes=15)
+
+# A stored period in progress is only continued after an interruption shorter
+# than this. The AC may have done anything during a longer one.
+_MAX_RESUME_GAP = datetime.timedelta(hours=1)
+
+ACTIVE_HVAC_ACTIONS = (
+    climate.HVACAction.HEATING,
+    climate.HVACAction.COOLING,
+    climate.HVACAction.DRYING,
+    climate.HVACAction.FAN,
+)
+"""The HVAC actions that run times are accumulated for."""
+
+_RUNNING_POWER_STATES = frozenset(
+    [
+        pyairtouch.AcPowerState.ON,
+        pyairtouch.AcPowerState.ON_AWAY,
+        pyairtouch.AcPowerState.SLEEP,
+    ]
+)
+
+RuntimeListener = Callable[[], None]
+
+
+class _Activity(NamedTuple):
+    hvac_action: climate.HVACAction | None
+    fan_speed: pyairtouch.AcFanSpeed | None
+    """The fan speed while the AC is running, otherwise None."""
+
+
+class _Period(NamedTuple):
+    start: datetime.datetime
+    activity: _Activity
+
+
+@dataclass
+class AcRuntime:
+    """Accumulated run times and energy estimate for an AC."""
+
+    action_seconds: dict[climate.HVACAction, float] = field(default_factory=dict)
+    fan_speed_seconds: dict[pyairtouch.AcFanSpeed, float] = field(default_factory=dict)
+    energy: float = 0.0
+    """Estimated energy use in kWh."""
+
+
+@dataclass
+class _AcTracker:
+    airtouch_ac: pyairtouch.AirConditioner
+    totals: AcRuntime
+    activity: _Activity = field(default_factory=lambda: _Activity(None, None))
+    since: datetime.datetime | None = None
+    """When the period in progress started. The totals include all time before."""
+    listeners: set[RuntimeListener] = field(default_factory=set)
+    stored_period: _Period | None = None
+    """The period that was in progress when the totals were last saved."""
+
+
+class _StoredPeriod(TypedDict):
+    start: str
+    hvac_action: str | None
+    fan_speed: str | None
+
+
+class _StoredAcRuntime(TypedDict):
+    ac_id: int
+    action_seconds: dict[str, float]
+    fan_speed_seconds: dict[str, float]
+    energy: float
+    period: NotRequired[_StoredPeriod]
+
+
+class _StoredRuntime(TypedDict):
+    air_conditioners: list[_StoredAcRuntime]
+
+
+class RuntimeTracker:
+    """Accumulates the run times of the ACs of a config entry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry_id: str,
+        airtouch: pyairtouch.AirTouch,
+        dispatcher: "UpdateDispatcher",
+        power: Mapping[climate.HVACAction, float],
+    ) -> None:
+        self._hass = hass
+        self._dispatcher = dispatcher
+        self._store = Store[_StoredRuntime](
+            hass, _STORAGE_VERSION, _storage_key(config_entry_id)
+        )
+        self._trackers = {
+            airtouch_ac.ac_id: _AcTracker(airtouch_ac=airtouch_ac, totals=AcRuntime())
+            for airtouch_ac in airtouch.air_conditioners
+        }
+        self._unsubscribers: list[CALLBACK_TYPE] = []
+        self._unsaved = False
+
+        self.power = dict(power)
+        """Estimated power in kW for each HVAC action."""
+
+    async def async_load(self) -> None:
+        """Load the totals accumulated before the config entry was unloaded."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        for stored_runtime in stored["air_conditioners"]:
+            tracker = self._trackers.get(stored_runtime["ac_id"])
+            if not tracker:
+                continue
+            try:
+                tracker.totals = _load_runtime(stored_runtime)
+                stored_period = stored_runtime.get("period")
+                tracker.stored_period = (
+                    _load_period(stored_period) if stored_period else None
+                )
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.warning(
+                    "Ignoring invalid run times for AC %s", stored_runtime["ac_id"]
+                )
+
+    async def async_save(self) -> None:
+        """Save any unsaved totals immediately."""
+        if self._unsaved:
+            await self._store.async_save(self._data_to_save())
+
+    @callback
+    def start(self) -> None:
+        """Start accumulating run times."""
+        now = dt_util.utcnow()
+        for ac_id, tracker in self._trackers.items():
+            tracker.activity = _activity(tracker.airtouch_ac)
+            tracker.since = _resumed_start(tracker, now) or now
+            tracker.stored_period = None
+            self._unsubscribers.append(
+                self._dispatcher.async_add_ac_listener(
+                    ac_id, lambda ac_id=ac_id: self._observe_ac(ac_id)
+                )
+            )
+        self._unsubscribers.append(
+            async_track_time_interval(
+                self._hass, self._async_checkpoint, _CHECKPOINT_INTERVAL
+            )
+        )
+        # Config entries aren't unloaded when Home Assistant stops, so the
+        # periods in progress are added for the final write of the Store.
+        self._unsubscribers.append(
+            self._hass.bus.async_listen(
+                EVENT_HOMEASSISTANT_STOP, self._async_checkpoint
+            )
+        )
+
+    @callback
+    def stop(self) -> None:
+        """Stop accumulating run times, adding the periods in progress."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+        now = dt_util.utcnow()
+        for tracker in self._trackers.values():
+            self._add_period(tracker, now)
+            tracker.since = now
+
+    def totals(self, ac_id: int) -> AcRuntime:
+        """The accumulated totals for an AC."""
+        return self._trackers[ac_id].totals
+
+    @callback
+    def async_add_listener(
+        self, ac_id: int, listener: RuntimeListener
+    ) -> CALLBACK_TYPE:
+        """Listen for changes to the totals of an AC.
+
+        Returns:
+            A callback to remove the listener.
+        """
+        listeners = self._trackers[ac_id].listeners
+        listeners.add(listener)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.discard(listener)
+
+        return remove_listener
+
+    def as_dict(self) -> dict[str, Any]:
+        """A summary of the totals for diagnostics."""
+        return {
+            f"ac{ac_id}": {
+                "since": tracker.since.isoformat() if tracker.since else None,
+                "hvac_action": tracker.activity.hvac_action,
+                "fan_speed": (
+                    tracker.activity.fan_speed.name
+                    if tracker.activity.fan_speed
+                    else None
+                ),
+                "totals": _dump_runtime(ac_id, tracker.totals),
+            }
+            for ac_id, tracker in self._trackers.items()
+        }
+
+    @callback
+    def _observe_ac(self, ac_id: int) -> None:
+        tracker = self._trackers[ac_id]
+        activity = _activity(tracker.airtouch_ac)
+        if activity == tracker.activity:
+            return
+
+        now = dt_util.utcnow()
+        self._add_period(tracker, now)
+        tracker.activity = activity
+        tracker.since = now
+        self._unsaved = True
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+        _notify_listeners(tracker)
+
+    @callback
+    def _async_checkpoint(self, _: datetime.datetime | Event) -> None:
+        now = dt_util.utcnow()
+        changed = False
+        for tracker in self._trackers.values():
+            if self._add_period(tracker, now):
+                changed = True
+                _notify_listeners(tracker)
+            tracker.since = now
+        # Nothing needs saving while every AC is off.
+        if changed:
+            self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+
+    def _add_period(self, tracker: _AcTracker, now: datetime.datetime) -> bool:
+        """Add the time since the start of the period to the totals.
+
+        Returns:
+            Whether the totals changed.
+        """
+        if tracker.since is None:
+            return False
+        seconds = (now - tracker.since).total_seconds()
+        hvac_action, fan_speed = tracker.activity
+        if seconds <= 0 or (hvac_action not in ACTIVE_HVAC_ACTIONS and not fan_speed):
+            return False
+        totals = tracker.totals
+        if hvac_action in ACTIVE_HVAC_ACTIONS:
+            totals.action_seconds[hvac_action] = (
+                totals.action_seconds.get(hvac_action, 0.0) + seconds
+            )
+            totals.energy += self.power.get(hvac_action, 0.0) * seconds / 3600
+        if fan_speed:
+            totals.fan_speed_seconds[fan_speed] = (
+                totals.fan_speed_seconds.get(fan_speed, 0.0) + seconds
+            )
+        self._unsaved = True
+        return True
+
+    @callback
+    def _data_to_save(self) -> _StoredRuntime:
+        self._unsaved = False
+        return _StoredRuntime(
+            air_conditioners=[
+                _dump_runtime(
+                    ac_id,
+                    tracker.totals,
+                    _Period(tracker.since, tracker.activity) if tracker.since else None,
+                )
+                for ac_id, tracker in self._trackers.items()
+            ]
+        )
+
+
+async def async_remove_runtime(hass: HomeAssistant, config_entry_id: str) -> None:
+    """Remove the stored totals of a config entry that has been removed."""
+    await Store[_StoredRuntime](
+        hass, _STORAGE_VERSION, _storage_key(config_entry_id)
+    ).async_remove()
+
+
+def _storage_key(config_entry_id: str) -> str:
+    return f"{DOMAIN}.runtime.{config_entry_id}"
+
+
+def _notify_listeners(tracker: _AcTracker) -> None:
+    for listener in list(tracker.listeners):
+        try:
+            listener()
+        except Exception:
+            _LOGGER.exception("Exception from run time listener %s", listener)
+
+
+def _resumed_start(
+    tracker: _AcTracker, now: datetime.datetime
+) -> datetime.datetime | None:
+    """The start of the stored period, if the AC is still in the same activity."""
+    stored = tracker.stored_period
+    if (
+        not stored
+        or stored.activity != tracker.activity
+        or not datetime.timedelta() <= now - stored.start <= _MAX_RESUME_GAP
+    ):
+        return None
+    return stored.start
+
+
+def _activity(airtouch_ac: pyairtouch.AirConditioner) -> _Activity:
+    fan_speed = None
+    if airtouch_ac.power_state in _RUNNING_POWER_STATES:
+        fan_speed = airtouch_ac.active_fan_speed or airtouch_ac.selected_fan_speed
+    return _Activity(ac_hvac_action(airtouch_ac), fan_speed)
+
+
+def _dump_runtime(
+    ac_id: int, runtime: AcRuntime, period: _Period | None = None
+) -> _StoredAcRuntime:
+    stored = _StoredAcRuntime(
+        ac_id=ac_id,
+        action_seconds={
+            str(hvac_action): seconds
+            for hvac_action, seconds in runtime.action_seconds.items()
+        },
+        fan_speed_seconds={
+            fan_speed.name: seconds
+            for fan_speed, seconds in runtime.fan_speed_seconds.items()
+        },
+        energy=runtime.energy,
+    )
+    if period:
+        hvac_action, fan_speed = period.activity
+        stored["period"] = _StoredPeriod(
+            start=period.start.isoformat(),
+            hvac_action=str(hvac_action) if hvac_action else None,
+            fan_speed=fan_speed.name if fan_speed else None,
+        )
+    return stored
+
+
+def _load_runtime(stored: _StoredAcRuntime) -> AcRuntime:
+    return AcRuntime(
+        action_seconds={
+            climate.HVACAction(hvac_action): seconds
+            for hvac_action, seconds in stored["action_seconds"].items()
+        },
+        fan_speed_seconds={
+            pyairtouch.AcFanSpeed[name]: seconds
+            for name, seconds in stored["fan_speed_seconds"].items()
+        },
+        energy=float(stored["energy"]),
+    )
+
+
+def _load_period(stored: _StoredPeriod) -> _Period:
+    start = dt_util.parse_datetime(stored["start"])
+    if start is None:
+        raise ValueError("Invalid period start")
+    hvac_action = stored["hvac_action"]
+    fan_speed = stored["fan_speed"]
+    return _Period(
+        start=start,
+        activity=_Activity(
+            climate.HVACAction(hvac_action) if hvac_action else None,
+            pyairtouch.AcFanSpeed[fan_speed] if fan_speed else None,
+        ),
+    )
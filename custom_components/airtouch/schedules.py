@@ -0,0 +1,464 @@
+"""Weekly schedules for ACs and zones that run inside the integration.
+
+Each AC and zone can have a weekly program of transitions, where each
+transition applies settings at a time of day on one or more days of the week.
+An AC's transitions can also include settings for any of its zones, so that a
+whole house can change with a single transition.
+
+Programs are kept in a Store per config entry. The next transition time of
+every program is kept in a single heap, and a single timer is scheduled for the
+earliest of them. All transitions that are due at the same time are applied
+together as one batch of commands per AC.
+
+AC transitions can be pre-conditioned, in which case they are applied early
+enough for the zones of the AC to reach their target temperatures by the
+transition time. The lead time is predicted from the learned heating and
+cooling rates of the zones, and is re-checked periodically in the hours before
+the transition as the zone temperatures change.
+
+Transitions that are missed while Home Assistant isn't running are not
+applied later.
+"""
+
+import asyncio
+import datetime
+import heapq
+import itertools
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Literal, NotRequired, TypedDict
+
+import pyairtouch
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .commands import (
+    AcSettings,
+    StoredAcSettings,
+    StoredZoneSettings,
+    ZoneSettings,
+    dump_ac_settings,
+    dump_zone_settings,
+    load_ac_settings,
+    load_zone_settings,
+)
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .commands import AcCommandQueue
+    from .thermal import ThermalModel
+
+_LOGGER = logging.getLogger(__name__)
+
+_STORAGE_VERSION = 1
+
+# Schedules are changed by service calls, so there's no need to write them
+# immediately.
+_SAVE_DELAY = 1
+
+# Pre-conditioned transitions are never applied earlier than this.
+_MAX_PRECONDITION_LEAD = datetime.timedelta(hours=2)
+
+# How often the lead time of a pre-conditioned transition is re-checked.
+_PRECONDITION_CHECK_INTERVAL = datetime.timedelta(minutes=5)
+
+ScheduleTarget = tuple[Literal["ac", "zone"], int]
+"""The AC or zone that a program belongs to."""
+
+
+@dataclass(frozen=True)
+class Transition:
+    """Settings that are applied at a time on one or more days of the week."""
+
+    weekdays: frozenset[int]
+    """The days of the week that the transition applies, where Monday is 0."""
+
+    time: datetime.time
+
+    ac_settings: AcSettings | None = None
+
+    zone_settings: Mapping[int, ZoneSettings] = field(default_factory=dict)
+    """Settings for zones keyed by zone ID."""
+
+    precondition: bool = False
+    """Whether to apply the transition early to reach the target temperatures."""
+
+    def next_time(self, after: datetime.datetime) -> datetime.datetime:
+        """The first time that the transition is due after a local time."""
+        for days_ahead in range(8):
+            date = after.date() + datetime.timedelta(days=days_ahead)
+            if date.weekday() in self.weekdays:
+                candidate = datetime.datetime.combine(
+                    date, self.time, tzinfo=after.tzinfo
+                )
+                if candidate > after:
+                    return candidate
+        raise ValueError("Transition has no weekdays")
+
+
+class _StoredTransition(TypedDict):
+    weekdays: list[int]
+    time: str
+    ac_settings: NotRequired[StoredAcSettings]
+    zone_settings: NotRequired[dict[str, StoredZoneSettings]]
+    precondition: NotRequired[bool]
+
+
+class _StoredProgram(TypedDict):
+    target: Literal["ac", "zone"]
+    id: int
+    transitions: list[_StoredTransition]
+
+
+class _StoredSchedules(TypedDict):
+    programs: list[_StoredProgram]
+
+
+@dataclass
+class _NextTransitions:
+    time: datetime.datetime
+    transitions: list[Transition]
+    due: datetime.datetime
+    """When the transitions need to be checked, which is before their time if
+    any are pre-conditioned."""
+
+
+class ScheduleEngine:
+    """Runs the weekly programs for the ACs and zones of a config entry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry_id: str,
+        airtouch: pyairtouch.AirTouch,
+        command_queues: Mapping[int, "AcCommandQueue"],
+        thermal_model: "ThermalModel",
+    ) -> None:
+        self._hass = hass
+        self._airtouch = airtouch
+        self._command_queues = command_queues
+        self._thermal_model = thermal_model
+        self._store = Store[_StoredSchedules](
+            hass, _STORAGE_VERSION, _storage_key(config_entry_id)
+        )
+
+        self._programs: dict[ScheduleTarget, list[Transition]] = {}
+        self._next: dict[ScheduleTarget, _NextTransitions] = {}
+        # Entries are not removed when a program changes. Instead entries that
+        # no longer match the program's next transition time are skipped.
+        self._heap: list[tuple[datetime.datetime, int, ScheduleTarget]] = []
+        self._sequence = itertools.count()
+
+        self._timer_time: datetime.datetime | None = None
+        self._cancel_timer: CALLBACK_TYPE | None = None
+        self._started = False
+
+    async def async_load(self) -> None:
+        """Load the programs from persistent storage."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        for stored_program in stored["programs"]:
+            target: ScheduleTarget = (stored_program["target"], stored_program["id"])
+            try:
+                self._programs[target] = [
+                    _load_transition(stored_transition)
+                    for stored_transition in stored_program["transitions"]
+                ]
+            except (KeyError, ValueError):
+                _LOGGER.warning("Ignoring invalid schedule for %s %d", *target)
+
+    @callback
+    def start(self) -> None:
+        """Start running the programs."""
+        self._started = True
+        now = dt_util.now()
+        for target in self._programs:
+            self._push(target, now)
+        self._schedule_timer()
+
+    @callback
+    def stop(self) -> None:
+        """Stop running the programs."""
+        self._started = False
+        if self._cancel_timer:
+            self._cancel_timer()
+            self._cancel_timer = None
+        self._timer_time = None
+
+    @callback
+    def async_set_program(
+        self, target: ScheduleTarget, transitions: list[Transition]
+    ) -> None:
+        """Replace the program for an AC or zone."""
+        if transitions:
+            self._programs[target] = transitions
+        else:
+            self._programs.pop(target, None)
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+
+        if self._started:
+            self._push(target, dt_util.now())
+            self._schedule_timer()
+
+    def next_transition_time(self, target: ScheduleTarget) -> datetime.datetime | None:
+        """The time of the next transition for an AC or zone."""
+        next_transitions = self._next.get(target)
+        return next_transitions.time if next_transitions else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """A summary of the programs for diagnostics."""
+        return {
+            f"{kind}{target_id}": {
+                "next_transition": _isoformat(
+                    self.next_transition_time((kind, target_id))
+                ),
+                "transitions": [_dump_transition(t) for t in transitions],
+            }
+            for (kind, target_id), transitions in sorted(self._programs.items())
+        }
+
+    def _push(self, target: ScheduleTarget, now: datetime.datetime) -> None:
+        transitions = self._programs.get(target)
+        if not transitions:
+            self._next.pop(target, None)
+            return
+
+        next_times = [(t.next_time(now), t) for t in transitions]
+        next_time = min(time for time, _ in next_times)
+        due_transitions = [t for time, t in next_times if time == next_time]
+        due = next_time
+        if any(t.precondition for t in due_transitions):
+            due = max(next_time - _MAX_PRECONDITION_LEAD, now)
+        self._next[target] = _NextTransitions(
+            time=next_time, transitions=due_transitions, due=due
+        )
+        heapq.heappush(self._heap, (due, next(self._sequence), target))
+
+    def _repush(self, target: ScheduleTarget, due: datetime.datetime) -> None:
+        self._next[target].due = due
+        heapq.heappush(self._heap, (due, next(self._sequence), target))
+
+    def _is_current(self, entry: tuple[datetime.datetime, int, ScheduleTarget]) -> bool:
+        next_transitions = self._next.get(entry[2])
+        return next_transitions is not None and next_transitions.due == entry[0]
+
+    def _schedule_timer(self) -> None:
+        heap = self._heap
+        while heap and not self._is_current(heap[0]):
+            heapq.heappop(heap)
+
+        next_time = heap[0][0] if heap else None
+        if next_time == self._timer_time:
+            return
+        if self._cancel_timer:
+            self._cancel_timer()
+            self._cancel_timer = None
+        self._timer_time = next_time
+        if next_time:
+            self._cancel_timer = async_track_point_in_utc_time(
+                self._hass, self._async_run_due, next_time
+            )
+
+    @callback
+    def _async_run_due(self, now: datetime.datetime) -> None:
+        self._cancel_timer = None
+        self._timer_time = None
+
+        due: list[tuple[ScheduleTarget, _NextTransitions]] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if not self._is_current(entry):
+                continue
+            target = entry[2]
+            next_transitions = self._next[target]
+            if next_transitions.time > now:
+                # A pre-conditioned transition is approaching.
+                start = next_transitions.time - self._precondition_lead(
+                    target, next_transitions.transitions
+                )
+                if start > now:
+                    self._repush(target, min(start, now + _PRECONDITION_CHECK_INTERVAL))
+                    continue
+                _LOGGER.debug(
+                    "Pre-conditioning %s %d for %s", *target, next_transitions.time
+                )
+            due.append((target, next_transitions))
+
+        # AC programs are applied first so that a zone's own program takes
+        # precedence over the zone settings of an AC program, but only for the
+        # fields that it sets.
+        due.sort(key=lambda item: item[0])
+        batches: dict[int, tuple[AcSettings | None, dict[int, ZoneSettings]]] = {}
+        for (kind, target_id), next_transitions in due:
+            for transition in next_transitions.transitions:
+                ac_id = target_id if kind == "ac" else self._zone_ac_id(target_id)
+                if ac_id is None:
+                    continue
+                batches[ac_id] = _merge_transition(
+                    batches.get(ac_id, (None, {})), transition
+                )
+            self._push((kind, target_id), dt_util.as_local(next_transitions.time))
+
+        self._schedule_timer()
+
+        if batches:
+            self._hass.async_create_task(self._async_apply(batches))
+
+    async def _async_apply(
+        self, batches: dict[int, tuple[AcSettings | None, dict[int, ZoneSettings]]]
+    ) -> None:
+        commands = []
+        for ac_id, (ac_settings, zone_settings) in batches.items():
+            command_queue = self._command_queues.get(ac_id)
+            if not command_queue:
+                continue
+            zones = {zone.zone_id: zone for zone in self._ac_zones(ac_id)}
+            commands.append(
+                command_queue.async_apply(
+                    ac_settings,
+                    {
+                        zones[zone_id]: settings
+                        for zone_id, settings in zone_settings.items()
+                        if zone_id in zones
+                    },
+                )
+            )
+
+        results = await asyncio.gather(*commands, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error("Error applying scheduled transition: %s", result)
+
+    def _precondition_lead(
+        self, target: ScheduleTarget, transitions: list[Transition]
+    ) -> datetime.timedelta:
+        """How long before their time transitions should be applied.
+
+        This is the longest predicted time for a zone of the AC to reach its
+        target temperature, limited to the maximum lead. Zones with no
+        prediction don't need any lead time.
+        """
+        kind, ac_id = target
+        if kind != "ac":
+            return datetime.timedelta()
+        airtouch_ac = next(
+            (ac for ac in self._airtouch.air_conditioners if ac.ac_id == ac_id), None
+        )
+        if not airtouch_ac:
+            return datetime.timedelta()
+
+        lead = datetime.timedelta()
+        for transition in transitions:
+            if not transition.precondition or not transition.ac_settings:
+                continue
+            mode = transition.ac_settings.mode
+            for airtouch_zone in airtouch_ac.zones:
+                settings = transition.zone_settings.get(airtouch_zone.zone_id)
+                power_state = (
+                    settings and settings.power_state
+                ) or airtouch_zone.power_state
+                if power_state == pyairtouch.ZonePowerState.OFF:
+                    continue
+                temperature = (
+                    settings and settings.target_temperature
+                ) or airtouch_zone.target_temperature
+                if temperature is None:
+                    continue
+                zone_lead = self._thermal_model.time_to_temperature(
+                    airtouch_zone.zone_id, temperature, mode
+                )
+                if zone_lead is not None:
+                    lead = max(lead, zone_lead)
+        return min(lead, _MAX_PRECONDITION_LEAD)
+
+    def _zone_ac_id(self, zone_id: int) -> int | None:
+        for airtouch_ac in self._airtouch.air_conditioners:
+            if any(zone.zone_id == zone_id for zone in airtouch_ac.zones):
+                return airtouch_ac.ac_id
+        return None
+
+    def _ac_zones(self, ac_id: int) -> list[pyairtouch.Zone]:
+        for airtouch_ac in self._airtouch.air_conditioners:
+            if airtouch_ac.ac_id == ac_id:
+                return list(airtouch_ac.zones)
+        return []
+
+    @callback
+    def _data_to_save(self) -> _StoredSchedules:
+        return _StoredSchedules(
+            programs=[
+                _StoredProgram(
+                    target=kind,
+                    id=target_id,
+                    transitions=[_dump_transition(t) for t in transitions],
+                )
+                for (kind, target_id), transitions in self._programs.items()
+            ]
+        )
+
+
+async def async_remove_schedules(hass: HomeAssistant, config_entry_id: str) -> None:
+    """Remove the stored programs of a config entry that has been removed."""
+    await Store[_StoredSchedules](
+        hass, _STORAGE_VERSION, _storage_key(config_entry_id)
+    ).async_remove()
+
+
+def _storage_key(config_entry_id: str) -> str:
+    return f"{DOMAIN}.schedules.{config_entry_id}"
+
+
+def _merge_transition(
+    batch: tuple[AcSettings | None, dict[int, ZoneSettings]], transition: Transition
+) -> tuple[AcSettings | None, dict[int, ZoneSettings]]:
+    """Add the settings of a transition to a batch, taking precedence field by field."""
+    ac_settings, zone_settings = batch
+    if transition.ac_settings:
+        ac_settings = (
+            ac_settings.updated(transition.ac_settings)
+            if ac_settings
+            else transition.ac_settings
+        )
+    for zone_id, settings in transition.zone_settings.items():
+        previous = zone_settings.get(zone_id)
+        zone_settings[zone_id] = previous.updated(settings) if previous else settings
+    return ac_settings, zone_settings
+
+
+def _isoformat(value: datetime.datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _dump_transition(transition: Transition) -> _StoredTransition:
+    stored = _StoredTransition(
+        weekdays=sorted(transition.weekdays), time=transition.time.isoformat()
+    )
+    if transition.ac_settings:
+        stored["ac_settings"] = dump_ac_settings(transition.ac_settings)
+    if transition.zone_settings:
+        stored["zone_settings"] = {
+            str(zone_id): dump_zone_settings(settings)
+            for zone_id, settings in transition.zone_settings.items()
+        }
+    if transition.precondition:
+        stored["precondition"] = True
+    return stored
+
+
+def _load_transition(stored: _StoredTransition) -> Transition:
+    stored_ac = stored.get("ac_settings")
+    return Transition(
+        weekdays=frozenset(stored["weekdays"]),
+        time=datetime.time.fromisoformat(stored["time"]),
+        ac_settings=load_ac_settings(stored_ac) if stored_ac else None,
+        zone_settings={
+            int(zone_id): load_zone_settings(stored_zone)
+            for zone_id, stored_zone in stored.get("zone_settings", {}).items()
+        },
+        precondition=stored.get("precondition", False),
+    )
@@ -1,25 +1,57 @@
 """Polyaire AirTouch sensor entities.
 
 Sensors are used to represent:
-- the current temperature for the AC and any zones with sensors; and
-- the current damper open percentage for each zone.
+- the current temperature for the AC and any zones with sensors;
+- the current damper open percentage for each zone;
+- the predicted time for zones with sensors to reach their target temperature;
+- the accumulated run times and estimated energy use of each AC;
+- the health of the connection to the AirTouch console; and
+- diagnostic instrumentation of the integration itself.
 """
 
 import logging
-from typing import Any
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
 
 import pyairtouch
 from homeassistant.components import sensor
+from homeassistant.components.climate import HVACAction
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import climate, devices, entities
-from .const import CONF_SPILL_BYPASS, CONF_SPILL_ZONES, DOMAIN, SpillBypass
+from .const import (
+    CONF_SPILL_BYPASS,
+    CONF_SPILL_ZONES,
+    DOMAIN,
+    OPTIONS_ZONE_SENSOR_STATISTICS,
+    OPTIONS_ZONE_SENSOR_STATISTICS_DEFAULT,
+    SpillBypass,
+)
+from .models import RateLimitedSensor
+from .runtime import ACTIVE_HVAC_ACTIONS
+
+if TYPE_CHECKING:
+    import datetime
+
+    from .instrumentation import Instrumentation, LatencyHistogram
+    from .models import AirTouchData
+    from .runtime import RuntimeTracker
+    from .supervisor import ConnectionStatistics
 
 _LOGGER = logging.getLogger(__name__)
 
+# Only the instrumentation sensors are polled.
+SCAN_INTERVAL = timedelta(seconds=60)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -27,7 +59,8 @@ async def async_setup_entry(
     async_add_devices: AddEntitiesCallback,
 ) -> None:
     """Set up the AirTouch sensors."""
-    airtouch: pyairtouch.AirTouch = hass.data[DOMAIN][config_entry.entry_id]
+    data: AirTouchData = hass.data[DOMAIN][config_entry.entry_id]
+    airtouch = data.airtouch
 
     # When reading serialised configuration, the config data will be the
     # underlying value not the enum value so it needs to be converted to an enum
@@ -36,10 +69,13 @@ async def async_setup_entry(
         config_entry.data.get(CONF_SPILL_BYPASS, SpillBypass.SPILL)
     )
     spill_zones: list[int] = config_entry.data.get(CONF_SPILL_ZONES, [])
+    zone_sensor_statistics: bool = config_entry.options.get(
+        OPTIONS_ZONE_SENSOR_STATISTICS, OPTIONS_ZONE_SENSOR_STATISTICS_DEFAULT
+    )
 
     discovered_entities: list[sensor.SensorEntity] = []
 
-    airtouch_device = devices.AirTouchDevice(hass, config_entry.entry_id, airtouch)
+    airtouch_device = data.airtouch_device
     for airtouch_ac in airtouch.air_conditioners:
         ac_device = airtouch_device.ac_device(airtouch_ac)
         ac_temperature_entity = AcTemperatureEntity(
@@ -62,6 +98,19 @@ async def async_setup_entry(
             )
             discovered_entities.append(ac_fan_speed_entity)
 
+        discovered_entities.extend(
+            AcRunTimeEntity(ac_device, airtouch_ac, data.runtime, hvac_action)
+            for hvac_action in ACTIVE_HVAC_ACTIONS
+            if _HVAC_ACTION_TO_AC_MODE[hvac_action] in airtouch_ac.supported_modes
+        )
+        discovered_entities.extend(
+            AcFanSpeedRunTimeEntity(ac_device, airtouch_ac, data.runtime, fan_speed)
+            for fan_speed in airtouch_ac.supported_fan_speeds
+        )
+        discovered_entities.append(
+            AcEstimatedEnergyEntity(ac_device, airtouch_ac, data.runtime)
+        )
+
         spill_zone_count = 0
 
         for airtouch_zone in airtouch_ac.zones:
@@ -69,6 +118,7 @@ async def async_setup_entry(
             zone_percentage_entity = ZonePercentageEntity(
                 zone_device=zone_device,
                 airtouch_zone=airtouch_zone,
+                compile_statistics=zone_sensor_statistics,
             )
             discovered_entities.append(zone_percentage_entity)
 
@@ -76,9 +126,17 @@ async def async_setup_entry(
                 zone_temperature_entity = ZoneTemperatureEntity(
                     zone_device=zone_device,
                     airtouch_zone=airtouch_zone,
+                    compile_statistics=zone_sensor_statistics,
                 )
                 discovered_entities.append(zone_temperature_entity)
 
+                zone_time_to_target_entity = ZoneTimeToTargetEntity(
+                    zone_device=zone_device,
+                    airtouch_ac=airtouch_ac,
+                    airtouch_zone=airtouch_zone,
+                )
+                discovered_entities.append(zone_time_to_target_entity)
+
             if airtouch_zone.zone_id in spill_zones:
                 spill_zone_count += 1
 
@@ -100,11 +158,27 @@ async def async_setup_entry(
             )
             discovered_entities.append(ac_spill_bypass_percentage_entity)
 
+    statistics = data.supervisor.statistics
+    instrumentation = data.instrumentation
+    discovered_entities.extend(
+        [
+            ConnectedSinceEntity(airtouch_device, airtouch, statistics),
+            ReconnectsEntity(airtouch_device, airtouch, statistics),
+            StatusUpdatesEntity(airtouch_device, airtouch, instrumentation),
+            StateWritesEntity(airtouch_device, airtouch, instrumentation),
+            UpdateLatencyEntity(airtouch_device, airtouch, instrumentation),
+            CommandLatencyEntity(airtouch_device, airtouch, instrumentation),
+            CommandRoundTripEntity(airtouch_device, airtouch, instrumentation),
+        ]
+    )
+
     _LOGGER.debug("Found entities: %s", discovered_entities)
     async_add_devices(discovered_entities)
 
 
-class AcTemperatureEntity(entities.AirTouchAcEntity, sensor.SensorEntity):
+class AcTemperatureEntity(
+    entities.AirTouchAcEntity, entities.RateLimitedEntity, sensor.SensorEntity
+):
     """Sensor reporting the current temperature of an air-conditioner."""
 
     _attr_name = "Temperature"
@@ -112,6 +186,8 @@ class AcTemperatureEntity(entities.AirTouchAcEntity, sensor.SensorEntity):
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_state_class = sensor.SensorStateClass.MEASUREMENT
 
+    _rate_limited_sensor = RateLimitedSensor.TEMPERATURE
+
     def __init__(
         self, ac_device: devices.AcDevice, airtouch_ac: pyairtouch.AirConditioner
     ) -> None:
@@ -121,6 +197,12 @@ class AcTemperatureEntity(entities.AirTouchAcEntity, sensor.SensorEntity):
             id_suffix="_temperature",
         )
 
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self._airtouch_ac.current_temperature,)
+
+    def _rate_limited_value(self) -> float:
+        return self._airtouch_ac.current_temperature
+
     @property
     def native_value(self) -> float:
         return self._airtouch_ac.current_temperature
@@ -132,6 +214,7 @@ class AcActiveFanSpeedEntity(entities.AirTouchAcEntity, sensor.SensorEntity):
     _attr_name = "Active Fan Speed"
     _attr_device_class = sensor.SensorDeviceClass.ENUM
     _attr_translation_key = "ac_active_fan_speed"
+    _attr_options = list(climate.AC_TO_CLIMATE_FAN_MODE.values())  # noqa: RUF012
 
     def __init__(
         self, ac_device: devices.AcDevice, airtouch_ac: pyairtouch.AirConditioner
@@ -141,7 +224,9 @@ class AcActiveFanSpeedEntity(entities.AirTouchAcEntity, sensor.SensorEntity):
             airtouch_ac=airtouch_ac,
             id_suffix="_active_fan_speed",
         )
-        self._attr_options = list(climate.AC_TO_CLIMATE_FAN_MODE.values())
+
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self._airtouch_ac.active_fan_speed,)
 
     @property
     def native_value(self) -> str | None:
@@ -150,6 +235,139 @@ class AcActiveFanSpeedEntity(entities.AirTouchAcEntity, sensor.SensorEntity):
         return None
 
 
+_HVAC_ACTION_TO_AC_MODE = {
+    HVACAction.HEATING: pyairtouch.AcMode.HEAT,
+    HVACAction.COOLING: pyairtouch.AcMode.COOL,
+    HVACAction.DRYING: pyairtouch.AcMode.DRY,
+    HVACAction.FAN: pyairtouch.AcMode.FAN,
+}
+
+_HVAC_ACTION_NAMES = {
+    HVACAction.HEATING: "Heating",
+    HVACAction.COOLING: "Cooling",
+    HVACAction.DRYING: "Drying",
+    HVACAction.FAN: "Fan Only",
+}
+
+
+class _RuntimeEntity(entities.AirTouchAcEntity, sensor.SensorEntity):
+    """Base class for sensors reporting the accumulated totals of an AC.
+
+    The totals only change when the activity of the AC changes, which the run
+    time tracker notifies these sensors of.
+    """
+
+    _attr_state_class = sensor.SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        ac_device: devices.AcDevice,
+        airtouch_ac: pyairtouch.AirConditioner,
+        runtime: "RuntimeTracker",
+        id_suffix: str,
+    ) -> None:
+        super().__init__(
+            ac_device=ac_device, airtouch_ac=airtouch_ac, id_suffix=id_suffix
+        )
+        self._runtime = runtime
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._runtime.async_add_listener(
+                self._airtouch_ac.ac_id, self._async_write_if_changed
+            )
+        )
+
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self.native_value,)
+
+
+class AcRunTimeEntity(_RuntimeEntity):
+    """Sensor reporting the time an air-conditioner has spent in an HVAC action."""
+
+    _attr_device_class = sensor.SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 1
+
+    def __init__(
+        self,
+        ac_device: devices.AcDevice,
+        airtouch_ac: pyairtouch.AirConditioner,
+        runtime: "RuntimeTracker",
+        hvac_action: HVACAction,
+    ) -> None:
+        super().__init__(
+            ac_device, airtouch_ac, runtime, id_suffix=f"_{hvac_action}_run_time"
+        )
+        self._hvac_action = hvac_action
+        self._attr_name = f"{_HVAC_ACTION_NAMES[hvac_action]} Run Time"
+
+    @property
+    def native_value(self) -> float:
+        totals = self._runtime.totals(self._airtouch_ac.ac_id)
+        return round(totals.action_seconds.get(self._hvac_action, 0.0) / 3600, 3)
+
+
+class AcFanSpeedRunTimeEntity(_RuntimeEntity):
+    """Sensor reporting the time an air-conditioner has run at a fan speed.
+
+    Disabled by default because there is one for every supported fan speed.
+    """
+
+    _attr_device_class = sensor.SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 1
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        ac_device: devices.AcDevice,
+        airtouch_ac: pyairtouch.AirConditioner,
+        runtime: "RuntimeTracker",
+        fan_speed: pyairtouch.AcFanSpeed,
+    ) -> None:
+        super().__init__(
+            ac_device,
+            airtouch_ac,
+            runtime,
+            id_suffix=f"_{fan_speed.name.lower()}_fan_run_time",
+        )
+        self._fan_speed = fan_speed
+        self._attr_name = f"{fan_speed.name.replace('_', ' ').title()} Fan Run Time"
+
+    @property
+    def native_value(self) -> float:
+        totals = self._runtime.totals(self._airtouch_ac.ac_id)
+        return round(totals.fan_speed_seconds.get(self._fan_speed, 0.0) / 3600, 3)
+
+
+class AcEstimatedEnergyEntity(_RuntimeEntity):
+    """Sensor reporting the estimated energy used by an air-conditioner.
+
+    The estimate is calculated from the run time in each HVAC action and the
+    power configured for it in the options, so it can be added to the Energy
+    dashboard.
+    """
+
+    _attr_name = "Estimated Energy"
+    _attr_device_class = sensor.SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_suggested_display_precision = 2
+
+    def __init__(
+        self,
+        ac_device: devices.AcDevice,
+        airtouch_ac: pyairtouch.AirConditioner,
+        runtime: "RuntimeTracker",
+    ) -> None:
+        super().__init__(ac_device, airtouch_ac, runtime, id_suffix="_estimated_energy")
+
+    @property
+    def native_value(self) -> float:
+        return round(self._runtime.totals(self._airtouch_ac.ac_id).energy, 3)
+
+
 _NO_ERROR = "none"
 
 
@@ -167,6 +385,9 @@ class AcErrorEntity(entities.AirTouchAcEntity, sensor.SensorEntity):
             ac_device=ac_device, airtouch_ac=airtouch_ac, id_suffix="_error"
         )
 
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self._airtouch_ac.error_info,)
+
     @property
     def native_value(self) -> int | str:
         error_info = self._airtouch_ac.error_info
@@ -184,7 +405,9 @@ class AcErrorEntity(entities.AirTouchAcEntity, sensor.SensorEntity):
         return {"error_description": error_description}
 
 
-class ZoneTemperatureEntity(entities.AirTouchZoneEntity, sensor.SensorEntity):
+class ZoneTemperatureEntity(
+    entities.AirTouchZoneEntity, entities.RateLimitedEntity, sensor.SensorEntity
+):
     """Sensor reporting the current temperature of a zone."""
 
     _attr_name = "Temperature"
@@ -192,21 +415,40 @@ class ZoneTemperatureEntity(entities.AirTouchZoneEntity, sensor.SensorEntity):
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_state_class = sensor.SensorStateClass.MEASUREMENT
 
+    _rate_limited_sensor = RateLimitedSensor.TEMPERATURE
+
     def __init__(
-        self, zone_device: devices.ZoneDevice, airtouch_zone: pyairtouch.Zone
+        self,
+        zone_device: devices.ZoneDevice,
+        airtouch_zone: pyairtouch.Zone,
+        *,
+        compile_statistics: bool,
     ) -> None:
         super().__init__(
             zone_device=zone_device,
             airtouch_zone=airtouch_zone,
             id_suffix="_temperature",
         )
+        if not compile_statistics:
+            # Without a state class the recorder doesn't compile statistics
+            # from the sensor. The integration's hourly zone statistics are
+            # written regardless.
+            self._attr_state_class = None
+
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self._airtouch_zone.current_temperature,)
+
+    def _rate_limited_value(self) -> float | None:
+        return self._airtouch_zone.current_temperature
 
     @property
     def native_value(self) -> float | None:
         return self._airtouch_zone.current_temperature
 
 
-class ZonePercentageEntity(entities.AirTouchZoneEntity, sensor.SensorEntity):
+class ZonePercentageEntity(
+    entities.AirTouchZoneEntity, entities.RateLimitedEntity, sensor.SensorEntity
+):
     """Sensor reporting the current open percentage of a zone's damper."""
 
     _attr_name = "Damper Open Percentage"
@@ -214,14 +456,28 @@ class ZonePercentageEntity(entities.AirTouchZoneEntity, sensor.SensorEntity):
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_state_class = sensor.SensorStateClass.MEASUREMENT
 
+    _rate_limited_sensor = RateLimitedSensor.DAMPER
+
     def __init__(
-        self, zone_device: devices.ZoneDevice, airtouch_zone: pyairtouch.Zone
+        self,
+        zone_device: devices.ZoneDevice,
+        airtouch_zone: pyairtouch.Zone,
+        *,
+        compile_statistics: bool,
     ) -> None:
         super().__init__(
             zone_device=zone_device,
             airtouch_zone=airtouch_zone,
             id_suffix="_open_percentage",
         )
+        if not compile_statistics:
+            self._attr_state_class = None
+
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self.native_value,)
+
+    def _rate_limited_value(self) -> float:
+        return self.native_value
 
     @property
     def native_value(self) -> int:
@@ -232,6 +488,71 @@ class ZonePercentageEntity(entities.AirTouchZoneEntity, sensor.SensorEntity):
         return self._airtouch_zone.current_damper_percentage
 
 
+class ZoneTimeToTargetEntity(entities.AirTouchZoneEntity, sensor.SensorEntity):
+    """Sensor reporting the predicted time for a zone to reach its target.
+
+    The prediction uses the heating and cooling rates learned for the zone. It is
+    unknown while the zone or its AC is turned off, while the AC's mode can't
+    move the zone towards its target, or until enough has been learned.
+    """
+
+    _attr_name = "Time To Target Temperature"
+    _attr_device_class = sensor.SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+
+    def __init__(
+        self,
+        zone_device: devices.ZoneDevice,
+        airtouch_ac: pyairtouch.AirConditioner,
+        airtouch_zone: pyairtouch.Zone,
+    ) -> None:
+        super().__init__(
+            zone_device=zone_device,
+            airtouch_zone=airtouch_zone,
+            id_suffix="_time_to_target",
+        )
+        self._airtouch_ac = airtouch_ac
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # The prediction also depends on the power state and mode of the AC.
+        dispatcher = entities.get_dispatcher(self.hass, self._config_entry_id)
+        self.async_on_remove(
+            dispatcher.async_add_ac_listener(
+                self._airtouch_ac.ac_id, self._async_write_if_changed
+            )
+        )
+
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self.native_value,)
+
+    @property
+    def native_value(self) -> int | None:
+        if (
+            self._airtouch_ac.power_state in _AC_OFF_POWER_STATES
+            or self._airtouch_zone.power_state == pyairtouch.ZonePowerState.OFF
+            or self._airtouch_zone.target_temperature is None
+        ):
+            return None
+        time_to_target = entities.get_thermal_model(
+            self.hass, self._config_entry_id
+        ).time_to_temperature(
+            self._airtouch_zone.zone_id, self._airtouch_zone.target_temperature
+        )
+        if time_to_target is None:
+            return None
+        return round(time_to_target.total_seconds() / 60)
+
+
+_AC_OFF_POWER_STATES = frozenset(
+    [
+        pyairtouch.AcPowerState.OFF,
+        pyairtouch.AcPowerState.OFF_AWAY,
+        pyairtouch.AcPowerState.OFF_FORCED,
+    ]
+)
+
+
 class SpillBypassPercentageEntity(entities.AirTouchAcEntity, sensor.SensorEntity):
     """Sensor reporting the current spill/bypass percentage for an AC.
 
@@ -271,21 +592,290 @@ class SpillBypassPercentageEntity(entities.AirTouchAcEntity, sensor.SensorEntity
         #    spill_zone_count * 100
         self._spill_percentage_limit = spill_zone_count * 100
 
+        # The sum of open zone percentages is maintained incrementally as
+        # zones are updated rather than being recalculated for every read.
+        self._airtouch_zones = {zone.zone_id: zone for zone in airtouch_ac.zones}
+        self._zone_percentages: dict[int, int] = {}
+        self._zone_percentage_sum = 0
+        self._reset_zone_percentages()
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        dispatcher = entities.get_dispatcher(self.hass, self._config_entry_id)
+        self.async_on_remove(
+            dispatcher.async_add_zone_observer(
+                self._airtouch_ac.ac_id, self._on_zone_update
+            )
+        )
+        # Zones may have been updated before the observer was added.
+        self._reset_zone_percentages()
+
+    def _reset_zone_percentages(self) -> None:
+        self._zone_percentages = {
+            zone_id: _open_zone_percentage(airtouch_zone)
+            for zone_id, airtouch_zone in self._airtouch_zones.items()
+        }
+        self._zone_percentage_sum = sum(self._zone_percentages.values())
+
+    def _on_zone_update(self, zone_id: int) -> None:
+        airtouch_zone = self._airtouch_zones[zone_id]
+        percentage = _open_zone_percentage(airtouch_zone)
+        self._zone_percentage_sum += percentage - self._zone_percentages[zone_id]
+        self._zone_percentages[zone_id] = percentage
+
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self.native_value,)
+
     @property
     def native_value(self) -> int:
-        if self._airtouch_ac.power_state in [
-            pyairtouch.AcPowerState.OFF,
-            pyairtouch.AcPowerState.OFF_AWAY,
-            pyairtouch.AcPowerState.OFF_FORCED,
-        ]:
+        if self._airtouch_ac.power_state in _AC_OFF_POWER_STATES:
             return 0
 
-        zone_percentage_sum = sum(
-            [
-                z.current_damper_percentage
-                for z in self._airtouch_ac.zones
-                if z.power_state != pyairtouch.ZonePowerState.OFF
-            ]
-        )
         # The spill percentage can never be less than zero
-        return max(0, self._spill_percentage_limit - zone_percentage_sum)
+        return max(0, self._spill_percentage_limit - self._zone_percentage_sum)
+
+
+def _open_zone_percentage(airtouch_zone: pyairtouch.Zone) -> int:
+    if airtouch_zone.power_state == pyairtouch.ZonePowerState.OFF:
+        return 0
+    return airtouch_zone.current_damper_percentage
+
+
+class _ConnectionEntity(entities.AirTouchConsoleEntity, sensor.SensorEntity):
+    """Base class for sensors reporting the health of the AirTouch connection.
+
+    These sensors remain available while the connection is lost.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        airtouch_device: devices.AirTouchDevice,
+        airtouch: pyairtouch.AirTouch,
+        statistics: "ConnectionStatistics",
+        id_suffix: str,
+    ) -> None:
+        super().__init__(
+            airtouch_device=airtouch_device, airtouch=airtouch, id_suffix=id_suffix
+        )
+        self._statistics = statistics
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self._statistics.connected_since, self._statistics.reconnects)
+
+
+class ConnectedSinceEntity(_ConnectionEntity):
+    """Sensor reporting when the connection to the AirTouch was established.
+
+    A timestamp is used rather than an uptime duration so that the state
+    doesn't change while the connection is healthy.
+    """
+
+    _attr_name = "Connected Since"
+    _attr_device_class = sensor.SensorDeviceClass.TIMESTAMP
+
+    def __init__(
+        self,
+        airtouch_device: devices.AirTouchDevice,
+        airtouch: pyairtouch.AirTouch,
+        statistics: "ConnectionStatistics",
+    ) -> None:
+        super().__init__(
+            airtouch_device, airtouch, statistics, id_suffix="_connected_since"
+        )
+
+    @property
+    def native_value(self) -> "datetime.datetime | None":
+        return self._statistics.connected_since
+
+
+class ReconnectsEntity(_ConnectionEntity):
+    """Sensor reporting the number of times the connection has been restored."""
+
+    _attr_name = "Reconnects"
+    _attr_state_class = sensor.SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        airtouch_device: devices.AirTouchDevice,
+        airtouch: pyairtouch.AirTouch,
+        statistics: "ConnectionStatistics",
+    ) -> None:
+        super().__init__(airtouch_device, airtouch, statistics, id_suffix="_reconnects")
+
+    @property
+    def native_value(self) -> int:
+        return self._statistics.reconnects
+
+
+class _InstrumentationEntity(entities.AirTouchConsoleEntity, sensor.SensorEntity):
+    """Base class for sensors reporting the integration's instrumentation.
+
+    Instrumentation changes with every AirTouch update, so these sensors are
+    polled rather than adding a state write to every update.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = True
+
+    def __init__(
+        self,
+        airtouch_device: devices.AirTouchDevice,
+        airtouch: pyairtouch.AirTouch,
+        instrumentation: "Instrumentation",
+        id_suffix: str,
+    ) -> None:
+        super().__init__(
+            airtouch_device=airtouch_device, airtouch=airtouch, id_suffix=id_suffix
+        )
+        self._instrumentation = instrumentation
+        # The snapshot never changes, so AirTouch updates never write the state
+        # and only polling does. Otherwise these sensors would count their own
+        # state writes in the instrumentation.
+        self._last_state_snapshot = self._state_snapshot()
+
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return ()
+
+
+class StatusUpdatesEntity(_InstrumentationEntity):
+    """Sensor reporting the number of updates received from the AirTouch."""
+
+    _attr_name = "Status Updates"
+    _attr_state_class = sensor.SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        airtouch_device: devices.AirTouchDevice,
+        airtouch: pyairtouch.AirTouch,
+        instrumentation: "Instrumentation",
+    ) -> None:
+        super().__init__(
+            airtouch_device, airtouch, instrumentation, id_suffix="_status_updates"
+        )
+
+    @property
+    def native_value(self) -> int:
+        return sum(self._instrumentation.status_updates.values())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return dict(self._instrumentation.status_updates)
+
+
+class StateWritesEntity(_InstrumentationEntity):
+    """Sensor reporting the number of entity state writes caused by updates."""
+
+    _attr_name = "State Writes"
+    _attr_state_class = sensor.SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        airtouch_device: devices.AirTouchDevice,
+        airtouch: pyairtouch.AirTouch,
+        instrumentation: "Instrumentation",
+    ) -> None:
+        super().__init__(
+            airtouch_device, airtouch, instrumentation, id_suffix="_state_writes"
+        )
+
+    @property
+    def native_value(self) -> int:
+        return self._instrumentation.state_writes
+
+
+class _LatencyEntity(_InstrumentationEntity):
+    """Base class for sensors reporting the 95th percentile of a latency."""
+
+    _attr_device_class = sensor.SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = sensor.SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        airtouch_device: devices.AirTouchDevice,
+        airtouch: pyairtouch.AirTouch,
+        instrumentation: "Instrumentation",
+        histogram: "LatencyHistogram",
+        id_suffix: str,
+    ) -> None:
+        super().__init__(airtouch_device, airtouch, instrumentation, id_suffix)
+        self._histogram = histogram
+
+    @property
+    def native_value(self) -> float | None:
+        return self._histogram.percentile(0.95)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            "median": self._histogram.percentile(0.5),
+            "maximum": round(self._histogram.max_ms, 3),
+            "count": self._histogram.count,
+        }
+
+
+class UpdateLatencyEntity(_LatencyEntity):
+    """Sensor reporting the time from an AirTouch update to the state writes."""
+
+    _attr_name = "Update Latency"
+
+    def __init__(
+        self,
+        airtouch_device: devices.AirTouchDevice,
+        airtouch: pyairtouch.AirTouch,
+        instrumentation: "Instrumentation",
+    ) -> None:
+        super().__init__(
+            airtouch_device,
+            airtouch,
+            instrumentation,
+            instrumentation.dispatch_latency,
+            id_suffix="_update_latency",
+        )
+
+
+class CommandLatencyEntity(_LatencyEntity):
+    """Sensor reporting the time taken to send commands to the AirTouch."""
+
+    _attr_name = "Command Latency"
+
+    def __init__(
+        self,
+        airtouch_device: devices.AirTouchDevice,
+        airtouch: pyairtouch.AirTouch,
+        instrumentation: "Instrumentation",
+    ) -> None:
+        super().__init__(
+            airtouch_device,
+            airtouch,
+            instrumentation,
+            instrumentation.command_latency,
+            id_suffix="_command_latency",
+        )
+
+
+class CommandRoundTripEntity(_LatencyEntity):
+    """Sensor reporting the time for the AirTouch to report a command's result."""
+
+    _attr_name = "Command Round-Trip Time"
+
+    def __init__(
+        self,
+        airtouch_device: devices.AirTouchDevice,
+        airtouch: pyairtouch.AirTouch,
+        instrumentation: "Instrumentation",
+    ) -> None:
+        super().__init__(
+            airtouch_device,
+            airtouch,
+            instrumentation,
+            instrumentation.command_round_trip,
+            id_suffix="_command_round_trip",
+        )
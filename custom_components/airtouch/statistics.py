@@ -0,0 +1,231 @@
+"""Hourly long-term statistics for zone temperatures and dampers.
+
+The zone sensors are recorded as a state row for every change, which makes for
+a large recorder database over time. Instead, the integration can be relied on
+for long-term zone history: the current temperature, target temperature and
+damper percentage of each zone are sampled at a fixed interval into ring
+buffers, and at the start of each hour the minimum, maximum and mean of the
+previous hour are written as external statistics. The zone sensor statistics
+option removes the state class of the zone sensors, so that Home Assistant
+doesn't compile the same history from them.
+
+Sampling at a fixed interval makes the mean time weighted. The buffers hold a
+little over an hour of samples, so memory use doesn't depend on how often the
+AirTouch reports changes. Samples for a partial hour are discarded when the
+config entry is unloaded.
+
+The recorder is imported by this module, so it must only be imported when the
+recorder is loaded.
+"""
+
+import array
+import datetime
+import math
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import pyairtouch
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_time_interval,
+    async_track_utc_time_change,
+)
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .devices import AirTouchDevice
+    from .supervisor import ConnectionSupervisor
+
+_SAMPLE_INTERVAL = datetime.timedelta(seconds=30)
+
+# A little more than an hour of samples, so that a late hourly write doesn't
+# lose the first samples of the hour.
+_BUFFER_CAPACITY = 125
+
+
+class SampleBuffer:
+    """A fixed capacity ring buffer of samples backed by an array of doubles."""
+
+    __slots__ = ("_count", "_next", "_samples")
+
+    def __init__(self, capacity: int) -> None:
+        self._samples = array.array("d", bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def append(self, value: float) -> None:
+        """Add a sample, replacing the oldest sample if the buffer is full."""
+        self._samples[self._next] = value
+        self._next = (self._next + 1) % len(self._samples)
+        self._count = min(self._count + 1, len(self._samples))
+
+    def summary(self) -> tuple[float, float, float] | None:
+        """The minimum, maximum and mean of the samples.
+
+        Returns:
+            The summary, or None if the buffer is empty.
+        """
+        if not self._count:
+            return None
+        samples = (
+            self._samples
+            if self._count == len(self._samples)
+            else self._samples[: self._count]
+        )
+        return (min(samples), max(samples), math.fsum(samples) / self._count)
+
+    def clear(self) -> None:
+        """Remove all samples."""
+        self._next = 0
+        self._count = 0
+
+
+@dataclass(frozen=True)
+class _Metric:
+    key: str
+    name: str
+    unit: str
+    value: Callable[[pyairtouch.Zone], float | None]
+
+
+def _damper_percentage(airtouch_zone: pyairtouch.Zone) -> float:
+    # As for the damper sensor, a zone that is turned off is recorded as closed.
+    if airtouch_zone.power_state == pyairtouch.ZonePowerState.OFF:
+        return 0
+    return airtouch_zone.current_damper_percentage
+
+
+_TEMPERATURE_METRICS = (
+    _Metric(
+        key="temperature",
+        name="temperature",
+        unit=UnitOfTemperature.CELSIUS,
+        value=lambda zone: zone.current_temperature,
+    ),
+    _Metric(
+        key="target_temperature",
+        name="target temperature",
+        unit=UnitOfTemperature.CELSIUS,
+        value=lambda zone: zone.target_temperature,
+    ),
+)
+_DAMPER_METRIC = _Metric(
+    key="damper_percentage",
+    name="damper open percentage",
+    unit=PERCENTAGE,
+    value=_damper_percentage,
+)
+
+
+@dataclass(frozen=True)
+class _Series:
+    airtouch_zone: pyairtouch.Zone
+    metric: _Metric
+    metadata: StatisticMetaData
+    samples: SampleBuffer
+
+
+class ZoneStatistics:
+    """Samples the zones of a config entry and writes hourly statistics."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        airtouch: pyairtouch.AirTouch,
+        airtouch_device: "AirTouchDevice",
+        supervisor: "ConnectionSupervisor",
+    ) -> None:
+        self._hass = hass
+        self._supervisor = supervisor
+        self._series: list[_Series] = []
+        for airtouch_ac in airtouch.air_conditioners:
+            ac_device = airtouch_device.ac_device(airtouch_ac)
+            for airtouch_zone in airtouch_ac.zones:
+                zone_device = ac_device.zone_device(airtouch_zone)
+                metrics = [_DAMPER_METRIC]
+                if airtouch_zone.has_temp_sensor:
+                    metrics[:0] = _TEMPERATURE_METRICS
+                self._series.extend(
+                    _Series(
+                        airtouch_zone=airtouch_zone,
+                        metric=metric,
+                        metadata=StatisticMetaData(
+                            has_mean=True,
+                            has_sum=False,
+                            name=f"{airtouch_zone.name} {metric.name}",
+                            source=DOMAIN,
+                            statistic_id=_statistic_id(
+                                zone_device.unique_id, metric.key
+                            ),
+                            unit_of_measurement=metric.unit,
+                        ),
+                        samples=SampleBuffer(_BUFFER_CAPACITY),
+                    )
+                    for metric in metrics
+                )
+
+        self._unsubscribers: list[CALLBACK_TYPE] = []
+
+    @callback
+    def start(self) -> None:
+        """Start sampling the zones."""
+        self._unsubscribers = [
+            async_track_time_interval(self._hass, self._sample, _SAMPLE_INTERVAL),
+            async_track_utc_time_change(
+                self._hass, self._write_statistics, minute=0, second=0
+            ),
+        ]
+
+    @callback
+    def stop(self) -> None:
+        """Stop sampling the zones."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+
+    def as_dict(self) -> dict[str, Any]:
+        """A summary of the current hour's samples for diagnostics."""
+        return {
+            series.metadata["statistic_id"]: series.samples.summary()
+            for series in self._series
+        }
+
+    @callback
+    def _sample(self, _now: datetime.datetime) -> None:
+        # The AirTouch values are stale while the connection is lost.
+        if not self._supervisor.available:
+            return
+        for series in self._series:
+            value = series.metric.value(series.airtouch_zone)
+            if value is not None:
+                series.samples.append(value)
+
+    @callback
+    def _write_statistics(self, now: datetime.datetime) -> None:
+        hour_start = dt_util.as_utc(now).replace(
+            minute=0, second=0, microsecond=0
+        ) - datetime.timedelta(hours=1)
+        for series in self._series:
+            summary = series.samples.summary()
+            series.samples.clear()
+            if summary is None:
+                continue
+            minimum, maximum, mean = summary
+            async_add_external_statistics(
+                self._hass,
+                series.metadata,
+                [StatisticData(start=hour_start, min=minimum, max=maximum, mean=mean)],
+            )
+
+
+def _statistic_id(zone_unique_id: str, metric_key: str) -> str:
+    return f"{DOMAIN}:{slugify(f'{zone_unique_id}_{metric_key}')}"
@@ -0,0 +1,336 @@
+"""Supervision of the connection to an AirTouch console.
+
+pyairtouch reconnects to the console's last known address if the connection is
+closed. However, a half-open connection, for example after a Wi-Fi drop, is
+only detected by its heartbeat, which may take more than five minutes. The
+console may also have a new address after a reboot.
+
+The supervisor tracks the time since the last packet was received on the
+pyairtouch connection. A quiet console doesn't send anything, so once the
+connection has been quiet for a while a status request is sent over it. If
+nothing is received in response, entities are marked unavailable and the
+connection is reset, which reconnects the existing AirTouch objects and
+requests their latest status. pyairtouch keeps retrying the connection, and the
+supervisor checks it with jittered exponential backoff. If the console can't be
+reached at its address after several checks, it is rediscovered and the
+connection is moved to its new address.
+
+The config entry stays loaded throughout, so that commands can be journaled
+while the console is unreachable.
+
+pyairtouch doesn't expose its connection publicly, so the supervisor depends on
+the internals of the exact version that the manifest pins. If they aren't
+found, a warning is logged and the connection is left to pyairtouch alone.
+"""
+
+import logging
+import random
+import time
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, cast
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .discovery import async_probe_airtouch, get_discovery_service
+
+if TYPE_CHECKING:
+    import asyncio
+    import datetime
+
+    import pyairtouch
+    import pyairtouch.comms.socket
+
+_LOGGER = logging.getLogger(__name__)
+
+_STATISTICS_KEY = "connection_statistics"
+
+# Seconds between checks of the time since the last packet.
+_CHECK_INTERVAL = 15.0
+
+# Seconds without a packet after which a status request is sent.
+_PROBE_AFTER = 30.0
+
+# Seconds without a packet after which the connection is considered lost.
+_UNAVAILABLE_AFTER = 60.0
+
+# Exponential backoff between probes while the console is unreachable.
+_BACKOFF_INITIAL = 1.0
+_BACKOFF_MAX = 60.0
+
+# Failed checks after which the console's address is probed, and the console
+# rediscovered if it isn't there.
+_REDISCOVER_AFTER_ATTEMPTS = 6
+
+# Attributes of the pyairtouch socket that the supervisor uses. These aren't
+# part of the public API of pyairtouch and match pyairtouch==3.3.0, so they must
+# be checked again whenever the version pinned in the manifest changes.
+_SOCKET_ATTRIBUTES = (
+    "host",
+    "is_connected",
+    "reset_connection",
+    "subscribe_on_message_received",
+    "unsubcribe_on_message_received",  # Sic
+)
+
+ConnectionListener = Callable[[], None]
+"""A listener that is called when the connection state changes."""
+
+
+@dataclass
+class ConnectionStatistics:
+    """Statistics for the connection of a config entry.
+
+    Kept for the lifetime of Home Assistant so that they survive config entry
+    reloads.
+    """
+
+    connected_since: "datetime.datetime | None" = None
+    """When the current connection was established, or None if disconnected."""
+
+    reconnects: int = 0
+    """Number of times the connection has been re-established after a loss."""
+
+    _lost: bool = False
+
+    def connected(self) -> None:
+        """Record that a connection has been established."""
+        if self._lost:
+            self.reconnects += 1
+            self._lost = False
+        self.connected_since = dt_util.utcnow()
+
+    def lost(self) -> None:
+        """Record that the connection has been lost."""
+        self._lost = True
+        self.connected_since = None
+
+
+class ConnectionSupervisor:
+    """Supervises the connection to an AirTouch for a single config entry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry_id: str,
+        airtouch: "pyairtouch.AirTouch",
+    ) -> None:
+        self._hass = hass
+        self._config_entry_id = config_entry_id
+        self._airtouch = airtouch
+        self._socket = _airtouch_socket(airtouch)
+
+        self.statistics = get_connection_statistics(hass, config_entry_id)
+        self.available = True
+
+        self._listeners: set[ConnectionListener] = set()
+        self._last_packet = 0.0
+        self._failed_checks = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._stopped = False
+
+    def start(self) -> None:
+        """Start supervising the connection."""
+        self.statistics.connected()
+        self._notify_listeners()
+        if not self._socket:
+            return
+        self._last_packet = time.monotonic()
+        self._socket.subscribe_on_message_received(self._async_on_packet)
+        self._schedule_check(_CHECK_INTERVAL)
+
+    def stop(self) -> None:
+        """Stop supervising the connection."""
+        self._stopped = True
+        if self._socket:
+            self._socket.unsubcribe_on_message_received(self._async_on_packet)
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        # A reset or rediscovery in progress would otherwise reopen the
+        # connection after the AirTouch has been shut down.
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    @callback
+    def async_add_listener(self, listener: ConnectionListener) -> CALLBACK_TYPE:
+        """Listen for changes to the connection availability or statistics.
+
+        Returns:
+            A callback to remove the listener.
+        """
+        self._listeners.add(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.discard(listener)
+
+        return remove_listener
+
+    def _schedule_check(self, delay: float) -> None:
+        self._timer = self._hass.loop.call_later(delay, self._check)
+
+    def _create_task(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = self._hass.async_create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _async_on_packet(self, _header: object, _message: object) -> None:
+        self._last_packet = time.monotonic()
+        if self.available or self._stopped:
+            return
+
+        _LOGGER.info("Reconnected to AirTouch at %s", self._airtouch.host)
+        self.available = True
+        self._failed_checks = 0
+        self.statistics.connected()
+        self._notify_listeners()
+        if self._timer:
+            self._timer.cancel()
+        self._schedule_check(_CHECK_INTERVAL)
+
+    @callback
+    def _check(self) -> None:
+        self._timer = None
+        socket = self._socket
+        if not socket:
+            return
+        quiet = time.monotonic() - self._last_packet
+        if quiet < _PROBE_AFTER:
+            self._schedule_check(_CHECK_INTERVAL)
+            return
+
+        if self.available and quiet >= _UNAVAILABLE_AFTER:
+            _LOGGER.warning("Lost connection to AirTouch at %s", self._airtouch.host)
+            self.available = False
+            self.statistics.lost()
+            self._notify_listeners()
+            self._create_task(socket.reset_connection())
+            self._schedule_check(self._backoff_delay())
+            return
+
+        # Any packet in response shows that the connection is alive. While
+        # disconnected, pyairtouch is already retrying the connection and the
+        # request would only fill its send queue.
+        if socket.is_connected:
+            self._create_task(self._async_request_status())
+        if self.available:
+            self._schedule_check(_CHECK_INTERVAL)
+            return
+
+        self._failed_checks += 1
+        if self._failed_checks >= _REDISCOVER_AFTER_ATTEMPTS:
+            self._create_task(self._async_rediscover(socket))
+            return
+        self._schedule_check(self._backoff_delay())
+
+    async def _async_request_status(self) -> None:
+        try:
+            await self._airtouch.check_for_updates()
+        except RuntimeError as ex:
+            # The socket was closed or its send queue is full. The connection
+            # is treated as quiet until it recovers.
+            _LOGGER.debug("Unable to request AirTouch status: %s", ex)
+
+    async def _async_rediscover(
+        self, socket: "pyairtouch.comms.socket.AirTouchSocket[Any]"
+    ) -> None:
+        reachable = await async_probe_airtouch(self._airtouch)
+        if self._stopped:
+            return
+        if not reachable:
+            _LOGGER.info(
+                "AirTouch not found at %s, rediscovering it", self._airtouch.host
+            )
+            await self._async_move_to_discovered_host(socket)
+        if self._stopped or self.available:
+            return
+
+        # The connection is reset and checked again from the start of the
+        # backoff, whether or not the console was found.
+        self._failed_checks = 0
+        await socket.reset_connection()
+        if self._stopped or self.available:
+            return
+        self._schedule_check(self._backoff_delay())
+
+    async def _async_move_to_discovered_host(
+        self, socket: "pyairtouch.comms.socket.AirTouchSocket[Any]"
+    ) -> None:
+        config_entry = self._hass.config_entries.async_get_entry(self._config_entry_id)
+        remote_host = config_entry.data.get(CONF_HOST) if config_entry else None
+        discovery = get_discovery_service(self._hass)
+        try:
+            discovered = await discovery.async_discover(
+                self._airtouch.airtouch_id, remote_host=remote_host
+            )
+        except OSError as ex:
+            _LOGGER.warning("Error searching for AirTouch: %s", ex)
+            return
+        if self._stopped or not discovered or discovered.host == self._airtouch.host:
+            return
+
+        _LOGGER.info(
+            "AirTouch moved from %s to %s", self._airtouch.host, discovered.host
+        )
+        # Only the address is needed. The existing connection is moved there so
+        # that the AirTouch objects, and all subscriptions to them, are kept.
+        socket.host = discovered.host
+        await discovery.async_connected(self._airtouch)
+
+    def _backoff_delay(self) -> float:
+        delay = min(_BACKOFF_MAX, _BACKOFF_INITIAL * 2**self._failed_checks)
+        # Jitter stops the probes of several config entries from aligning.
+        return random.uniform(delay / 2, delay)  # noqa: S311
+
+    def _notify_listeners(self) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener()
+            except Exception:
+                _LOGGER.exception("Exception from connection listener %s", listener)
+
+
+def get_connection_statistics(
+    hass: HomeAssistant, config_entry_id: str
+) -> ConnectionStatistics:
+    """Get the connection statistics for a config entry."""
+    statistics: dict[str, ConnectionStatistics] = hass.data.setdefault(
+        DOMAIN, {}
+    ).setdefault(_STATISTICS_KEY, {})
+    return statistics.setdefault(config_entry_id, ConnectionStatistics())
+
+
+def remove_connection_statistics(hass: HomeAssistant, config_entry_id: str) -> None:
+    """Forget the connection statistics for a removed config entry."""
+    hass.data.get(DOMAIN, {}).get(_STATISTICS_KEY, {}).pop(config_entry_id, None)
+
+
+def _airtouch_socket(
+    airtouch: "pyairtouch.AirTouch",
+) -> "pyairtouch.comms.socket.AirTouchSocket[Any] | None":
+    """Get the socket of an AirTouch, if it has everything the supervisor uses.
+
+    pyairtouch only notifies its public subscribers of state changes, so the
+    socket is needed to see every packet and to reset a stale connection.
+    """
+    socket = getattr(airtouch, "_socket", None)
+    missing = (
+        [name for name in _SOCKET_ATTRIBUTES if not hasattr(socket, name)]
+        if socket is not None
+        else ["_socket"]
+    )
+    if missing:
+        _LOGGER.warning(
+            "Connection supervision is disabled because the installed pyairtouch "
+            "doesn't provide %s. Half-open connections and address changes "
+            "won't be detected",
+            ", ".join(missing),
+        )
+        return None
+    return cast("pyairtouch.comms.socket.AirTouchSocket[Any]", socket)
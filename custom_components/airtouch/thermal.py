@@ -0,0 +1,380 @@
+"""Learned heating and cooling rates for zones.
+
+The rate at which a zone heats or cools is learned from its temperature while
+the AC is actively heating or cooling it. Each time the temperature of such a
+zone changes, the change and the time it took are added to a sliding window of
+increments for the zone and direction. The rate is the weighted least-squares
+fit of temperature change against elapsed time over the window, which is the
+total temperature change divided by the total time. The totals are maintained
+incrementally, so each update takes constant time regardless of the window size.
+
+The rates are used to predict how long a zone will take to reach a temperature,
+both for the time to target sensors and to start scheduled transitions early.
+"""
+
+import collections
+import datetime
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Literal, TypedDict
+
+import pyairtouch
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .dispatcher import UpdateDispatcher
+
+_LOGGER = logging.getLogger(__name__)
+
+_STORAGE_VERSION = 1
+
+# Rates change slowly, so there's no need to save every increment.
+_SAVE_DELAY = 600
+
+# Number of temperature increments kept for each zone and direction.
+_WINDOW_SIZE = 48
+
+# Increments that take longer than this are ignored. The zone has probably
+# stopped being conditioned, or the AirTouch wasn't reporting.
+_MAX_INCREMENT_SECONDS = 1800.0
+
+# Rates are only reported once enough time has been observed.
+_MIN_OBSERVED_SECONDS = 600.0
+
+# Rates slower than this (degrees per hour) can't usefully predict anything.
+_MIN_RATE = 0.1
+
+# Temperatures within this of the target are considered to have reached it.
+_TEMPERATURE_TOLERANCE = 0.05
+
+Direction = Literal["heating", "cooling"]
+
+_AC_ON_POWER_STATES = frozenset(
+    [
+        pyairtouch.AcPowerState.ON,
+        pyairtouch.AcPowerState.ON_AWAY,
+        pyairtouch.AcPowerState.SLEEP,
+    ]
+)
+
+# The directions that each selected AC mode can condition a zone in.
+_MODE_DIRECTIONS: dict[pyairtouch.AcMode, tuple[Direction, ...]] = {
+    pyairtouch.AcMode.AUTO: ("heating", "cooling"),
+    pyairtouch.AcMode.HEAT: ("heating",),
+    pyairtouch.AcMode.COOL: ("cooling",),
+}
+
+
+class IncrementWindow:
+    """A sliding window of temperature increments with running totals."""
+
+    __slots__ = ("_additions", "_increments", "_seconds", "_temperature_change")
+
+    def __init__(self, increments: list[tuple[float, float]] | None = None) -> None:
+        self._increments: collections.deque[tuple[float, float]] = collections.deque(
+            increments or [], maxlen=_WINDOW_SIZE
+        )
+        self._additions = 0
+        self._seconds = 0.0
+        self._temperature_change = 0.0
+        self._recalculate()
+
+    @property
+    def increments(self) -> list[tuple[float, float]]:
+        """The increments in the window as (seconds, temperature change)."""
+        return list(self._increments)
+
+    def add(self, seconds: float, temperature_change: float) -> None:
+        """Add an increment, evicting the oldest if the window is full."""
+        if len(self._increments) == _WINDOW_SIZE:
+            evicted_seconds, evicted_change = self._increments[0]
+            self._seconds -= evicted_seconds
+            self._temperature_change -= evicted_change
+        self._increments.append((seconds, temperature_change))
+        self._seconds += seconds
+        self._temperature_change += temperature_change
+
+        # Rounding errors accumulate in the running totals, so they are
+        # recalculated each time the window has been replaced.
+        self._additions += 1
+        if self._additions == _WINDOW_SIZE:
+            self._recalculate()
+
+    def rate(self) -> float | None:
+        """The rate of temperature change in degrees per hour.
+
+        Returns:
+            The rate, or None if too little time has been observed.
+        """
+        if self._seconds < _MIN_OBSERVED_SECONDS:
+            return None
+        return self._temperature_change / self._seconds * 3600
+
+    def _recalculate(self) -> None:
+        self._additions = 0
+        self._seconds = math.fsum(seconds for seconds, _ in self._increments)
+        self._temperature_change = math.fsum(change for _, change in self._increments)
+
+
+@dataclass
+class _ZoneModel:
+    windows: dict[Direction, IncrementWindow] = field(
+        default_factory=lambda: {
+            "heating": IncrementWindow(),
+            "cooling": IncrementWindow(),
+        }
+    )
+    direction: Direction | None = None
+    """The direction the zone was being conditioned in at the last sample."""
+    sample_time: float = 0.0
+    sample_temperature: float = 0.0
+
+
+class _StoredZoneModel(TypedDict):
+    heating: list[tuple[float, float]]
+    cooling: list[tuple[float, float]]
+
+
+class _StoredThermalModel(TypedDict):
+    zones: dict[str, _StoredZoneModel]
+
+
+class ThermalModel:
+    """Learns the heating and cooling rates of the zones of a config entry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry_id: str,
+        airtouch: pyairtouch.AirTouch,
+        dispatcher: "UpdateDispatcher",
+    ) -> None:
+        self._dispatcher = dispatcher
+        self._store = Store[_StoredThermalModel](
+            hass, _STORAGE_VERSION, _storage_key(config_entry_id)
+        )
+        # Only zones with a temperature sensor report their temperature.
+        self._zones: dict[int, tuple[pyairtouch.AirConditioner, pyairtouch.Zone]] = {
+            airtouch_zone.zone_id: (airtouch_ac, airtouch_zone)
+            for airtouch_ac in airtouch.air_conditioners
+            for airtouch_zone in airtouch_ac.zones
+            if airtouch_zone.has_temp_sensor
+        }
+        self._models = {zone_id: _ZoneModel() for zone_id in self._zones}
+        self._unsubscribers: list[CALLBACK_TYPE] = []
+        self._unsaved = False
+
+    async def async_load(self) -> None:
+        """Load previously learned rates."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        for zone_id, stored_model in stored["zones"].items():
+            model = self._models.get(int(zone_id))
+            if not model:
+                continue
+            try:
+                model.windows = {
+                    "heating": _load_window(stored_model["heating"]),
+                    "cooling": _load_window(stored_model["cooling"]),
+                }
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.warning("Ignoring invalid thermal model for zone %s", zone_id)
+
+    async def async_save(self) -> None:
+        """Save any newly learned rates immediately."""
+        if self._unsaved:
+            await self._store.async_save(self._data_to_save())
+
+    @callback
+    def start(self) -> None:
+        """Start learning from AirTouch updates."""
+        ac_ids = {airtouch_ac.ac_id for airtouch_ac, _ in self._zones.values()}
+        for ac_id in ac_ids:
+            self._unsubscribers.append(
+                self._dispatcher.async_add_zone_observer(ac_id, self._observe_zone)
+            )
+            self._unsubscribers.append(
+                self._dispatcher.async_add_ac_listener(
+                    ac_id, lambda ac_id=ac_id: self._observe_ac(ac_id)
+                )
+            )
+        for zone_id in self._zones:
+            self._observe_zone(zone_id)
+
+    @callback
+    def stop(self) -> None:
+        """Stop learning from AirTouch updates."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+
+    def rate(self, zone_id: int, direction: Direction) -> float | None:
+        """The learned rate that a zone heats or cools in degrees per hour.
+
+        Returns:
+            The rate, or None if not enough has been learned about the zone.
+        """
+        model = self._models.get(zone_id)
+        if not model:
+            return None
+        rate = model.windows[direction].rate()
+        if rate is None:
+            return None
+        # Cooling rates are reported as positive values.
+        rate = rate if direction == "heating" else -rate
+        return rate if rate >= _MIN_RATE else None
+
+    def time_to_temperature(
+        self,
+        zone_id: int,
+        temperature: float,
+        mode: pyairtouch.AcMode | None = None,
+    ) -> datetime.timedelta | None:
+        """Predict how long a zone will take to reach a temperature.
+
+        Args:
+            zone_id: The zone.
+            temperature: The temperature to reach.
+            mode: The AC mode that the zone will be conditioned with. Defaults
+                to the currently selected mode of the AC.
+
+        Returns:
+            The predicted time, or None if it can't be predicted.
+        """
+        zone = self._zones.get(zone_id)
+        if not zone:
+            return None
+        airtouch_ac, airtouch_zone = zone
+        current_temperature = airtouch_zone.current_temperature
+        if current_temperature is None:
+            return None
+
+        difference = temperature - current_temperature
+        if abs(difference) <= _TEMPERATURE_TOLERANCE:
+            return datetime.timedelta()
+        direction: Direction = "heating" if difference > 0 else "cooling"
+        mode = mode or airtouch_ac.selected_mode
+        if mode is not None and direction not in _MODE_DIRECTIONS.get(mode, ()):
+            return None
+
+        rate = self.rate(zone_id, direction)
+        if rate is None:
+            return None
+        return datetime.timedelta(hours=abs(difference) / rate)
+
+    def as_dict(self) -> dict[str, Any]:
+        """A summary of the learned rates for diagnostics."""
+        return {
+            f"zone{zone_id}": {
+                "heating_rate": self.rate(zone_id, "heating"),
+                "cooling_rate": self.rate(zone_id, "cooling"),
+                "increments": {
+                    direction: len(window.increments)
+                    for direction, window in model.windows.items()
+                },
+            }
+            for zone_id, model in self._models.items()
+        }
+
+    @callback
+    def _observe_ac(self, ac_id: int) -> None:
+        for zone_id, (airtouch_ac, _) in self._zones.items():
+            if airtouch_ac.ac_id == ac_id:
+                self._observe_zone(zone_id)
+
+    @callback
+    def _observe_zone(self, zone_id: int) -> None:
+        zone = self._zones.get(zone_id)
+        if not zone:
+            return
+        airtouch_ac, airtouch_zone = zone
+        model = self._models[zone_id]
+        temperature = airtouch_zone.current_temperature
+        direction = _conditioning_direction(airtouch_ac, airtouch_zone)
+        now = time.monotonic()
+
+        if direction is None or temperature is None:
+            model.direction = None
+            return
+        if direction != model.direction:
+            # Start a new run of increments.
+            model.direction = direction
+            model.sample_time = now
+            model.sample_temperature = temperature
+            return
+        if temperature == model.sample_temperature:
+            # The increment continues until the temperature changes.
+            return
+
+        seconds = now - model.sample_time
+        if seconds <= _MAX_INCREMENT_SECONDS:
+            model.windows[direction].add(
+                seconds, temperature - model.sample_temperature
+            )
+            self._unsaved = True
+            self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+        model.sample_time = now
+        model.sample_temperature = temperature
+
+    @callback
+    def _data_to_save(self) -> _StoredThermalModel:
+        self._unsaved = False
+        return _StoredThermalModel(
+            zones={
+                str(zone_id): _StoredZoneModel(
+                    heating=model.windows["heating"].increments,
+                    cooling=model.windows["cooling"].increments,
+                )
+                for zone_id, model in self._models.items()
+            }
+        )
+
+
+async def async_remove_thermal_model(hass: HomeAssistant, config_entry_id: str) -> None:
+    """Remove the learned rates of a config entry that has been removed."""
+    await Store[_StoredThermalModel](
+        hass, _STORAGE_VERSION, _storage_key(config_entry_id)
+    ).async_remove()
+
+
+def _storage_key(config_entry_id: str) -> str:
+    return f"{DOMAIN}.thermal.{config_entry_id}"
+
+
+def _load_window(stored: list[tuple[float, float]]) -> IncrementWindow:
+    return IncrementWindow(
+        [(float(seconds), float(change)) for seconds, change in stored]
+    )
+
+
+def _conditioning_direction(
+    airtouch_ac: pyairtouch.AirConditioner, airtouch_zone: pyairtouch.Zone
+) -> Direction | None:
+    """The direction that a zone is actively being conditioned in, if any.
+
+    A zone that has reached its target temperature is no longer considered to be
+    conditioned, because the AirTouch throttles its damper to hold the
+    temperature.
+    """
+    if (
+        airtouch_ac.power_state not in _AC_ON_POWER_STATES
+        or airtouch_zone.power_state == pyairtouch.ZonePowerState.OFF
+        or not airtouch_zone.current_damper_percentage
+    ):
+        return None
+
+    current = airtouch_zone.current_temperature
+    target = airtouch_zone.target_temperature
+    if current is None or target is None:
+        return None
+    if airtouch_ac.active_mode == pyairtouch.AcMode.HEAT and current < target:
+        return "heating"
+    if airtouch_ac.active_mode == pyairtouch.AcMode.COOL and current > target:
+        return "cooling"
+    return None
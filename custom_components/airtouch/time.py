@@ -6,6 +6,7 @@ Time entities are used to represent:
 
 import datetime
 import logging
+from typing import TYPE_CHECKING
 
 import pyairtouch
 import voluptuous
@@ -18,6 +19,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import devices, entities
 from .const import DOMAIN
 
+if TYPE_CHECKING:
+    from .models import AirTouchData
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -27,11 +31,12 @@ async def async_setup_entry(
     async_add_devices: AddEntitiesCallback,
 ) -> None:
     """Set up the AirTouch binary sensors."""
-    airtouch: pyairtouch.AirTouch = hass.data[DOMAIN][config_entry.entry_id]
+    data: AirTouchData = hass.data[DOMAIN][config_entry.entry_id]
+    airtouch = data.airtouch
 
     discovered_entities: list[time.TimeEntity] = []
 
-    airtouch_device = devices.AirTouchDevice(hass, config_entry.entry_id, airtouch)
+    airtouch_device = data.airtouch_device
     for airtouch_ac in airtouch.air_conditioners:
         ac_device = airtouch_device.ac_device(airtouch_ac)
 
@@ -84,6 +89,9 @@ class AcQuickTimerEntity(entities.AirTouchAcEntity, time.TimeEntity):
         self._timer_type = timer_type
         self._attr_name = _TIMER_TYPE_NAME_MAPPING[timer_type]
 
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (self._airtouch_ac.next_quick_timer(self._timer_type),)
+
     @property
     def native_value(self) -> datetime.time | None:
         return self._airtouch_ac.next_quick_timer(self._timer_type)
@@ -5,7 +5,7 @@ console.
 """
 
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import pyairtouch
 from homeassistant.components import update
@@ -16,6 +16,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import devices, entities
 from .const import DOMAIN
 
+if TYPE_CHECKING:
+    from .models import AirTouchData
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -25,11 +28,12 @@ async def async_setup_entry(
     async_add_devices: AddEntitiesCallback,
 ) -> None:
     """Set up the AirTouch update entities."""
-    airtouch: pyairtouch.AirTouch = hass.data[DOMAIN][config_entry.entry_id]
+    data: AirTouchData = hass.data[DOMAIN][config_entry.entry_id]
+    airtouch = data.airtouch
 
     discovered_entities: list[update.UpdateEntity] = []
 
-    airtouch_device = devices.AirTouchDevice(hass, config_entry.entry_id, airtouch)
+    airtouch_device = data.airtouch_device
     airtouch_update_entity = AirtouchUpdateEntity(
         airtouch_device=airtouch_device,
         airtouch=airtouch,
@@ -52,6 +56,9 @@ class AirtouchUpdateEntity(entities.AirTouchConsoleEntity, update.UpdateEntity):
     ) -> None:
         super().__init__(airtouch_device=airtouch_device, airtouch=airtouch)
 
+    def _state_snapshot(self) -> entities.StateSnapshot:
+        return (tuple(self._airtouch.console_versions), self._airtouch.update_available)
+
     @property
     def installed_version(self) -> Optional[str]:
         if self._airtouch.console_versions:
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""Benchmarks the AirTouch integration against a simulated console.
+
+Runs a simulated AirTouch console (see fake_console.py) and an in-process Home
+Assistant instance with the integration loaded from custom_components, then
+measures:
+
+- Setup time: Time taken to set up the config entry, from connecting to the
+  console until all entities have been added.
+- Update fan-out: Latency and CPU time for a single zone status message, in
+  which every zone has changed, to be written to all affected entities.
+- Service-call latency: Time taken for climate.set_temperature and
+  airtouch.set_zones calls to return, and for the change to reach the console.
+- State write: CPU time to write the state of the AC and zone climate
+  entities, including rendering the state and attributes.
+
+The console listens on the AirTouch model's TCP port on localhost, so that port
+must be free. The console address is pre-seeded in the integration's discovery
+cache because discovery cannot be run against a console on the same host.
+
+Example:
+    scripts/benchmark.py --model 5 --acs 2 --zones 16 --packets 200
+"""
+
+import argparse
+import asyncio
+import importlib
+import inspect
+import json
+import logging
+import pathlib
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+from fake_console import MODELS, FakeConsole, create_console
+from homeassistant import bootstrap, config_entries, loader, runner
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+_LOGGER = logging.getLogger(__name__)
+
+_DOMAIN = "airtouch"
+_INTEGRATION_PATH = (
+    pathlib.Path(__file__).parent.parent / "custom_components" / _DOMAIN
+).resolve()
+
+# Must match the storage used by discovery.DiscoveryCache.
+_DISCOVERY_STORAGE_KEY = f"{_DOMAIN}.discovery"
+_DISCOVERY_STORAGE_VERSION = 1
+
+# Time without any state writes after which an update is considered complete.
+_SETTLE_TIME = 0.05
+_UPDATE_TIMEOUT = 5.0
+
+# Number of state writes of each entity that are timed together.
+_WRITE_BATCH = 1000
+
+_CONFIGURATION_YAML = """\
+homeassistant:
+  name: AirTouch Benchmark
+  latitude: 0
+  longitude: 0
+  elevation: 0
+  unit_system: metric
+  time_zone: UTC
+"""
+
+
+@dataclass
+class Samples:
+    """A named series of measurements."""
+
+    name: str
+    unit: str
+    values: list[float] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """Format a one line summary of the measurements."""
+        if not self.values:
+            return f"{self.name:<36} no samples"
+        values = sorted(self.values)
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        return (
+            f"{self.name:<36} n={len(values):<5} "
+            f"median={statistics.median(values):9.3f} "
+            f"p95={p95:9.3f} max={values[-1]:9.3f} {self.unit}"
+        )
+
+
+class _StateWriteMonitor:
+    """Tracks state writes made by the integration's entities."""
+
+    def __init__(self, hass: HomeAssistant, entity_ids: set[str]) -> None:
+        self._hass = hass
+        self._entity_ids = entity_ids
+        self.writes = 0
+        self.last_write = 0.0
+        self._written = asyncio.Event()
+        self._unsubscribe = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, self._on_state_changed
+        )
+
+    def stop(self) -> None:
+        self._unsubscribe()
+
+    def reset(self) -> None:
+        self.writes = 0
+        self._written.clear()
+
+    async def wait_settled(self) -> None:
+        """Wait until the first write and then until writes have stopped."""
+        await asyncio.wait_for(self._written.wait(), _UPDATE_TIMEOUT)
+        while True:
+            self._written.clear()
+            try:
+                await asyncio.wait_for(self._written.wait(), _SETTLE_TIME)
+            except TimeoutError:
+                return
+
+    @callback
+    def _on_state_changed(self, event: Event) -> None:
+        if event.data["entity_id"] in self._entity_ids:
+            self.writes += 1
+            self.last_write = time.perf_counter()
+            self._written.set()
+
+
+async def _async_start_hass(
+    config_dir: pathlib.Path, console: FakeConsole
+) -> HomeAssistant:
+    (config_dir / "configuration.yaml").write_text(_CONFIGURATION_YAML)
+    (config_dir / "custom_components").mkdir()
+    (config_dir / "custom_components" / _DOMAIN).symlink_to(_INTEGRATION_PATH)
+
+    storage_dir = config_dir / ".storage"
+    storage_dir.mkdir()
+    (storage_dir / _DISCOVERY_STORAGE_KEY).write_text(
+        json.dumps(
+            {
+                "version": _DISCOVERY_STORAGE_VERSION,
+                "minor_version": 1,
+                "key": _DISCOVERY_STORAGE_KEY,
+                "data": {
+                    console.airtouch_id: {
+                        "host": "127.0.0.1",
+                        "model": console.model.value,
+                        "name": console.name,
+                        "serial": console.serial,
+                        "air_conditioners": [
+                            {
+                                "ac_id": ac.ac_id,
+                                "name": ac.name,
+                                "zones": [
+                                    {"zone_id": zone.zone_id, "name": zone.name}
+                                    for zone in ac.zones
+                                ],
+                            }
+                            for ac in console.acs
+                        ],
+                    }
+                },
+            }
+        )
+    )
+
+    hass = await bootstrap.async_setup_hass(
+        runner.RuntimeConfig(config_dir=str(config_dir), skip_pip=True)
+    )
+    if hass is None:
+        raise RuntimeError("Home Assistant failed to start")
+    return hass
+
+
+async def _async_create_config_entry(
+    hass: HomeAssistant, console: FakeConsole
+) -> config_entries.ConfigEntry:
+    integration = await loader.async_get_integration(hass, _DOMAIN)
+    const = importlib.import_module(f"{integration.pkg_path}.const")
+
+    kwargs: dict[str, Any] = {
+        "version": const.CONF_VERSION,
+        "minor_version": const.CONF_MINOR_VERSION,
+        "domain": _DOMAIN,
+        "title": console.name,
+        "data": {
+            "host": "127.0.0.1",
+            const.CONF_SPILL_BYPASS: const.SpillBypass.SPILL.value,
+            const.CONF_SPILL_ZONES: [],
+        },
+        "options": {},
+        "source": config_entries.SOURCE_USER,
+        "unique_id": console.airtouch_id,
+    }
+    # Compatibility: Later versions of Home Assistant have additional required
+    # arguments.
+    parameters = inspect.signature(config_entries.ConfigEntry).parameters
+    compat_kwargs: dict[str, Any] = {
+        "discovery_keys": MappingProxyType({}),
+        "subentries_data": None,
+    }
+    kwargs.update({k: v for k, v in compat_kwargs.items() if k in parameters})
+    return config_entries.ConfigEntry(**kwargs)
+
+
+async def _async_timed(coro: Awaitable[Any]) -> float:
+    start = time.perf_counter()
+    await coro
+    return (time.perf_counter() - start) * 1000
+
+
+async def _async_benchmark_setup(
+    hass: HomeAssistant, console: FakeConsole, iterations: int
+) -> tuple[config_entries.ConfigEntry, list[Samples]]:
+    first_setup = Samples("setup: first", "ms")
+    setup = Samples("setup: reload", "ms")
+
+    entry = await _async_create_config_entry(hass, console)
+
+    async def add_entry() -> None:
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+
+    first_setup.values.append(await _async_timed(add_entry()))
+    if entry.state != config_entries.ConfigEntryState.LOADED:
+        raise RuntimeError(f"Config entry failed to load: {entry.state}")
+
+    for _ in range(iterations):
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+        async def setup_entry() -> None:
+            await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+
+        setup.values.append(await _async_timed(setup_entry()))
+
+    return entry, [first_setup, setup]
+
+
+async def _async_benchmark_fan_out(
+    console: FakeConsole, monitor: _StateWriteMonitor, packets: int
+) -> list[Samples]:
+    latency = Samples("fan-out: latency per packet", "ms")
+    cpu = Samples("fan-out: CPU time per packet", "ms")
+    writes = Samples("fan-out: state writes per packet", "writes")
+
+    for _ in range(packets):
+        monitor.reset()
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        await console.send_status_burst(1)
+        # Exclude the cost of encoding the simulated message.
+        console_cpu = time.process_time() - cpu_start
+
+        await monitor.wait_settled()
+        latency.values.append((monitor.last_write - start) * 1000)
+        cpu.values.append((time.process_time() - cpu_start - console_cpu) * 1000)
+        writes.values.append(monitor.writes)
+
+    return [latency, cpu, writes]
+
+
+async def _async_benchmark_services(
+    hass: HomeAssistant,
+    console: FakeConsole,
+    ac_entity_id: str,
+    zone_entity_id: str,
+    iterations: int,
+) -> list[Samples]:
+    call = Samples("set_temperature: call", "ms")
+    round_trip = Samples("set_temperature: until console", "ms")
+    bulk_call = Samples("set_zones: call", "ms")
+    bulk_round_trip = Samples("set_zones: until console", "ms")
+
+    zone = console.acs[0].zones[0]
+    zones = console.acs[0].zones
+    for iteration in range(iterations):
+        target = 21.0 if iteration % 2 else 23.0
+        start = time.perf_counter()
+        await hass.services.async_call(
+            "climate",
+            "set_temperature",
+            {"entity_id": zone_entity_id, "temperature": target},
+            blocking=True,
+        )
+        call.values.append((time.perf_counter() - start) * 1000)
+        async with asyncio.timeout(_UPDATE_TIMEOUT):
+            await console.wait_for_control(lambda: zone.set_point == target)  # noqa: B023
+        round_trip.values.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await hass.services.async_call(
+            _DOMAIN,
+            "set_zones",
+            {
+                "entity_id": ac_entity_id,
+                "zones": {z.name: {"temperature": target} for z in zones},
+            },
+            blocking=True,
+        )
+        bulk_call.values.append((time.perf_counter() - start) * 1000)
+        async with asyncio.timeout(_UPDATE_TIMEOUT):
+            await console.wait_for_control(
+                lambda: all(z.set_point == target for z in zones)  # noqa: B023
+            )
+        bulk_round_trip.values.append((time.perf_counter() - start) * 1000)
+
+    return [call, round_trip, bulk_call, bulk_round_trip]
+
+
+def _benchmark_state_writes(
+    hass: HomeAssistant, entity_ids: set[str], iterations: int
+) -> list[Samples]:
+    ac_writes = Samples("state write: AC climate", "us")
+    zone_writes = Samples("state write: zone climate", "us")
+
+    component = hass.data["climate"]
+    for entity_id in sorted(entity_ids):
+        entity = component.get_entity(entity_id)
+        if entity is None:
+            continue
+        samples = ac_writes if entity.device_class == "ac" else zone_writes
+        for _ in range(iterations):
+            start = time.process_time()
+            for _ in range(_WRITE_BATCH):
+                # The state is unchanged so no state changed events are fired.
+                entity.async_write_ha_state()
+            elapsed = time.process_time() - start
+            samples.values.append(elapsed / _WRITE_BATCH * 1_000_000)
+
+    return [ac_writes, zone_writes]
+
+
+async def _async_run(args: argparse.Namespace) -> list[Samples]:
+    console = create_console(MODELS[args.model], args.acs, args.zones)
+    await console.start("127.0.0.1")
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _async_start_hass(pathlib.Path(config_dir), console)
+        try:
+            entry, results = await _async_benchmark_setup(
+                hass, console, args.iterations
+            )
+
+            entity_registry = er.async_get(hass)
+            entity_ids = {
+                entity.entity_id
+                for entity in er.async_entries_for_config_entry(
+                    entity_registry, entry.entry_id
+                )
+            }
+            ac_entity_id = entity_registry.async_get_entity_id(
+                "climate", _DOMAIN, f"{console.airtouch_id}_ac0"
+            )
+            zone_entity_id = entity_registry.async_get_entity_id(
+                "climate", _DOMAIN, f"{console.airtouch_id}_ac0_zone0"
+            )
+            if not ac_entity_id or not zone_entity_id:
+                raise RuntimeError("Climate entities not found")
+            print(  # noqa: T201
+                f"{console.model.value}: {args.acs} AC(s) x {args.zones} zone(s), "
+                f"{len(entity_ids)} entities"
+            )
+
+            monitor = _StateWriteMonitor(hass, entity_ids)
+            results += await _async_benchmark_fan_out(console, monitor, args.packets)
+            monitor.stop()
+
+            results += await _async_benchmark_services(
+                hass, console, ac_entity_id, zone_entity_id, args.iterations
+            )
+
+            climate_entity_ids = {
+                entity_id
+                for entity_id in entity_ids
+                if entity_id.startswith("climate.")
+            }
+            results += _benchmark_state_writes(
+                hass, climate_entity_ids, args.iterations
+            )
+        finally:
+            await hass.async_stop()
+            await console.stop()
+
+    return results
+
+
+def main() -> None:
+    """Run the benchmarks and print a summary."""
+    parser = argparse.ArgumentParser("benchmark.py")
+    parser.add_argument("--model", choices=sorted(MODELS), default="5")
+    parser.add_argument("--acs", type=int, default=1, help="Number of ACs")
+    parser.add_argument("--zones", type=int, default=8, help="Number of zones per AC")
+    parser.add_argument(
+        "--packets", type=int, default=100, help="Status messages for fan-out"
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=10,
+        help="Setup, service and state write iterations",
+    )
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+    results = asyncio.run(_async_run(args))
+    for samples in results:
+        print(samples.summary())  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,916 @@
+#!/usr/bin/env python3
+"""A simulated AirTouch console.
+
+Speaks the AirTouch 4 or AirTouch 5 protocol over TCP so that the integration
+can be driven end to end without real hardware. Messages are encoded and decoded
+using the pyairtouch message registries, so the simulated console is always
+consistent with the protocol implementation used by the integration.
+
+The console answers the requests made by pyairtouch during initialisation,
+applies AC and zone control messages to its simulated state, and can be scripted
+to emit bursts of status messages for any number of ACs and zones.
+
+An optional UDP responder answers discovery requests. pyairtouch binds the
+discovery port locally, so discovery only works when the simulated console is
+run on a different host to Home Assistant.
+
+Example:
+    scripts/fake_console.py --model 5 --acs 2 --zones 8 --burst-interval 5
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import random
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import pyairtouch
+import pyairtouch.at4.comms.discovery
+import pyairtouch.at4.comms.hdr
+import pyairtouch.at4.comms.registry
+import pyairtouch.at5.comms.discovery
+import pyairtouch.at5.comms.hdr
+import pyairtouch.at5.comms.registry
+from pyairtouch import comms
+from pyairtouch.at4.comms import x1F_ext as at4_ext
+from pyairtouch.at4.comms import x1FFF11_ac_ability as at4_ability
+from pyairtouch.at4.comms import x1FFF12_group_names as at4_names
+from pyairtouch.at4.comms import x1FFF30_console_ver as at4_version
+from pyairtouch.at4.comms import x2A_group_ctrl as at4_group_ctrl
+from pyairtouch.at4.comms import x2B_group_status as at4_group_status
+from pyairtouch.at4.comms import x2C_ac_ctrl as at4_ac_ctrl
+from pyairtouch.at4.comms import x2D_ac_status as at4_ac_status
+from pyairtouch.at4.comms import x37_ac_timer_status as at4_timer_status
+from pyairtouch.at5.comms import x1F_ext as at5_ext
+from pyairtouch.at5.comms import x1FFF11_ac_ability as at5_ability
+from pyairtouch.at5.comms import x1FFF13_zone_names as at5_names
+from pyairtouch.at5.comms import x1FFF30_console_ver as at5_version
+from pyairtouch.at5.comms import xC0_ctrl_status as at5_ctrl_status
+from pyairtouch.at5.comms import xC020_zone_ctrl as at5_zone_ctrl
+from pyairtouch.at5.comms import xC021_zone_status as at5_zone_status
+from pyairtouch.at5.comms import xC022_ac_ctrl as at5_ac_ctrl
+from pyairtouch.at5.comms import xC023_ac_status as at5_ac_status
+from pyairtouch.at5.comms import xC033_ac_timer_status as at5_timer_status
+
+_LOGGER = logging.getLogger(__name__)
+
+# The modes and fan speeds supported by every simulated AC.
+# Names are shared by the AirTouch 4 and AirTouch 5 protocol enums.
+_SUPPORTED_MODES = ("AUTO", "HEAT", "DRY", "FAN", "COOL")
+_SUPPORTED_FAN_SPEEDS = ("AUTO", "LOW", "MEDIUM", "HIGH")
+
+_MIN_SET_POINT = 16
+_MAX_SET_POINT = 30
+
+_CONSOLE_VERSION = "1.2.3"
+
+# Temperature change applied to each zone in a status burst.
+_BURST_TEMPERATURE_STEP = 0.1
+
+
+@dataclass
+class ZoneState:
+    """Simulated state of a single zone."""
+
+    zone_id: int
+    name: str
+    power_on: bool = True
+    has_sensor: bool = True
+    temperature: float = 22.0
+    set_point: float = 22.0
+    damper_percentage: int = 50
+    temperature_control: bool = True
+    spill_active: bool = False
+
+
+@dataclass
+class AcState:
+    """Simulated state of a single AC."""
+
+    ac_id: int
+    name: str
+    zones: list[ZoneState]
+    power_on: bool = False
+    mode: str = "COOL"
+    fan_speed: str = "AUTO"
+    set_point: float = 22.0
+    temperature: float = 24.0
+    spill_active: bool = False
+
+
+@dataclass
+class _Connection:
+    writer: asyncio.StreamWriter
+    task: "asyncio.Task[None] | None" = None
+
+
+@dataclass
+class ConsoleStatistics:
+    """Counters of the traffic handled by the simulated console."""
+
+    messages_received: int = 0
+    messages_sent: int = 0
+    control_messages: int = 0
+    bytes_sent: int = 0
+    received_by_type: dict[str, int] = field(default_factory=dict)
+
+
+class FakeConsole:
+    """Base class for a simulated AirTouch console.
+
+    Subclasses implement the model specific messages.
+    """
+
+    model: pyairtouch.AirTouchModel
+    port: int
+
+    def __init__(
+        self,
+        ac_count: int,
+        zones_per_ac: int,
+        *,
+        airtouch_id: str = "12345678",
+        serial: str = "FAKE0001",
+        name: str = "Fake AirTouch",
+    ) -> None:
+        self.airtouch_id = airtouch_id
+        self.serial = serial
+        self.name = name
+
+        zone_id = 0
+        self.acs: list[AcState] = []
+        for ac_id in range(ac_count):
+            zones = []
+            for _ in range(zones_per_ac):
+                zones.append(ZoneState(zone_id=zone_id, name=f"Zone {zone_id}"))
+                zone_id += 1
+            self.acs.append(AcState(ac_id=ac_id, name=f"AC {ac_id}", zones=zones))
+
+        self.statistics = ConsoleStatistics()
+
+        self._registry: comms.MessageRegistry[Any] = self._create_registry()
+        self._packet_id = 0
+        self._server: asyncio.Server | None = None
+        self._connections: list[_Connection] = []
+        self._discovery_transport: asyncio.DatagramTransport | None = None
+        self._control_event = asyncio.Event()
+
+    @property
+    def zones(self) -> list[ZoneState]:
+        """All zones across all ACs in zone ID order."""
+        return [zone for ac in self.acs for zone in ac.zones]
+
+    @property
+    def connection_count(self) -> int:
+        """The number of currently connected clients."""
+        return len(self._connections)
+
+    async def start(self, host: str = "127.0.0.1", port: int | None = None) -> None:
+        """Start listening for client connections."""
+        self._server = await asyncio.start_server(
+            self._handle_connection, host, port or self.port
+        )
+        _LOGGER.info(
+            "%s console listening on %s:%d", self.model.value, host, port or self.port
+        )
+
+    async def start_discovery(self, host: str, advertised_host: str) -> None:
+        """Start answering discovery requests.
+
+        Args:
+            host: The local address to bind the discovery responder to.
+            advertised_host: The address clients should connect to.
+        """
+        loop = asyncio.get_running_loop()
+        response = self._discovery_response(advertised_host)
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DiscoveryProtocol(self._discovery_request(), response),
+            local_addr=(host, self._discovery_port()),
+            allow_broadcast=True,
+        )
+        self._discovery_transport = transport
+
+    async def stop(self) -> None:
+        """Disconnect all clients and stop listening."""
+        if self._discovery_transport:
+            self._discovery_transport.close()
+            self._discovery_transport = None
+        if self._server:
+            self._server.close()
+        for connection in list(self._connections):
+            connection.writer.close()
+            if connection.task:
+                with contextlib.suppress(Exception):
+                    await connection.task
+        if self._server:
+            await self._server.wait_closed()
+            self._server = None
+
+    def disconnect_clients(self) -> None:
+        """Drop all client connections to simulate a network outage."""
+        for connection in list(self._connections):
+            connection.writer.close()
+
+    def send_zone_status(self, zones: Sequence[ZoneState] | None = None) -> None:
+        """Send a zone status message to all clients."""
+        self._broadcast(self._zone_status_message(zones or self.zones))
+
+    def send_ac_status(self, acs: Sequence[AcState] | None = None) -> None:
+        """Send an AC status message to all clients."""
+        self._broadcast(self._ac_status_message(acs or self.acs))
+
+    async def send_status_burst(
+        self, packets: int, interval: float = 0.0, *, include_ac: bool = False
+    ) -> None:
+        """Send a burst of status messages in which every zone has changed.
+
+        Each packet is a single zone status message covering every zone, which
+        mirrors how the console reports changes to many zones at once.
+
+        Args:
+            packets: The number of status messages to send.
+            interval: Delay in seconds between each message.
+            include_ac: Whether to follow each zone status message with an AC
+                status message in which every AC temperature has changed.
+        """
+        for packet in range(packets):
+            step = (
+                _BURST_TEMPERATURE_STEP if packet % 2 == 0 else -_BURST_TEMPERATURE_STEP
+            )
+            for zone in self.zones:
+                zone.temperature = round(zone.temperature + step, 1)
+            self.send_zone_status()
+            if include_ac:
+                for ac in self.acs:
+                    ac.temperature = round(ac.temperature + step, 1)
+                self.send_ac_status()
+            await self._drain()
+            if interval:
+                await asyncio.sleep(interval)
+
+    async def wait_for_control(self, predicate: Callable[[], bool]) -> None:
+        """Wait until control messages have put the console into a given state."""
+        while not predicate():
+            self._control_event.clear()
+            await self._control_event.wait()
+
+    def randomise(self, rng: random.Random) -> None:
+        """Randomise the simulated temperatures and damper positions."""
+        for zone in self.zones:
+            zone.temperature = round(rng.uniform(18, 28), 1)
+            zone.damper_percentage = rng.randrange(0, 101, 5)
+        for ac in self.acs:
+            ac.temperature = round(rng.uniform(18, 28), 1)
+
+    def _create_registry(self) -> "comms.MessageRegistry[Any]":
+        raise NotImplementedError
+
+    def _create_header(
+        self, message: comms.Message, message_length: int, packet_id: int
+    ) -> Any:  # noqa: ANN401
+        raise NotImplementedError
+
+    def _discovery_port(self) -> int:
+        raise NotImplementedError
+
+    def _discovery_request(self) -> bytes:
+        raise NotImplementedError
+
+    def _discovery_response(self, host: str) -> bytes:
+        raise NotImplementedError
+
+    def _zone_status_message(self, zones: Sequence[ZoneState]) -> comms.Message:
+        raise NotImplementedError
+
+    def _ac_status_message(self, acs: Sequence[AcState]) -> comms.Message:
+        raise NotImplementedError
+
+    def _handle_message(self, message: comms.Message) -> list[comms.Message]:
+        """Process a received message.
+
+        Returns:
+            The messages to send in response.
+        """
+        raise NotImplementedError
+
+    def _control_received(self) -> None:
+        self.statistics.control_messages += 1
+        self._control_event.set()
+
+    def _next_packet_id(self) -> int:
+        packet_id = self._packet_id
+        self._packet_id = (self._packet_id + 1) % 256
+        return packet_id
+
+    def _encode(self, message: comms.Message) -> bytes:
+        encoder = self._registry.get_encoder(message.message_id)
+        # Some pyairtouch encoders only implement size() correctly for the
+        # request messages that a client sends, so the header is sized from the
+        # encoded message instead.
+        packet_id = self._next_packet_id()
+        message_bytes = encoder.encode(
+            self._create_header(message, 0, packet_id), message
+        )
+        header = self._create_header(message, len(message_bytes), packet_id)
+        encoded_header = self._registry.header_encoder.encode(header)
+        crc = self._registry.checksum_calculator.calculate(
+            encoded_header.checksum_data + message_bytes
+        )
+        return encoded_header.header_bytes + message_bytes + crc
+
+    def _broadcast(self, message: comms.Message) -> None:
+        data = self._encode(message)
+        for connection in self._connections:
+            self._write(connection.writer, data)
+
+    def _write(self, writer: asyncio.StreamWriter, data: bytes) -> None:
+        if writer.is_closing():
+            return
+        writer.write(data)
+        self.statistics.messages_sent += 1
+        self.statistics.bytes_sent += len(data)
+
+    async def _drain(self) -> None:
+        for connection in list(self._connections):
+            with contextlib.suppress(ConnectionError):
+                await connection.writer.drain()
+
+    async def _read_message(self, reader: asyncio.StreamReader) -> comms.Message | None:
+        header_decoder = self._registry.header_decoder
+        checksum_calculator = self._registry.checksum_calculator
+
+        header_buffer = await reader.readexactly(header_decoder.header_length)
+        header_result = header_decoder.decode(header_buffer)
+        header_result.assert_complete()
+        header = header_result.header
+
+        message_buffer = await reader.readexactly(header.message_length)
+        crc = await reader.readexactly(checksum_calculator.checksum_length)
+        if not checksum_calculator.validate(
+            header_result.checksum_data + message_buffer, crc
+        ):
+            _LOGGER.warning("Discarding message with invalid CRC: %s", header)
+            return None
+
+        decoder = self._registry.get_decoder(header.message_id)
+        message_result = decoder.decode(message_buffer, header)
+        message_result.assert_complete()
+        return message_result.message
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        connection = _Connection(writer=writer, task=asyncio.current_task())
+        self._connections.append(connection)
+        _LOGGER.info("Client connected: %s", writer.get_extra_info("peername"))
+        try:
+            while True:
+                message = await self._read_message(reader)
+                if message is None:
+                    continue
+                self._record_received(message)
+                for response in self._handle_message(message):
+                    self._write(writer, self._encode(response))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except comms.DecodeError:
+            _LOGGER.exception("Error decoding message from client")
+        finally:
+            self._connections.remove(connection)
+            writer.close()
+            _LOGGER.info("Client disconnected")
+
+    def _record_received(self, message: comms.Message) -> None:
+        sub_message = getattr(message, "sub_message", message)
+        message_type = type(sub_message).__name__
+        self.statistics.messages_received += 1
+        self.statistics.received_by_type[message_type] = (
+            self.statistics.received_by_type.get(message_type, 0) + 1
+        )
+        _LOGGER.debug("Received: %s", message)
+
+
+class At5Console(FakeConsole):
+    """A simulated AirTouch 5 console."""
+
+    model = pyairtouch.AirTouchModel.AIRTOUCH_5
+    port = 9005
+
+    def _create_registry(self) -> "comms.MessageRegistry[Any]":
+        return pyairtouch.at5.comms.registry.INSTANCE
+
+    def _create_header(
+        self, message: comms.Message, message_length: int, packet_id: int
+    ) -> pyairtouch.at5.comms.hdr.At5Header:
+        from_address = pyairtouch.at5.comms.hdr.ADDRESS_AIRTOUCH
+        if message.message_id == at5_ext.MESSAGE_ID:
+            from_address = pyairtouch.at5.comms.hdr.ADDRESS_AIRTOUCH_EXTENDED
+        return pyairtouch.at5.comms.hdr.At5Header(
+            to_address=pyairtouch.at5.comms.hdr.ADDRESS_CLIENT,
+            from_address=from_address,
+            packet_id=packet_id,
+            message_id=message.message_id,
+            message_length=message_length,
+        )
+
+    def _discovery_port(self) -> int:
+        return pyairtouch.at5.comms.discovery.PORT
+
+    def _discovery_request(self) -> bytes:
+        return pyairtouch.at5.comms.discovery.At5DiscoveryRequest().data
+
+    def _discovery_response(self, host: str) -> bytes:
+        return f"{host},{self.serial},AirTouch5,{self.airtouch_id},{self.name}".encode()
+
+    def _zone_status_message(self, zones: Sequence[ZoneState]) -> comms.Message:
+        return at5_ctrl_status.ControlStatusMessage(
+            at5_zone_status.ZoneStatusMessage(
+                [
+                    at5_zone_status.ZoneStatusData(
+                        zone_number=zone.zone_id,
+                        power_state=(
+                            at5_zone_status.ZonePowerState.ON
+                            if zone.power_on
+                            else at5_zone_status.ZonePowerState.OFF
+                        ),
+                        spill_active=zone.spill_active,
+                        control_method=(
+                            at5_zone_status.ZoneControlMethod.TEMPERATURE
+                            if zone.temperature_control
+                            else at5_zone_status.ZoneControlMethod.DAMPER
+                        ),
+                        has_sensor=zone.has_sensor,
+                        battery_status=at5_zone_status.SensorBatteryStatus.NORMAL,
+                        temperature=zone.temperature if zone.has_sensor else None,
+                        damper_percentage=zone.damper_percentage,
+                        set_point=zone.set_point if zone.has_sensor else None,
+                    )
+                    for zone in zones
+                ]
+            )
+        )
+
+    def _ac_status_message(self, acs: Sequence[AcState]) -> comms.Message:
+        return at5_ctrl_status.ControlStatusMessage(
+            at5_ac_status.AcStatusMessage(
+                [
+                    at5_ac_status.AcStatusData(
+                        ac_number=ac.ac_id,
+                        power_state=(
+                            at5_ac_status.AcPowerState.ON
+                            if ac.power_on
+                            else at5_ac_status.AcPowerState.OFF
+                        ),
+                        mode=at5_ac_status.AcMode[ac.mode],
+                        fan_speed=at5_ac_status.AcFanSpeed[ac.fan_speed],
+                        turbo_active=False,
+                        bypass_active=False,
+                        spill_active=ac.spill_active,
+                        timer_set=False,
+                        set_point=ac.set_point,
+                        temperature=ac.temperature,
+                        error_code=0,
+                    )
+                    for ac in acs
+                ]
+            )
+        )
+
+    def _handle_message(self, message: comms.Message) -> list[comms.Message]:
+        match message:
+            case at5_ext.ExtendedMessage(sub_message):
+                return [
+                    at5_ext.ExtendedMessage(m)
+                    for m in self._handle_extended(sub_message)
+                ]
+            case at5_ctrl_status.ControlStatusMessage(sub_message):
+                return self._handle_control_status(sub_message)
+        return []
+
+    def _handle_extended(self, message: comms.Message) -> list[comms.Message]:
+        match message:
+            case at5_version.ConsoleVersionRequest():
+                return [
+                    at5_version.ConsoleVersionMessage(
+                        update_available=False, versions=[_CONSOLE_VERSION]
+                    )
+                ]
+            case at5_names.ZoneNamesRequest():
+                return [
+                    at5_names.ZoneNamesMessage(
+                        {zone.zone_id: zone.name for zone in self.zones}
+                    )
+                ]
+            case at5_ability.AcAbilityRequest():
+                return [
+                    at5_ability.AcAbilityMessage(
+                        [self._ac_ability(ac) for ac in self.acs]
+                    )
+                ]
+        return []
+
+    def _ac_ability(self, ac: AcState) -> at5_ability.AcAbility:
+        return at5_ability.AcAbility(
+            ac_number=ac.ac_id,
+            ac_name=ac.name,
+            start_zone=ac.zones[0].zone_id if ac.zones else 0,
+            zone_count=len(ac.zones),
+            ac_mode_support={
+                mode: mode.name in _SUPPORTED_MODES
+                for mode in at5_ac_ctrl.AcModeControl
+                if mode != at5_ac_ctrl.AcModeControl.UNCHANGED
+            },
+            fan_speed_support={
+                fan_speed: fan_speed.name in _SUPPORTED_FAN_SPEEDS
+                for fan_speed in at5_ac_ctrl.AcFanSpeedControl
+                if fan_speed != at5_ac_ctrl.AcFanSpeedControl.UNCHANGED
+            },
+            min_cool_set_point=_MIN_SET_POINT,
+            max_cool_set_point=_MAX_SET_POINT,
+            min_heat_set_point=_MIN_SET_POINT,
+            max_heat_set_point=_MAX_SET_POINT,
+        )
+
+    def _handle_control_status(self, message: comms.Message) -> list[comms.Message]:
+        match message:
+            case at5_ac_status.AcStatusRequest():
+                return [self._ac_status_message(self.acs)]
+            case at5_zone_status.ZoneStatusRequest():
+                return [self._zone_status_message(self.zones)]
+            case at5_timer_status.AcTimerStatusRequest():
+                disabled = at5_timer_status.AcTimerState(
+                    disabled=True, hour=0, minute=0
+                )
+                return [
+                    at5_ctrl_status.ControlStatusMessage(
+                        at5_timer_status.AcTimerStatusMessage(
+                            [
+                                at5_timer_status.AcTimerStatusData(
+                                    ac_number=ac.ac_id,
+                                    on_timer=disabled,
+                                    off_timer=disabled,
+                                )
+                                for ac in self.acs
+                            ]
+                        )
+                    )
+                ]
+            case at5_zone_ctrl.ZoneControlMessage(zone_control):
+                self._control_received()
+                zones = [self._apply_zone_control(control) for control in zone_control]
+                return [self._zone_status_message([z for z in zones if z])]
+            case at5_ac_ctrl.AcControlMessage(ac_control):
+                self._control_received()
+                acs = [self._apply_ac_control(control) for control in ac_control]
+                return [self._ac_status_message([ac for ac in acs if ac])]
+        return []
+
+    def _apply_zone_control(
+        self, control: at5_zone_ctrl.ZoneControlData
+    ) -> ZoneState | None:
+        zone = next((z for z in self.zones if z.zone_id == control.zone_number), None)
+        if not zone:
+            return None
+
+        match control.zone_power:
+            case at5_zone_ctrl.ZonePowerControl.TURN_ON:
+                zone.power_on = True
+            case at5_zone_ctrl.ZonePowerControl.TURN_OFF:
+                zone.power_on = False
+            case at5_zone_ctrl.ZonePowerControl.TOGGLE:
+                zone.power_on = not zone.power_on
+
+        match control.zone_setting:
+            case at5_zone_ctrl.ZoneSetPointControl(set_point):
+                zone.set_point = set_point
+                zone.temperature_control = True
+            case at5_zone_ctrl.ZoneDamperControl(open_percentage):
+                zone.damper_percentage = open_percentage
+                zone.temperature_control = False
+        return zone
+
+    def _apply_ac_control(self, control: at5_ac_ctrl.AcControlData) -> AcState | None:
+        ac = next((a for a in self.acs if a.ac_id == control.ac_number), None)
+        if not ac:
+            return None
+
+        match control.power:
+            case at5_ac_ctrl.AcPowerControl.TURN_ON:
+                ac.power_on = True
+            case at5_ac_ctrl.AcPowerControl.TURN_OFF:
+                ac.power_on = False
+            case at5_ac_ctrl.AcPowerControl.TOGGLE:
+                ac.power_on = not ac.power_on
+        if control.mode != at5_ac_ctrl.AcModeControl.UNCHANGED:
+            ac.mode = control.mode.name
+        if control.fan_speed != at5_ac_ctrl.AcFanSpeedControl.UNCHANGED:
+            ac.fan_speed = control.fan_speed.name
+        if control.set_point is not None:
+            ac.set_point = control.set_point
+        return ac
+
+
+class At4Console(FakeConsole):
+    """A simulated AirTouch 4 console.
+
+    The AirTouch 4 protocol calls zones "groups".
+    """
+
+    model = pyairtouch.AirTouchModel.AIRTOUCH_4
+    port = 9004
+
+    def _create_registry(self) -> "comms.MessageRegistry[Any]":
+        return pyairtouch.at4.comms.registry.INSTANCE
+
+    def _create_header(
+        self, message: comms.Message, message_length: int, packet_id: int
+    ) -> pyairtouch.at4.comms.hdr.At4Header:
+        from_address = pyairtouch.at4.comms.hdr.ADDRESS_AIRTOUCH
+        if message.message_id == at4_ext.MESSAGE_ID:
+            from_address = pyairtouch.at4.comms.hdr.ADDRESS_AIRTOUCH_EXTENDED
+        return pyairtouch.at4.comms.hdr.At4Header(
+            to_address=pyairtouch.at4.comms.hdr.ADDRESS_CLIENT,
+            from_address=from_address,
+            packet_id=packet_id,
+            message_id=message.message_id,
+            message_length=message_length,
+        )
+
+    def _discovery_port(self) -> int:
+        return pyairtouch.at4.comms.discovery.PORT
+
+    def _discovery_request(self) -> bytes:
+        return pyairtouch.at4.comms.discovery.At4DiscoveryRequest().data
+
+    def _discovery_response(self, host: str) -> bytes:
+        return f"{host},{self.serial},AirTouch4,{self.airtouch_id}".encode()
+
+    def _zone_status_message(self, zones: Sequence[ZoneState]) -> comms.Message:
+        return at4_group_status.GroupStatusMessage(
+            [
+                at4_group_status.GroupStatusData(
+                    group_number=zone.zone_id,
+                    power_state=(
+                        at4_group_status.GroupPowerState.ON
+                        if zone.power_on
+                        else at4_group_status.GroupPowerState.OFF
+                    ),
+                    control_method=(
+                        at4_group_status.GroupControlMethod.TEMPERATURE
+                        if zone.temperature_control
+                        else at4_group_status.GroupControlMethod.DAMPER
+                    ),
+                    spill_active=zone.spill_active,
+                    supports_turbo=False,
+                    has_sensor=zone.has_sensor,
+                    battery_status=at4_group_status.SensorBatteryStatus.NORMAL,
+                    temperature=zone.temperature if zone.has_sensor else None,
+                    damper_percentage=zone.damper_percentage,
+                    set_point=round(zone.set_point) if zone.has_sensor else None,
+                )
+                for zone in zones
+            ]
+        )
+
+    def _ac_status_message(self, acs: Sequence[AcState]) -> comms.Message:
+        return at4_ac_status.AcStatusMessage(
+            [
+                at4_ac_status.AcStatusData(
+                    ac_number=ac.ac_id,
+                    power_state=(
+                        at4_ac_status.AcPowerState.ON
+                        if ac.power_on
+                        else at4_ac_status.AcPowerState.OFF
+                    ),
+                    mode=at4_ac_status.AcMode[ac.mode],
+                    fan_speed=at4_ac_status.AcFanSpeed[ac.fan_speed],
+                    spill_active=ac.spill_active,
+                    timer_set=False,
+                    set_point=round(ac.set_point),
+                    temperature=ac.temperature,
+                    error_code=0,
+                )
+                for ac in acs
+            ]
+        )
+
+    def _handle_message(self, message: comms.Message) -> list[comms.Message]:
+        match message:
+            case at4_ext.ExtendedMessage(sub_message):
+                return [
+                    at4_ext.ExtendedMessage(m)
+                    for m in self._handle_extended(sub_message)
+                ]
+            case at4_ac_status.AcStatusRequest():
+                return [self._ac_status_message(self.acs)]
+            case at4_group_status.GroupStatusRequest():
+                return [self._zone_status_message(self.zones)]
+            case at4_timer_status.AcTimerStatusRequest():
+                disabled = at4_timer_status.AcTimerState(
+                    disabled=True, hour=0, minute=0
+                )
+                return [
+                    at4_timer_status.AcTimerStatusMessage(
+                        [
+                            at4_timer_status.AcTimerStatusData(
+                                ac_number=ac.ac_id,
+                                on_timer=disabled,
+                                off_timer=disabled,
+                            )
+                            for ac in self.acs
+                        ]
+                    )
+                ]
+            case at4_group_ctrl.GroupControlMessage() | at4_ac_ctrl.AcControlMessage():
+                return self._handle_control(message)
+        return []
+
+    def _handle_control(
+        self,
+        message: at4_group_ctrl.GroupControlMessage | at4_ac_ctrl.AcControlMessage,
+    ) -> list[comms.Message]:
+        self._control_received()
+        match message:
+            case at4_group_ctrl.GroupControlMessage():
+                zone = self._apply_group_control(message)
+                return [self._zone_status_message([zone])] if zone else []
+            case at4_ac_ctrl.AcControlMessage():
+                ac = self._apply_ac_control(message)
+                return [self._ac_status_message([ac])] if ac else []
+
+    def _handle_extended(self, message: comms.Message) -> list[comms.Message]:
+        match message:
+            case at4_version.ConsoleVersionRequest():
+                return [
+                    at4_version.ConsoleVersionMessage(
+                        update_available=False, versions=[_CONSOLE_VERSION]
+                    )
+                ]
+            case at4_names.GroupNamesRequest():
+                return [
+                    at4_names.GroupNamesMessage(
+                        {zone.zone_id: zone.name for zone in self.zones}
+                    )
+                ]
+            case at4_ability.AcAbilityRequest():
+                return [
+                    at4_ability.AcAbilityMessage(
+                        [self._ac_ability(ac) for ac in self.acs]
+                    )
+                ]
+        return []
+
+    def _ac_ability(self, ac: AcState) -> at4_ability.AcAbility:
+        return at4_ability.AcAbility(
+            ac_number=ac.ac_id,
+            ac_name=ac.name,
+            ac_mode_support={
+                mode: mode.name in _SUPPORTED_MODES
+                for mode in at4_ac_ctrl.AcModeControl
+                if mode != at4_ac_ctrl.AcModeControl.UNCHANGED
+            },
+            fan_speed_support={
+                fan_speed: fan_speed.name in _SUPPORTED_FAN_SPEEDS
+                for fan_speed in at4_ac_ctrl.AcFanSpeedControl
+                if fan_speed != at4_ac_ctrl.AcFanSpeedControl.UNCHANGED
+            },
+            min_set_point=_MIN_SET_POINT,
+            max_set_point=_MAX_SET_POINT,
+            groups={zone.zone_id for zone in ac.zones},
+            start_group=ac.zones[0].zone_id if ac.zones else 0,
+            group_count=len(ac.zones),
+        )
+
+    def _apply_group_control(
+        self, control: at4_group_ctrl.GroupControlMessage
+    ) -> ZoneState | None:
+        zone = next((z for z in self.zones if z.zone_id == control.group_number), None)
+        if not zone:
+            return None
+
+        match control.power:
+            case at4_group_ctrl.GroupPowerControl.TURN_ON:
+                zone.power_on = True
+            case at4_group_ctrl.GroupPowerControl.TURN_OFF:
+                zone.power_on = False
+            case at4_group_ctrl.GroupPowerControl.TOGGLE:
+                zone.power_on = not zone.power_on
+
+        match control.setting:
+            case at4_group_ctrl.GroupSetPointControl(set_point):
+                zone.set_point = set_point
+                zone.temperature_control = True
+            case at4_group_ctrl.GroupDamperControl(open_percentage):
+                zone.damper_percentage = open_percentage
+                zone.temperature_control = False
+        return zone
+
+    def _apply_ac_control(
+        self, control: at4_ac_ctrl.AcControlMessage
+    ) -> AcState | None:
+        ac = next((a for a in self.acs if a.ac_id == control.ac_number), None)
+        if not ac:
+            return None
+
+        match control.power:
+            case at4_ac_ctrl.AcPowerControl.TURN_ON:
+                ac.power_on = True
+            case at4_ac_ctrl.AcPowerControl.TURN_OFF:
+                ac.power_on = False
+            case at4_ac_ctrl.AcPowerControl.TOGGLE:
+                ac.power_on = not ac.power_on
+        if control.mode != at4_ac_ctrl.AcModeControl.UNCHANGED:
+            ac.mode = control.mode.name
+        if control.fan_speed != at4_ac_ctrl.AcFanSpeedControl.UNCHANGED:
+            ac.fan_speed = control.fan_speed.name
+        if isinstance(control.set_point_control, at4_ac_ctrl.AcSetPointValue):
+            ac.set_point = control.set_point_control.set_point
+        return ac
+
+
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    def __init__(self, request: bytes, response: bytes) -> None:
+        self._request = request
+        self._response = response
+        self._transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        if data == self._request and self._transport:
+            _LOGGER.debug("Discovery request from %s", addr)
+            self._transport.sendto(self._response, addr)
+
+
+def create_console(
+    model: pyairtouch.AirTouchModel, ac_count: int, zones_per_ac: int
+) -> FakeConsole:
+    """Create a simulated console for the given AirTouch model."""
+    if model == pyairtouch.AirTouchModel.AIRTOUCH_4:
+        return At4Console(ac_count, zones_per_ac)
+    return At5Console(ac_count, zones_per_ac)
+
+
+MODELS = {
+    "4": pyairtouch.AirTouchModel.AIRTOUCH_4,
+    "5": pyairtouch.AirTouchModel.AIRTOUCH_5,
+}
+
+
+async def _run(args: argparse.Namespace) -> None:
+    console = create_console(MODELS[args.model], args.acs, args.zones)
+    console.randomise(random.Random(args.seed))  # noqa: S311
+    await console.start(args.host, args.port)
+    if args.discovery:
+        await console.start_discovery(args.host, args.advertised_host or args.host)
+
+    try:
+        while True:
+            if args.burst_interval:
+                await asyncio.sleep(args.burst_interval)
+                await console.send_status_burst(args.burst_packets)
+            else:
+                await asyncio.sleep(3600)
+    finally:
+        await console.stop()
+
+
+def main() -> None:
+    """Run a simulated console until interrupted."""
+    parser = argparse.ArgumentParser("fake_console.py")
+    parser.add_argument("--model", choices=sorted(MODELS), default="5")
+    parser.add_argument("--acs", type=int, default=1, help="Number of ACs")
+    parser.add_argument("--zones", type=int, default=4, help="Number of zones per AC")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, help="TCP port (default: model port)")
+    parser.add_argument(
+        "--discovery", action="store_true", help="Answer UDP discovery requests"
+    )
+    parser.add_argument(
+        "--advertised-host", help="Address reported in discovery responses"
+    )
+    parser.add_argument(
+        "--burst-interval",
+        type=float,
+        default=0,
+        help="Seconds between status bursts (0 to disable)",
+    )
+    parser.add_argument(
+        "--burst-packets", type=int, default=1, help="Status messages per burst"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()